@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Script de scraping de varias categorías de MediaMarkt con un grupo de navegadores compartido
+Las tareas (categoría, criterio, página) se reparten entre los navegadores con robo de trabajo
+Con --tiendas se recorren a la vez las tiendas de varios países, cada una en su partición
+"""
+
+from datetime import datetime
+import argparse
+import sys
+
+import comun_categorias
+import comun_crawl
+import comun_detalle
+import comun_tiendas
+import comun_traza
+
+RUTA_CHECKPOINT = "scraping_cache/checkpoint_multicategoria.json"
+RUTA_DURACIONES = "scraping_cache/duraciones_categorias.json"
+
+# ============================================ #
+#          FUNCIONES DEL EJECUTOR              #
+# ============================================ #
+
+def aplicar_plan(modulos, opciones):
+    """
+    Categorías que tocan en esta pasada según el plan diario (--plan), con su
+    entrada del plan (None si no hay plan o la categoría no aparece en él)
+    """
+    if not opciones.plan:
+        return {nombre: (modulo, None) for nombre, modulo in modulos.items()}
+    
+    plan = comun_crawl.cargar_json(opciones.plan, {}).get('categorias', {})
+    seleccion = {}
+    for nombre, modulo in modulos.items():
+        entrada = plan.get(nombre)
+        if entrada and entrada['pasadas'] < opciones.pasada:
+            print(f"⏭️  {nombre}: el plan solo prevé {entrada['pasadas']} pasadas hoy")
+            continue
+        seleccion[nombre] = (modulo, entrada)
+    return seleccion
+
+def extraer_categorias(navegadores, modulos, opciones):
+    """
+    Recorre la rejilla criterio x página de todas las categorías con el ejecutor compartido
+    (con --plan, solo las consultas y profundidades que asigna el plan diario)
+
+    Returns:
+        dict: categoría -> (productos únicos, resumen con cobertura y si es parcial)
+    """
+    ejecutor = comun_crawl.crear_ejecutor(navegadores, opciones, checkpoint=RUTA_CHECKPOINT)
+    totales = {}
+    recortadas = set()
+    seleccion = aplicar_plan(modulos, opciones)
+    modulos = {nombre: modulo for nombre, (modulo, _) in seleccion.items()}
+    
+    for nombre, (modulo, entrada) in seleccion.items():
+        print(f"\n📂 Preparando categoría {nombre}")
+        total_articulos, paginas = comun_categorias.preparar_categoria(navegadores[0], modulo)
+        totales[nombre] = total_articulos
+        consultas = [f"sort={criterio}" for criterio in modulo.CRITERIOS_ORDENACION]
+        if entrada:
+            # El plan puede dejar fuera consultas o recortar su profundidad: entonces el
+            # recorrido no es completo aunque no quede nada pendiente
+            if set(consultas) - set(entrada['paginas']) or any(
+                    profundidad < paginas for profundidad in entrada['paginas'].values()):
+                recortadas.add(nombre)
+            consultas = list(entrada['paginas'])
+            paginas = {consulta: min(profundidad, paginas) for consulta, profundidad in entrada['paginas'].items()}
+            print(f"📋 Plan: {sum(paginas.values())} páginas en {len(consultas)} consultas"
+                  + (" (recorrido recortado)" if nombre in recortadas else ""))
+        ejecutor.agregar_categoria(
+            nombre, modulo.cargar_pagina,
+            consultas,
+            paginas,
+            previas=comun_crawl.paginas_previas(opciones, modulo.ruta_instantanea(), total_articulos)
+        )
+    
+    if opciones.reparto == "lpt":
+        objetivo = opciones.objetivo_minutos * 60 if opciones.objetivo_minutos else None
+        ejecutor.planificar_lpt(comun_crawl.segundos_por_pagina(RUTA_DURACIONES), objetivo)
+    
+    resultados = ejecutor.ejecutar()
+    comun_crawl.guardar_duraciones(RUTA_DURACIONES, ejecutor.duraciones)
+    ejecutor.imprimir_informe()
+    for nombre, modulo in modulos.items():
+        modulo.CACHE_HUELLAS.imprimir_informe(nombre)
+        modulo.ADAPTADOR.guardar_planes()
+        modulo.ADAPTADOR.imprimir_informe()
+    
+    salida = {}
+    for nombre, modulo in modulos.items():
+        productos_data = []
+        modulo.registrar_productos(resultados.get(nombre, []), set(), productos_data)
+        resumen = {
+            'parcial': nombre in ejecutor.categorias_parciales,
+            'motivo_parcial': ejecutor.motivo_parcial(nombre),
+            'total_articulos': totales[nombre],
+            'cobertura': None,
+        }
+        if totales[nombre]:
+            resumen['cobertura'] = round(min(len(productos_data) / totales[nombre] * 100, 100.0), 1)
+        if not resumen['parcial']:
+            comun_crawl.guardar_instantanea(
+                modulo.ruta_instantanea(), ejecutor.paginas_categoria(nombre), totales[nombre],
+                sembradas=ejecutor.sembradas.get(nombre, ()), completa=nombre not in recortadas
+            )
+        salida[nombre] = (productos_data, resumen)
+    return salida
+
+# ============================================ #
+#          FUNCION PRINCIPAL                   #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Scraping multicategoría de MediaMarkt")
+    parser.add_argument(
+        "--categorias",
+        nargs="+",
+        choices=list(comun_categorias.SCRIPTS_CATEGORIAS),
+        default=None,
+        help="Categorías a recorrer (todas por defecto)"
+    )
+    parser.add_argument(
+        "--tiendas",
+        nargs="+",
+        choices=list(comun_tiendas.TIENDAS),
+        default=[comun_tiendas.TIENDA_POR_DEFECTO],
+        help="Tiendas de MediaMarkt por país que se recorren con el mismo grupo de navegadores"
+    )
+    parser.add_argument(
+        "--reparto",
+        choices=["lpt", "turno"],
+        default="lpt",
+        help="Asignación de categorías a navegadores: LPT con las duraciones anteriores o por turno"
+    )
+    parser.add_argument(
+        "--objetivo-minutos",
+        type=float,
+        default=None,
+        help="Makespan objetivo; las categorías que lo superan se parten en subtareas (por defecto, el reparto perfecto)"
+    )
+    parser.add_argument(
+        "--plan",
+        default=None,
+        help="Plan diario de páginas (JSON del planificador) que limita consultas y profundidad"
+    )
+    parser.add_argument(
+        "--pasada",
+        type=int,
+        default=1,
+        help="Número de pasada del día: solo se recorren las categorías con al menos tantas pasadas en el plan"
+    )
+    comun_crawl.agregar_opciones_ejecutor(parser)
+    comun_detalle.agregar_opciones_detalle(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Función principal"""
+    if args is None:
+        args = parsear_argumentos()
+    
+    print("="*60)
+    print("SCRAPING MULTICATEGORÍA - MEDIAMARKT")
+    print("="*60)
+    print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+    
+    modulos = comun_categorias.cargar_categorias(args.categorias, args.tiendas)
+    primero = next(iter(modulos.values()))
+    navegadores = []
+    
+    if args.trazar_comandos:
+        comun_traza.activar()
+    
+    try:
+        navegadores = [primero.mediamark_mob_(primero.construir_url_listado("sort=currentprice+desc"))]
+        navegadores += primero.abrir_navegadores(args.workers - 1)
+        
+        resultados = extraer_categorias(navegadores, modulos, args)
+        
+        exito = True
+        for nombre, (productos_data, resumen) in resultados.items():
+            print(f"\n📦 {nombre}: {len(productos_data)} productos únicos")
+            if resumen['cobertura'] is not None:
+                print(f"📈 Se extrajo el {resumen['cobertura']}% del total de artículos")
+            if resumen['parcial']:
+                print(f"⚠️  Extracción PARCIAL: {comun_crawl.describir_parcial(resumen)}")
+            
+            if not productos_data:
+                print(f"❌ No se extrajeron productos de {nombre}")
+                exito = False
+                continue
+            
+            if args.detalles:
+                modulo = modulos[nombre]
+                comun_detalle.enriquecer_productos(
+                    productos_data, args, lambda: modulo.mediamark_mob_(modulo.URL_BASE)
+                )
+            
+            df, _ = modulos[nombre].guardar_en_dataframe(productos_data, resumen)
+            if df is None or not modulos[nombre].actualizar_csv_drive(df):
+                print(f"⚠️  No se pudo actualizar Google Drive para {nombre}")
+        
+        comun_crawl.borrar_checkpoint(RUTA_CHECKPOINT)
+        return exito
+    
+    except comun_crawl.CrawlAbortado as e:
+        print(f"🛑 Crawl abortado: {e}")
+        print("📌 No se guarda ningún CSV; el checkpoint se conserva para --resume")
+        return False
+    
+    except Exception as e:
+        print(f"❌ Error en la ejecución: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    
+    finally:
+        primero.cerrar_navegadores(navegadores)
+        comun_traza.guardar("multicategoria")
+        
+        print("\n" + "="*60)
+        print("EJECUCIÓN FINALIZADA")
+        print("="*60)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Escaneo rápido de ofertas de MediaMarkt durante el día
+Recorre solo las primeras páginas de 'currentprice+asc' y 'relevance' de cada
+categoría con un grupo de navegadores compartido y añade a un feed de ofertas
+las filas cuyo precio ha cambiado desde el escaneo anterior
+"""
+
+from datetime import datetime
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+import comun_categorias
+import comun_crawl
+
+CONSULTAS_OFERTAS = ["sort=currentprice+asc", "sort=relevance"]
+
+RUTA_ESTADO = "scraping_cache/ofertas_estado.json"
+RUTA_FEED = "scraping_results/ofertas_feed.csv"
+
+COLUMNAS_FEED = [
+    'fecha_extraccion', 'categoria', 'id', 'nombre', 'marca', 'precio', 'precio_anterior',
+    'precio_rebajado', 'descuento_porcentaje', 'cambio', 'enlace'
+]
+
+# ============================================ #
+#          FUNCIONES DEL ESCANEO               #
+# ============================================ #
+
+def valor_precio(valor):
+    """Precio como float, o None si falta"""
+    return None if pd.isna(valor) else round(float(valor), 2)
+
+def escanear(navegadores, modulos, opciones, ritmo):
+    """
+    Recorre las primeras páginas de las consultas de ofertas de todas las categorías
+
+    Returns:
+        tuple: (dict categoría -> productos, dict categoría no completada -> motivo)
+    """
+    ejecutor = comun_crawl.EjecutorCrawl(
+        navegadores, ritmo=ritmo,
+        reintentos=comun_crawl.PoliticaReintentos(max_intentos=2, espera_base=0.5, espera_max=2.0),
+        fin=time.time() + opciones.limite_segundos,
+        umbral_fallos=2, enfriamiento=5.0, max_aperturas=1
+    )
+    for nombre, modulo in modulos.items():
+        # Cada escaneo tiene que ver los precios de ahora, no las rejillas del anterior
+        modulo.CACHE_HUELLAS = comun_crawl.CacheHuellas()
+        ejecutor.agregar_categoria(nombre, modulo.cargar_pagina, CONSULTAS_OFERTAS, opciones.paginas)
+
+    resultados = ejecutor.ejecutar()
+    ejecutor.imprimir_informe()
+    return resultados, {categoria: ejecutor.motivo_parcial(categoria) for categoria in ejecutor.categorias_parciales}
+
+def detectar_cambios(resultados, modulos, estado):
+    """
+    Limpia los precios como en el guardado diario y compara con el escaneo anterior
+
+    Returns:
+        tuple: (filas cambiadas para el feed, estado actualizado)
+    """
+    fecha_extraccion = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    primer_escaneo = not estado
+    cambios = []
+
+    for nombre, productos in resultados.items():
+        if not productos:
+            continue
+
+        df = modulos[nombre].limpiar_columna_precio(pd.DataFrame(productos))
+        for fila in df.to_dict('records'):
+            clave = f"{nombre}:{fila['id']}"
+            precio = valor_precio(fila.get('precio'))
+            precio_rebajado = valor_precio(fila.get('precio_rebajado'))
+            anterior = estado.get(clave)
+            estado[clave] = {'precio': precio, 'precio_rebajado': precio_rebajado}
+
+            if anterior is None:
+                cambio = "nuevo"
+            elif precio is not None and anterior['precio'] is not None and precio < anterior['precio']:
+                cambio = "bajada"
+            elif precio is not None and anterior['precio'] is not None and precio > anterior['precio']:
+                cambio = "subida"
+            elif precio_rebajado != anterior['precio_rebajado']:
+                cambio = "rebaja"
+            else:
+                continue
+
+            if primer_escaneo:
+                continue
+
+            cambios.append({
+                'fecha_extraccion': fecha_extraccion,
+                'categoria': nombre,
+                'id': fila['id'],
+                'nombre': fila.get('nombre'),
+                'marca': fila.get('marca'),
+                'precio': precio,
+                'precio_anterior': anterior['precio'] if anterior else None,
+                'precio_rebajado': precio_rebajado,
+                'descuento_porcentaje': valor_precio(fila.get('descuento_porcentaje', None)),
+                'cambio': cambio,
+                'enlace': fila.get('enlace'),
+            })
+
+    if primer_escaneo:
+        print(f"ℹ️  Primer escaneo: {len(estado)} precios de referencia, sin filas para el feed")
+    return cambios, estado
+
+def escribir_feed(cambios):
+    """Añade las filas cambiadas al feed de ofertas"""
+    if not cambios:
+        print("😴 Sin cambios de precio desde el último escaneo")
+        return
+
+    os.makedirs(os.path.dirname(RUTA_FEED), exist_ok=True)
+    df = pd.DataFrame(cambios, columns=COLUMNAS_FEED)
+    df.to_csv(RUTA_FEED, mode='a', header=not os.path.exists(RUTA_FEED), index=False, encoding='utf-8')
+
+    print(f"🔥 {len(df)} cambios añadidos a {RUTA_FEED}")
+    for cambio, cantidad in df['cambio'].value_counts().items():
+        print(f"   {cambio}: {cantidad}")
+
+def ejecutar_escaneo(navegadores, modulos, opciones, ritmo):
+    """Un escaneo completo: navegar, detectar cambios y actualizar feed y estado"""
+    inicio = time.time()
+    resultados, incompletas = escanear(navegadores, modulos, opciones, ritmo)
+
+    estado = comun_crawl.cargar_json(RUTA_ESTADO, {})
+    cambios, estado = detectar_cambios(resultados, modulos, estado)
+    escribir_feed(cambios)
+    comun_crawl.guardar_json(RUTA_ESTADO, estado)
+
+    duracion = time.time() - inicio
+    print(f"⏱️  Escaneo terminado en {duracion:.1f}s")
+    for categoria, motivo in sorted(incompletas.items()):
+        print(f"⚠️  {categoria} sin completar: {comun_crawl.MOTIVOS_PARCIAL[motivo]}")
+    return duracion
+
+# ============================================ #
+#          FUNCION PRINCIPAL                   #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Escaneo rápido de ofertas de MediaMarkt")
+    parser.add_argument(
+        "--categorias",
+        nargs="+",
+        choices=list(comun_categorias.SCRIPTS_CATEGORIAS),
+        default=None,
+        help="Categorías a escanear (todas por defecto)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Número de navegadores que se reparten las páginas"
+    )
+    parser.add_argument(
+        "--paginas",
+        type=int,
+        default=2,
+        help="Páginas de cada consulta que se escanean"
+    )
+    parser.add_argument(
+        "--limite-segundos",
+        type=float,
+        default=50,
+        help="Tiempo máximo de navegación de cada escaneo"
+    )
+    parser.add_argument(
+        "--intervalo-minutos",
+        type=float,
+        default=0,
+        help="Repite el escaneo cada N minutos con los mismos navegadores (0: un solo escaneo)"
+    )
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Función principal"""
+    if args is None:
+        args = parsear_argumentos()
+
+    print("="*60)
+    print("ESCANEO DE OFERTAS - MEDIAMARKT")
+    print("="*60)
+    print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+
+    modulos = comun_categorias.cargar_categorias(args.categorias)
+    primero = next(iter(modulos.values()))
+    navegadores = []
+
+    try:
+        navegadores = [primero.mediamark_mob_(primero.construir_url_listado("sort=relevance"))]
+        navegadores += primero.abrir_navegadores(args.workers - 1)
+        # El ritmo se conserva entre escaneos: lo aprendido sobre el sitio sigue valiendo.
+        # El escaneo es corto: arranca con todos los navegadores y solo baja ante problemas
+        ritmo = comun_crawl.ControladorRitmo(
+            max_concurrencia=len(navegadores), pausa_inicial=1.0, limite_inicial=len(navegadores)
+        )
+
+        while True:
+            duracion = ejecutar_escaneo(navegadores, modulos, args, ritmo)
+            if not args.intervalo_minutos:
+                return True
+
+            espera = max(0.0, args.intervalo_minutos * 60 - duracion)
+            print(f"\n💤 Próximo escaneo en {espera / 60:.1f} minutos")
+            time.sleep(espera)
+            print(f"\n🔁 Escaneo de las {datetime.now().strftime('%H:%M:%S')}")
+
+    except KeyboardInterrupt:
+        print("\n⏹️  Escaneo detenido")
+        return True
+
+    except comun_crawl.CrawlAbortado as e:
+        print(f"🛑 Crawl abortado: {e}")
+        return False
+
+    except Exception as e:
+        print(f"❌ Error en la ejecución: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        primero.cerrar_navegadores(navegadores)
+
+        print("\n" + "="*60)
+        print("EJECUCIÓN FINALIZADA")
+        print("="*60)
+
+if __name__ == "__main__":
+    exito = main()
+    sys.exit(0 if exito else 1)
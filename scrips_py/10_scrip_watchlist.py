@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Seguimiento de alta frecuencia de una lista de productos de MediaMarkt
+La lista sale de los enlaces del histórico; cada producto se consulta en su ficha
+con un intervalo propio según lo a menudo que ha cambiado su precio, por HTTP
+cuando es posible y con navegador solo cuando hace falta. Los cambios de precio
+se escriben como eventos
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import argparse
+import heapq
+import os
+import sys
+import time
+
+import pandas as pd
+
+import comun_categorias
+import comun_crawl
+import comun_detalle
+import comun_historico
+
+RUTA_WATCHLIST = "scraping_cache/watchlist.json"
+RUTA_EVENTOS = "scraping_results/watchlist_eventos.csv"
+
+# Límites del intervalo de sondeo de cada producto (segundos)
+INTERVALO_MIN = 5 * 60
+INTERVALO_MAX = 12 * 60 * 60
+
+# Sondeos por cambio de precio esperado: consultar varias veces entre cambios
+SONDEOS_POR_CAMBIO = 4
+
+# Fallos HTTP seguidos tras los que un producto pasa a leerse con navegador
+FALLOS_HTTP_PARA_NAVEGADOR = 2
+
+# Atributos que cada sondeo necesita frescos (el resto de la ficha puede venir de la caché)
+CAMPOS_SONDEO = ('precio', 'disponibilidad')
+
+COLUMNAS_EVENTOS = [
+    'fecha', 'categoria', 'id', 'nombre', 'enlace', 'precio_anterior', 'precio',
+    'variacion_porcentaje', 'disponibilidad', 'fuente'
+]
+
+# ============================================ #
+#          LISTA DE SEGUIMIENTO                #
+# ============================================ #
+
+def intervalo_sondeo(cambios, dias):
+    """
+    Segundos entre consultas de un producto: una fracción del tiempo medio entre
+    sus cambios de precio, dentro de [INTERVALO_MIN, INTERVALO_MAX]
+    """
+    if not cambios:
+        return INTERVALO_MAX
+    segundos_entre_cambios = max(dias, 1) * 86400 / cambios
+    return int(min(INTERVALO_MAX, max(INTERVALO_MIN, segundos_entre_cambios / SONDEOS_POR_CAMBIO)))
+
+def construir_watchlist(historico, max_productos, enlaces=None):
+    """
+    Elige los productos a seguir y su intervalo a partir del histórico
+
+    Args:
+        enlaces: lista explícita de enlaces a seguir; si no, los 'max_productos'
+            cuyo precio cambia más a menudo
+
+    Returns:
+        dict: enlace -> estado del producto en la lista de seguimiento
+    """
+    historico = historico[historico['enlace'].notna() & (historico['enlace'] != 'No disponible')].copy()
+    historico['fecha_extraccion'] = pd.to_datetime(historico['fecha_extraccion'], errors='coerce')
+    historico['precio'] = pd.to_numeric(historico['precio'], errors='coerce')
+    historico = historico.dropna(subset=['fecha_extraccion']).sort_values('fecha_extraccion')
+
+    filas = []
+    for enlace, grupo in historico.groupby('enlace', sort=False):
+        precios = grupo['precio'].dropna()
+        cambios = int((precios.diff().fillna(0) != 0).sum())
+        dias = (grupo['fecha_extraccion'].max() - grupo['fecha_extraccion'].min()).days + 1
+        ultima = grupo.iloc[-1]
+        filas.append({
+            'enlace': enlace,
+            'id': ultima.get('id'),
+            'categoria': ultima.get('categoria'),
+            'nombre': ultima.get('nombre'),
+            'precio': None if pd.isna(ultima['precio']) else float(ultima['precio']),
+            'cambios': cambios,
+            'dias': dias,
+            'tasa': cambios / dias,
+        })
+
+    if enlaces:
+        seleccion = [fila for fila in filas if fila['enlace'] in set(enlaces)]
+        conocidos = {fila['enlace'] for fila in seleccion}
+        seleccion += [{'enlace': enlace, 'id': None, 'categoria': None, 'nombre': None, 'precio': None,
+                       'cambios': 0, 'dias': 1, 'tasa': 0.0} for enlace in enlaces if enlace not in conocidos]
+    else:
+        seleccion = sorted(filas, key=lambda fila: (fila['tasa'], fila['dias']), reverse=True)[:max_productos]
+
+    ahora = time.time()
+    watchlist = {}
+    for fila in seleccion:
+        fila.pop('tasa')
+        fila.update({
+            'intervalo': intervalo_sondeo(fila['cambios'], fila['dias']),
+            'proxima': ahora,
+            'fallos_http': 0,
+            'navegador': False,
+            'desde': datetime.now().strftime("%Y-%m-%d"),
+        })
+        watchlist[fila['enlace']] = fila
+    return watchlist
+
+# ============================================ #
+#          SONDEO                              #
+# ============================================ #
+
+def sondear(lector, item):
+    """
+    Consulta la ficha de un producto y actualiza su estado
+
+    Returns:
+        dict: evento de cambio de precio, o None si el precio no cambió
+    """
+    datos, fuente = lector.leer(item['enlace'], solo_navegador=item['navegador'], campos=CAMPOS_SONDEO)
+    ahora = time.time()
+
+    if fuente == 'navegador' and not item['navegador']:
+        item['fallos_http'] += 1
+        if item['fallos_http'] >= FALLOS_HTTP_PARA_NAVEGADOR:
+            print(f"   🧭 {item['enlace']}: se leerá siempre con navegador")
+            item['navegador'] = True
+    elif fuente == 'http':
+        item['fallos_http'] = 0
+
+    if not datos:
+        # Sin datos: reintentar pronto, pero sin insistir más que el mínimo
+        item['proxima'] = ahora + INTERVALO_MIN
+        return None
+
+    anterior = item['precio']
+    item['precio'] = datos['precio']
+    item['nombre'] = item['nombre'] or datos['nombre']
+    evento = None
+
+    if anterior is not None and datos['precio'] != anterior:
+        item['cambios'] += 1
+        evento = {
+            'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'categoria': item['categoria'],
+            'id': item['id'],
+            'nombre': item['nombre'],
+            'enlace': item['enlace'],
+            'precio_anterior': anterior,
+            'precio': datos['precio'],
+            'variacion_porcentaje': round((datos['precio'] - anterior) / anterior * 100, 2) if anterior else None,
+            'disponibilidad': datos['disponibilidad'],
+            'fuente': fuente,
+        }
+
+    dias = (datetime.now() - datetime.strptime(item['desde'], "%Y-%m-%d")).days + item['dias']
+    item['intervalo'] = intervalo_sondeo(item['cambios'], dias)
+    item['proxima'] = ahora + item['intervalo']
+    return evento
+
+def escribir_eventos(eventos):
+    """Añade los eventos de cambio de precio al fichero de eventos"""
+    if not eventos:
+        return
+    os.makedirs(os.path.dirname(RUTA_EVENTOS), exist_ok=True)
+    pd.DataFrame(eventos, columns=COLUMNAS_EVENTOS).to_csv(
+        RUTA_EVENTOS, mode='a', header=not os.path.exists(RUTA_EVENTOS), index=False, encoding='utf-8'
+    )
+    for evento in eventos:
+        flecha = "📉" if evento['precio'] < evento['precio_anterior'] else "📈"
+        print(f"   {flecha} {evento['nombre']}: {evento['precio_anterior']:.2f}€ → {evento['precio']:.2f}€")
+
+def vigilar(watchlist, lector, opciones):
+    """
+    Bucle de sondeo: consulta en lotes los productos cuyo turno ha llegado y
+    duerme hasta el siguiente turno
+    """
+    fin = time.time() + opciones.minutos * 60 if opciones.minutos else None
+    turnos = [(item['proxima'], enlace) for enlace, item in watchlist.items()]
+    heapq.heapify(turnos)
+
+    with ThreadPoolExecutor(max_workers=opciones.hilos) as pool:
+        while turnos:
+            ahora = time.time()
+            if fin and ahora >= fin:
+                break
+
+            lote = []
+            while turnos and turnos[0][0] <= ahora:
+                lote.append(watchlist[heapq.heappop(turnos)[1]])
+
+            if not lote:
+                espera = turnos[0][0] - ahora
+                if fin:
+                    espera = min(espera, fin - ahora)
+                time.sleep(max(0.5, min(espera, 60)))
+                continue
+
+            print(f"\n👀 {datetime.now().strftime('%H:%M:%S')}: consultando {len(lote)} productos")
+            eventos = [evento for evento in pool.map(lambda item: sondear(lector, item), lote) if evento]
+            escribir_eventos(eventos)
+            print(f"   {len(eventos)} cambios de precio")
+
+            for item in lote:
+                heapq.heappush(turnos, (item['proxima'], item['enlace']))
+            comun_crawl.guardar_json(RUTA_WATCHLIST, watchlist)
+            lector.cache.persistir()
+
+# ============================================ #
+#          FUNCION PRINCIPAL                   #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Seguimiento de precios de una lista de productos de MediaMarkt")
+    parser.add_argument(
+        "--categorias",
+        nargs="+",
+        choices=list(comun_categorias.SCRIPTS_CATEGORIAS),
+        default=None,
+        help="Categorías cuyo histórico se usa (todas por defecto)"
+    )
+    parser.add_argument(
+        "--historico",
+        nargs="+",
+        default=None,
+        help="CSV históricos locales (<categoria>_mediamarkt.csv) en lugar de los de Google Drive"
+    )
+    parser.add_argument(
+        "--enlaces",
+        default=None,
+        help="Fichero con los enlaces a seguir (uno por línea); por defecto los más volátiles del histórico"
+    )
+    parser.add_argument(
+        "--max-productos",
+        type=int,
+        default=300,
+        help="Productos de la lista de seguimiento si no se indican enlaces"
+    )
+    parser.add_argument(
+        "--reconstruir",
+        action="store_true",
+        help="Vuelve a construir la lista desde el histórico aunque ya exista"
+    )
+    parser.add_argument(
+        "--hilos",
+        type=int,
+        default=8,
+        help="Consultas HTTP simultáneas"
+    )
+    parser.add_argument(
+        "--navegadores",
+        type=int,
+        default=1,
+        help="Navegadores de respaldo para las fichas que no se pueden leer por HTTP"
+    )
+    parser.add_argument(
+        "--minutos",
+        type=float,
+        default=0,
+        help="Duración del seguimiento (0: hasta interrumpirlo)"
+    )
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Función principal"""
+    if args is None:
+        args = parsear_argumentos()
+
+    print("="*60)
+    print("WATCHLIST DE PRECIOS - MEDIAMARKT")
+    print("="*60)
+    print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+
+    watchlist = None if args.reconstruir else comun_crawl.cargar_json(RUTA_WATCHLIST)
+    if not watchlist:
+        historico = comun_historico.cargar_historico(args.historico, args.categorias)
+        if historico.empty:
+            print("❌ No hay histórico del que sacar la lista de seguimiento")
+            return False
+
+        enlaces = None
+        if args.enlaces:
+            with open(args.enlaces, encoding='utf-8') as f:
+                enlaces = [linea.strip() for linea in f if linea.strip()]
+
+        watchlist = construir_watchlist(historico, args.max_productos, enlaces)
+        comun_crawl.guardar_json(RUTA_WATCHLIST, watchlist)
+
+    intervalos = sorted(item['intervalo'] for item in watchlist.values())
+    if not intervalos:
+        print("❌ La lista de seguimiento está vacía")
+        return False
+    print(f"📋 {len(watchlist)} productos en seguimiento, intervalo mediano "
+          f"{intervalos[len(intervalos) // 2] / 60:.0f} min")
+
+    primero = comun_categorias.cargar_categoria(next(iter(comun_categorias.SCRIPTS_CATEGORIAS)))
+    lector = comun_detalle.LectorFichas(
+        abrir_navegador=lambda: primero.mediamark_mob_(primero.URL_BASE),
+        max_navegadores=args.navegadores,
+        cache=comun_detalle.CacheFichas()
+    )
+
+    try:
+        vigilar(watchlist, lector, args)
+        return True
+
+    except KeyboardInterrupt:
+        print("\n⏹️  Seguimiento detenido")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error en la ejecución: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        comun_crawl.guardar_json(RUTA_WATCHLIST, watchlist)
+        lector.imprimir_informe()
+        lector.cerrar()
+
+        print("\n" + "="*60)
+        print("EJECUCIÓN FINALIZADA")
+        print("="*60)
+
+if __name__ == "__main__":
+    exito = main()
+    sys.exit(0 if exito else 1)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Descubrimiento de productos nuevos de MediaMarkt a partir de los sitemaps
+Recorre en streaming los sitemaps XML de la tienda, se queda con las fichas de
+producto que cumplen los patrones indicados y las compara con los enlaces del
+histórico para encontrar productos nuevos sin recorrer los listados
+"""
+
+from datetime import datetime
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+import comun_categorias
+import comun_detalle
+import comun_historico
+import comun_sitemap
+import comun_tiendas
+
+# ============================================ #
+#          FUNCION PRINCIPAL                   #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Descubrimiento de productos nuevos de MediaMarkt por sitemap")
+    parser.add_argument(
+        "--tienda",
+        choices=list(comun_tiendas.TIENDAS),
+        default=comun_tiendas.TIENDA_POR_DEFECTO,
+        help="Tienda cuyos sitemaps e históricos se comparan (España por defecto)"
+    )
+    parser.add_argument(
+        "--sitemap",
+        nargs="+",
+        default=None,
+        help="Sitemaps o índices de sitemaps (rutas locales o URLs); por defecto los del robots.txt"
+    )
+    parser.add_argument(
+        "--filtro-sitemaps",
+        default="product",
+        help="Expresión regular que deben cumplir los sitemaps hijos de un índice para leerlos"
+    )
+    parser.add_argument(
+        "--patron",
+        nargs="+",
+        default=None,
+        help="Expresiones regulares de las URLs de producto de la categoría (p. ej. 'televisor|_tv-')"
+    )
+    parser.add_argument(
+        "--categorias",
+        nargs="+",
+        choices=list(comun_categorias.SCRIPTS_CATEGORIAS),
+        default=None,
+        help="Categorías cuyo histórico se usa como enlaces conocidos (todas por defecto)"
+    )
+    parser.add_argument(
+        "--historico",
+        nargs="+",
+        default=None,
+        help="CSV históricos locales (<categoria>_mediamarkt.csv) en lugar de los de Google Drive"
+    )
+    parser.add_argument(
+        "--fichas",
+        action="store_true",
+        help="Lee la ficha de cada producto nuevo para obtener nombre, precio y marca"
+    )
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Función principal"""
+    if args is None:
+        args = parsear_argumentos()
+
+    print("="*60)
+    print("DESCUBRIMIENTO POR SITEMAP - MEDIAMARKT")
+    print("="*60)
+    print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+
+    try:
+        tienda = comun_tiendas.TIENDAS[args.tienda]
+        sitemaps = args.sitemap or comun_sitemap.sitemaps_de_robots(tienda.url_base)
+        if not sitemaps:
+            print("❌ No hay sitemaps que recorrer")
+            return False
+
+        descubiertos = comun_sitemap.descubrir_productos(sitemaps, args.patron, args.filtro_sitemaps)
+
+        historico = comun_historico.cargar_historico(args.historico, args.categorias, args.tienda)
+        conocidos = comun_historico.enlaces_conocidos(historico)
+        nuevos = comun_sitemap.productos_nuevos(descubiertos, conocidos)
+        print(f"🆕 {len(nuevos)} productos nuevos frente a {len(conocidos)} enlaces conocidos")
+
+        if not nuevos:
+            return True
+
+        fecha = datetime.now()
+        filas = [
+            {'fecha_descubrimiento': fecha.strftime("%Y-%m-%d %H:%M:%S"), 'enlace': enlace, 'lastmod': lastmod}
+            for enlace, lastmod in sorted(nuevos.items())
+        ]
+
+        if args.fichas:
+            lector = comun_detalle.LectorFichas(cache=comun_detalle.CacheFichas())
+            try:
+                for fila in filas:
+                    datos, _ = lector.leer(fila['enlace'], campos=('precio',))
+                    if datos:
+                        fila.update({campo: datos.get(campo) for campo in ('nombre', 'marca', 'precio', 'ean')})
+            finally:
+                lector.cerrar()
+            lector.imprimir_informe()
+
+        os.makedirs("scraping_results", exist_ok=True)
+        nombre_archivo = f"scraping_results/sitemap_nuevos{tienda.sufijo}_{fecha.strftime('%Y%m%d_%H%M%S')}.csv"
+        pd.DataFrame(filas).to_csv(nombre_archivo, index=False, encoding='utf-8')
+        print(f"\n✅ Productos nuevos guardados en: {nombre_archivo}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error en la ejecución: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        print("\n" + "="*60)
+        print("EJECUCIÓN FINALIZADA")
+        print("="*60)
+
+if __name__ == "__main__":
+    exito = main()
+    sys.exit(0 if exito else 1)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Planificador diario del presupuesto de páginas por volatilidad de precios
+Lee el histórico y las estadísticas de cambio por página de cada categoría y
+reparte un presupuesto fijo de páginas donde más cambios de precio se esperan:
+las categorías volátiles se recorren más a fondo (o más veces al día) y las
+estables solo en sus primeras páginas. El plan se escribe en un JSON que usa
+el script multicategoría
+"""
+
+from datetime import datetime
+import argparse
+import heapq
+import math
+import os
+import sys
+
+import pandas as pd
+
+import comun_categorias
+import comun_crawl
+import comun_historico
+
+RUTA_PLAN = "scraping_cache/plan_diario.json"
+
+# Días del histórico con los que se mide la volatilidad de cada categoría
+DIAS_VOLATILIDAD = 14
+
+# Peso (en visitas) de la tasa de la categoría como previa de la tasa de cada página
+PESO_PREVIO = 2
+
+# Máximo de pasadas diarias de una categoría
+MAX_PASADAS = 4
+
+# ============================================ #
+#          TASAS DE CAMBIO                     #
+# ============================================ #
+
+def tasas_categoria(historico, dias=DIAS_VOLATILIDAD):
+    """
+    Fracción diaria de productos cuyo precio cambia, por categoría
+
+    Returns:
+        dict: categoría -> tasa (None si no hay dos días comparables)
+    """
+    if historico.empty:
+        return {}
+
+    datos = historico[['categoria', 'id', 'fecha_extraccion', 'precio']].copy()
+    datos['fecha'] = pd.to_datetime(datos['fecha_extraccion'], errors='coerce').dt.date
+    datos['precio'] = pd.to_numeric(datos['precio'], errors='coerce')
+    datos = datos.dropna(subset=['fecha', 'precio']).drop_duplicates(['categoria', 'id', 'fecha'], keep='last')
+
+    tasas = {}
+    for categoria, grupo in datos.groupby('categoria'):
+        tabla = grupo.pivot(index='id', columns='fecha', values='precio').sort_index(axis=1)
+        tabla = tabla.iloc[:, -(dias + 1):]
+        comparables = (tabla.notna() & tabla.shift(axis=1).notna()).iloc[:, 1:]
+        cambios = (tabla.diff(axis=1).iloc[:, 1:].fillna(0) != 0) & comparables
+        tasas[categoria] = cambios.values.sum() / comparables.values.sum() if comparables.values.sum() else None
+    return tasas
+
+def ultimo_recuento(historico, categoria):
+    """Productos de la categoría en el último día del histórico"""
+    grupo = historico[historico['categoria'] == categoria]
+    if grupo.empty:
+        return None
+    fechas = pd.to_datetime(grupo['fecha_extraccion'], errors='coerce').dt.date
+    return int(grupo[fechas == fechas.max()]['id'].nunique())
+
+def paginas_categoria(modulo, recuento):
+    """
+    Páginas conocidas de la categoría con su historial de cambios
+
+    Returns:
+        dict: consulta -> lista ordenada de (página, visitas, cambios)
+    """
+    instantanea = comun_crawl.cargar_json(modulo.ruta_instantanea(), {})
+    estadisticas = instantanea.get('estadisticas', {})
+    claves = set(instantanea.get('paginas', {})) | set(estadisticas)
+
+    if not claves:
+        # Sin instantánea: la rejilla completa que recorrería el script
+        por_criterio = modulo.MAX_PAGINAS
+        if recuento:
+            por_criterio = min(modulo.MAX_PAGINAS, math.ceil(recuento / modulo.PRODUCTOS_POR_PAGINA))
+        claves = {comun_crawl.clave_pagina(f"sort={criterio}", pagina)
+                  for criterio in modulo.CRITERIOS_ORDENACION for pagina in range(1, por_criterio + 1)}
+
+    paginas = {}
+    for clave in claves:
+        consulta, pagina = clave.rsplit("|", 1)
+        visitas, cambios = estadisticas.get(clave, (0, 0))
+        paginas.setdefault(consulta, []).append((int(pagina), visitas, cambios))
+    return {consulta: sorted(lista) for consulta, lista in paginas.items()}
+
+def probabilidad_cambio_pagina(visitas, cambios, tasa_categoria, productos_por_pagina):
+    """
+    Probabilidad de que una página traiga algún cambio: su historial, suavizado
+    con la tasa de la categoría como previa
+    """
+    previa = 1 - (1 - tasa_categoria) ** productos_por_pagina
+    return (cambios + PESO_PREVIO * previa) / (visitas + PESO_PREVIO)
+
+# ============================================ #
+#          REPARTO DEL PRESUPUESTO             #
+# ============================================ #
+
+def planificar(categorias, presupuesto):
+    """
+    Reparte el presupuesto de páginas por ganancia esperada
+
+    Cada consulta se recorre desde la página 1, así que se asignan prefijos: un
+    montículo ofrece la siguiente página de cada consulta y se toma siempre la
+    de mayor probabilidad de cambio. La primera página de cada consulta se
+    asigna siempre. Si sobra presupuesto tras cubrir todas las páginas, las
+    categorías más volátiles reciben pasadas adicionales en el día.
+
+    Args:
+        categorias: dict categoría -> {'tasa', 'paginas': consulta -> [(página, ganancia)]}
+
+    Returns:
+        dict: categoría -> {'paginas': consulta -> profundidad, 'paginas_asignadas', 'ganancia_esperada', 'pasadas'}
+    """
+    plan = {nombre: {'paginas': {}, 'paginas_asignadas': 0, 'ganancia_esperada': 0.0, 'pasadas': 1}
+            for nombre in categorias}
+    ofertas = []
+    usado = 0
+
+    def asignar(nombre, consulta, indice):
+        nonlocal usado
+        pagina, ganancia = categorias[nombre]['paginas'][consulta][indice]
+        plan[nombre]['paginas'][consulta] = pagina
+        plan[nombre]['paginas_asignadas'] += 1
+        plan[nombre]['ganancia_esperada'] += ganancia
+        usado += 1
+        if indice + 1 < len(categorias[nombre]['paginas'][consulta]):
+            siguiente = categorias[nombre]['paginas'][consulta][indice + 1][1]
+            heapq.heappush(ofertas, (-siguiente, nombre, consulta, indice + 1))
+
+    for nombre, info in categorias.items():
+        for consulta, paginas in info['paginas'].items():
+            if paginas:
+                asignar(nombre, consulta, 0)
+
+    while ofertas and usado < presupuesto:
+        _, nombre, consulta, indice = heapq.heappop(ofertas)
+        asignar(nombre, consulta, indice)
+
+    sobrante = presupuesto - usado
+    ganancia_total = sum(p['ganancia_esperada'] for p in plan.values())
+    if not ofertas and sobrante > 0 and ganancia_total:
+        for nombre, entrada in plan.items():
+            reparto = sobrante * entrada['ganancia_esperada'] / ganancia_total
+            extra = int(reparto // max(entrada['paginas_asignadas'], 1))
+            entrada['pasadas'] = min(MAX_PASADAS, 1 + extra)
+
+    for entrada in plan.values():
+        entrada['ganancia_esperada'] = round(entrada['ganancia_esperada'], 2)
+    return plan
+
+# ============================================ #
+#          FUNCION PRINCIPAL                   #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Plan diario de páginas por volatilidad de precios")
+    parser.add_argument(
+        "--presupuesto-paginas",
+        type=int,
+        default=600,
+        help="Páginas de listado que se pueden recorrer al día entre todas las categorías"
+    )
+    parser.add_argument(
+        "--categorias",
+        nargs="+",
+        choices=list(comun_categorias.SCRIPTS_CATEGORIAS),
+        default=None,
+        help="Categorías a planificar (todas por defecto)"
+    )
+    parser.add_argument(
+        "--historico",
+        nargs="+",
+        default=None,
+        help="CSV históricos locales (<categoria>_mediamarkt.csv) en lugar de los de Google Drive"
+    )
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Función principal"""
+    if args is None:
+        args = parsear_argumentos()
+
+    print("="*60)
+    print("PLANIFICADOR DIARIO POR VOLATILIDAD - MEDIAMARKT")
+    print("="*60)
+    print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+
+    try:
+        modulos = comun_categorias.cargar_categorias(args.categorias)
+        historico = comun_historico.cargar_historico(args.historico, args.categorias)
+        tasas = tasas_categoria(historico)
+        tasas_validas = [tasa for tasa in tasas.values() if tasa is not None]
+        tasa_media = sum(tasas_validas) / len(tasas_validas) if tasas_validas else 0.05
+
+        categorias = {}
+        for nombre, modulo in modulos.items():
+            tasa = tasas.get(nombre)
+            tasa = tasa_media if tasa is None else tasa
+            paginas = paginas_categoria(modulo, ultimo_recuento(historico, nombre) if not historico.empty else None)
+            categorias[nombre] = {
+                'tasa': tasa,
+                'paginas': {
+                    consulta: [(pagina, probabilidad_cambio_pagina(visitas, cambios, tasa, modulo.PRODUCTOS_POR_PAGINA))
+                               for pagina, visitas, cambios in lista]
+                    for consulta, lista in paginas.items()
+                },
+            }
+
+        reparto = planificar(categorias, args.presupuesto_paginas)
+
+        plan = {
+            'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'presupuesto_paginas': args.presupuesto_paginas,
+            'categorias': {
+                nombre: dict(entrada, slug=modulos[nombre].SLUG_CATEGORIA,
+                             tasa_cambio=round(categorias[nombre]['tasa'], 4))
+                for nombre, entrada in reparto.items()
+            },
+        }
+
+        print(f"\n📋 Plan para {args.presupuesto_paginas} páginas:")
+        for nombre, entrada in sorted(plan['categorias'].items(), key=lambda item: -item[1]['tasa_cambio']):
+            print(f"   {nombre}: tasa {entrada['tasa_cambio'] * 100:.1f}%/día, "
+                  f"{entrada['paginas_asignadas']} páginas, {entrada['pasadas']} pasadas, "
+                  f"~{entrada['ganancia_esperada']:.0f} páginas con cambios")
+
+        comun_crawl.guardar_json(RUTA_PLAN, plan)
+        os.makedirs("scraping_results", exist_ok=True)
+        copia = f"scraping_results/plan_diario_{datetime.now().strftime('%Y%m%d')}.json"
+        comun_crawl.guardar_json(copia, plan)
+        print(f"\n✅ Plan guardado en {RUTA_PLAN} (copia en {copia})")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error en la ejecución: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        print("\n" + "="*60)
+        print("EJECUCIÓN FINALIZADA")
+        print("="*60)
+
+if __name__ == "__main__":
+    exito = main()
+    sys.exit(0 if exito else 1)
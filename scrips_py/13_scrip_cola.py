@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Crawl de MediaMarkt repartido entre varios procesos o máquinas con una cola SQLite
+  encolar:  lee el total de cada categoría y mete su rejilla consulta x página en la cola
+  trabajar: lanza N procesos worker (cada uno con su navegador) que vacían la cola
+  estado:   muestra cuántas tareas hay en cada estado
+  exportar: vuelca los resultados de la cola a un fragmento JSONL por categoría
+  recoger:  fusiona los resultados de la cola (y otros fragmentos) y guarda el CSV de cada categoría
+Para trabajar desde varias máquinas basta con que compartan el fichero de la cola
+o con que cada una exporte sus fragmentos y se fusionen al recoger
+"""
+
+from datetime import datetime
+from multiprocessing import Process
+import argparse
+import glob
+import os
+import socket
+import sys
+
+import comun_categorias
+import comun_cola
+import comun_crawl
+
+# ============================================ #
+#          SUBCOMANDOS                         #
+# ============================================ #
+
+def encolar(cola, modulos):
+    """Mete en la cola la rejilla criterio x página de cada categoría"""
+    primero = next(iter(modulos.values()))
+    driver = primero.mediamark_mob_(primero.construir_url_listado("sort=currentprice+desc"))
+    try:
+        for nombre, modulo in modulos.items():
+            total_articulos, paginas = comun_categorias.preparar_categoria(driver, modulo)
+            consultas = [f"sort={criterio}" for criterio in modulo.CRITERIOS_ORDENACION]
+            nuevas = cola.encolar(nombre, consultas, paginas, total_articulos, modulo.PRODUCTOS_POR_PAGINA)
+            print(f"📥 {nombre}: {nuevas} tareas nuevas ({len(consultas)} consultas x {paginas} páginas)")
+    finally:
+        primero.cerrar_navegadores([driver])
+
+def trabajar(opciones):
+    """Lanza los procesos worker y espera a que terminen"""
+    procesos = [
+        Process(
+            target=comun_cola.trabajar,
+            args=(opciones.cola, opciones.categorias, i, opciones.visibilidad, opciones.max_intentos),
+            kwargs={'ritmo_fijo': opciones.ritmo_fijo},
+        )
+        for i in range(opciones.procesos)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    for proceso in procesos:
+        proceso.join()
+    return all(proceso.exitcode == 0 for proceso in procesos)
+
+def ruta_fragmento(directorio, nombre):
+    """Fragmento de resultados de una categoría exportado desde esta máquina"""
+    return os.path.join(directorio, f"fragmento_{nombre}_{socket.gethostname()}.jsonl")
+
+def exportar(cola, modulos, directorio):
+    """Vuelca los resultados de cada categoría a un fragmento JSONL"""
+    for nombre in modulos:
+        ruta = ruta_fragmento(directorio, nombre)
+        filas = comun_crawl.escribir_fragmento(ruta, cola.fragmento(nombre))
+        print(f"📤 {nombre}: {filas} filas en {ruta}")
+
+def recoger(cola, modulos, directorio_fragmentos=None, vaciar=False):
+    """
+    Fusiona los productos de la cola con los fragmentos exportados por otras
+    máquinas y guarda el CSV de cada categoría (local y Google Drive)
+    """
+    exito = True
+    for nombre, modulo in modulos.items():
+        estados = cola.contar().get(nombre, {})
+        if estados.get('pendiente') or estados.get('prestada'):
+            print(f"⏳ {nombre}: quedan {estados.get('pendiente', 0) + estados.get('prestada', 0)} tareas sin terminar")
+
+        fragmentos = [cola.fragmento(nombre)]
+        if directorio_fragmentos:
+            rutas = sorted(glob.glob(os.path.join(directorio_fragmentos, f"fragmento_{nombre}_*.jsonl")))
+            fragmentos += [comun_crawl.leer_fragmento(ruta) for ruta in rutas]
+            print(f"🧩 {nombre}: fusionando la cola con {len(rutas)} fragmentos")
+        productos_data = list(comun_crawl.fusionar_fragmentos(fragmentos))
+        if not productos_data:
+            print(f"❌ No hay productos de {nombre} en la cola")
+            exito = False
+            continue
+
+        total_articulos = cola.total_articulos(nombre)
+        motivo = 'pendientes' if estados.get('pendiente') or estados.get('prestada') else None
+        if not motivo and estados.get('fallida'):
+            motivo = 'fallidas'
+        resumen = {
+            'parcial': motivo is not None,
+            'motivo_parcial': motivo,
+            'total_articulos': total_articulos,
+            'cobertura': None,
+        }
+        if total_articulos:
+            resumen['cobertura'] = round(min(len(productos_data) / total_articulos * 100, 100.0), 1)
+        print(f"\n📦 {nombre}: {len(productos_data)} productos únicos")
+
+        df, _ = modulo.guardar_en_dataframe(productos_data, resumen)
+        if df is None or not modulo.actualizar_csv_drive(df):
+            print(f"⚠️  No se pudo actualizar Google Drive para {nombre}")
+        elif vaciar:
+            cola.vaciar(nombre)
+    return exito
+
+# ============================================ #
+#          FUNCION PRINCIPAL                   #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Crawl de MediaMarkt repartido con una cola SQLite")
+    parser.add_argument(
+        "accion",
+        choices=["encolar", "trabajar", "estado", "exportar", "recoger"],
+        help="Paso a ejecutar"
+    )
+    parser.add_argument(
+        "--cola",
+        default=comun_cola.RUTA_COLA,
+        help="Fichero SQLite de la cola (compartido por todos los workers)"
+    )
+    parser.add_argument(
+        "--categorias",
+        nargs="+",
+        choices=list(comun_categorias.SCRIPTS_CATEGORIAS),
+        default=None,
+        help="Categorías a encolar, trabajar o recoger (todas por defecto)"
+    )
+    parser.add_argument(
+        "--procesos",
+        type=int,
+        default=2,
+        help="Procesos worker que se lanzan en esta máquina (cada uno con su navegador)"
+    )
+    parser.add_argument(
+        "--visibilidad",
+        type=int,
+        default=comun_cola.VISIBILIDAD,
+        help="Segundos que una tarea queda reservada antes de volver a la cola si su worker no responde"
+    )
+    parser.add_argument(
+        "--max-intentos",
+        type=int,
+        default=3,
+        help="Préstamos de una tarea antes de darla por fallida"
+    )
+    parser.add_argument(
+        "--ritmo-fijo",
+        action="store_true",
+        help="Desactiva el control adaptativo del ritmo en cada worker"
+    )
+    parser.add_argument(
+        "--fragmentos",
+        default=None,
+        help="Directorio de fragmentos JSONL: destino de 'exportar' y fragmentos extra que fusiona 'recoger'"
+    )
+    parser.add_argument(
+        "--vaciar",
+        action="store_true",
+        help="Al recoger, borra de la cola las categorías guardadas"
+    )
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Función principal"""
+    if args is None:
+        args = parsear_argumentos()
+
+    print("="*60)
+    print(f"COLA DE CRAWL ({args.accion.upper()}) - MEDIAMARKT")
+    print("="*60)
+    print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+
+    cola = comun_cola.ColaTareas(args.cola, args.visibilidad, args.max_intentos)
+    try:
+        exito = True
+        if args.accion == "encolar":
+            encolar(cola, comun_categorias.cargar_categorias(args.categorias))
+        elif args.accion == "trabajar":
+            exito = trabajar(args)
+        elif args.accion == "exportar":
+            exportar(cola, args.categorias or list(comun_categorias.SCRIPTS_CATEGORIAS),
+                     args.fragmentos or "scraping_results")
+        elif args.accion == "recoger":
+            exito = recoger(cola, comun_categorias.cargar_categorias(args.categorias), args.fragmentos, args.vaciar)
+        cola.imprimir_informe()
+        return exito
+
+    except Exception as e:
+        print(f"❌ Error en la ejecución: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        cola.cerrar()
+
+        print("\n" + "="*60)
+        print("EJECUCIÓN FINALIZADA")
+        print("="*60)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
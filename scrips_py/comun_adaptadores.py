@@ -0,0 +1,738 @@
+#!/usr/bin/env python3
+"""
+Adaptadores de tienda para el motor de crawl
+Un adaptador reúne todo lo que depende del HTML de una tienda concreta: la URL
+de un listado, cuándo está lista la rejilla, cómo se leen las tarjetas y el
+total de artículos y cómo se acepta el banner de cookies. El ejecutor, el ritmo,
+las cachés, los checkpoints y el guardado no saben de qué tienda se trata, así
+que para otra tienda basta con un adaptador nuevo registrado en ADAPTADORES
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+import math
+import os
+import re
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+import comun_crawl
+import comun_traza
+
+DIRECTORIO_DERIVA = "scraping_cache/deriva"
+
+# ============================================ #
+#          PLANES DE SELECTORES                #
+# ============================================ #
+
+class PlanSelectores:
+    """
+    Selectores alternativos de un mismo dato, probados en el orden que mejor
+    viene funcionando.
+
+    Cada lectura registra qué selector acertó (o que no acertó ninguno) y la
+    puntuación de cada selector es una media móvil exponencial de sus aciertos,
+    así que manda lo que pasó en las páginas recientes. El orden se recalcula
+    cada 'reordenar_cada' lecturas; a igual puntuación se respeta el orden
+    original de la lista.
+    """
+
+    def __init__(self, selectores, puntuaciones=None, memoria=0.9, reordenar_cada=20):
+        self.selectores = list(selectores)
+        puntuaciones = puntuaciones or {}
+        self.puntuaciones = {selector: puntuaciones.get(selector, 0.0) for selector in self.selectores}
+        self.memoria = memoria
+        self.reordenar_cada = reordenar_cada
+        self.lock = threading.Lock()
+        self.lecturas = 0
+        self.aciertos = {selector: 0 for selector in self.selectores}
+        self.sin_acierto = 0
+        self._reordenar()
+
+    def _reordenar(self):
+        self.orden = sorted(self.selectores, key=lambda s: (-self.puntuaciones[s], self.selectores.index(s)))
+
+    def registrar(self, ganador):
+        """Anota el selector que acertó en una lectura (None si ninguno)"""
+        with self.lock:
+            for selector in self.selectores:
+                acierto = 1.0 if selector == ganador else 0.0
+                self.puntuaciones[selector] = self.memoria * self.puntuaciones[selector] + (1 - self.memoria) * acierto
+            if ganador is None:
+                self.sin_acierto += 1
+            else:
+                self.aciertos[ganador] += 1
+            self.lecturas += 1
+            if self.lecturas % self.reordenar_cada == 0:
+                self._reordenar()
+
+    def imprimir_informe(self, nombre):
+        if not self.lecturas:
+            return
+        primero = self.orden[0]
+        respaldo = sum(aciertos for selector, aciertos in self.aciertos.items() if selector != primero)
+        print(f"   {nombre}: primero '{primero}' ({self.aciertos[primero]} aciertos), "
+              f"respaldos {respaldo}, sin acierto {self.sin_acierto} de {self.lecturas} lecturas")
+
+# ============================================ #
+#          DERIVA DE SELECTORES                #
+# ============================================ #
+
+class DetectorDeriva:
+    """
+    Control de salud de la extracción en las primeras páginas de la ejecución.
+
+    Acumula las tarjetas leídas frente a las esperadas y la fracción de
+    tarjetas con enlace y con precio (leído por los planes o por la búsqueda
+    genérica del símbolo de moneda) y, al completar la muestra, da un único veredicto:
+      'sana':     todo por encima de los umbrales
+      'generica': los planes de precio ya no aciertan pero la búsqueda
+                  genérica sí; se pasa a leer el precio solo con ella
+      'abortar':  faltan tarjetas, enlaces o precios por cualquier vía
+    """
+
+    def __init__(self, paginas_muestra=3, min_tarjetas=0.5, min_enlaces=0.5, min_precios=0.5):
+        self.paginas_muestra = paginas_muestra
+        self.min_tarjetas = min_tarjetas
+        self.min_enlaces = min_enlaces
+        self.min_precios = min_precios
+        self.lock = threading.Lock()
+        self.paginas = 0
+        self.cuentas = {'esperadas': 0, 'tarjetas': 0, 'enlaces': 0, 'precios_plan': 0, 'precios': 0}
+        self.veredicto = None
+        self.motivo = None
+
+    def observar(self, lectura, esperadas):
+        """
+        Anota una página; devuelve el veredicto solo en la página que completa
+        la muestra (None en las demás y después)
+        """
+        with self.lock:
+            if self.veredicto is not None:
+                return None
+            self.paginas += 1
+            self.cuentas['esperadas'] += esperadas
+            for clave in ('tarjetas', 'enlaces', 'precios_plan', 'precios'):
+                self.cuentas[clave] += lectura.get(clave, 0)
+            if self.paginas < self.paginas_muestra:
+                return None
+            self.veredicto, self.motivo = self._evaluar()
+            return self.veredicto
+
+    def _evaluar(self):
+        cuentas = self.cuentas
+        tarjetas = cuentas['tarjetas']
+        ratio_tarjetas = tarjetas / cuentas['esperadas'] if cuentas['esperadas'] else 1.0
+        if not tarjetas or ratio_tarjetas < self.min_tarjetas:
+            return 'abortar', f"solo {tarjetas} tarjetas de {cuentas['esperadas']} esperadas"
+        if cuentas['enlaces'] / tarjetas < self.min_enlaces:
+            return 'abortar', f"solo {cuentas['enlaces']} de {tarjetas} tarjetas con enlace"
+        if cuentas['precios_plan'] / tarjetas >= self.min_precios:
+            return 'sana', None
+        if cuentas['precios'] / tarjetas >= self.min_precios:
+            return 'generica', (f"los selectores de precio aciertan en {cuentas['precios_plan']} de {tarjetas} "
+                                f"tarjetas y la búsqueda genérica en {cuentas['precios']}")
+        return 'abortar', f"solo {cuentas['precios']} de {tarjetas} tarjetas con precio"
+
+def guardar_captura(driver, etiqueta, directorio=DIRECTORIO_DERIVA):
+    """
+    Guarda el HTML y una captura de pantalla de la página actual para ver
+    qué ha cambiado en el sitio
+
+    Returns:
+        str: ruta base de los ficheros (sin extensión), o None si no se pudo guardar
+    """
+    base = os.path.join(directorio, f"{etiqueta}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        with open(f"{base}.html", "w", encoding="utf-8") as f:
+            f.write(driver.page_source)
+        driver.save_screenshot(f"{base}.png")
+        return base
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar la captura de la página: {e}")
+        return None
+
+# ============================================ #
+#          INTERFAZ DEL ADAPTADOR              #
+# ============================================ #
+
+class AdaptadorTienda(ABC):
+    """
+    Interfaz de un adaptador de tienda.
+
+    Se construye con la tienda (URL base, formato de precios, cookies) y con las
+    funciones de la categoría que no dependen del HTML: la marca a partir del
+    nombre y el id consistente del producto. Cada tienda implementa los métodos
+    abstractos; el resto es común.
+    """
+
+    # Listas de selectores alternativos que se compilan en planes adaptativos
+    SELECTORES_PLANES = {}
+
+    def __init__(self, tienda, extraer_marca, generar_id, ruta_planes=None):
+        self.tienda = tienda
+        self.extraer_marca = extraer_marca
+        self.generar_id = generar_id
+        self.ruta_planes = ruta_planes
+        self.planes = None
+        self.lock_planes = threading.Lock()
+        self.deriva = DetectorDeriva()
+        self.estrategia_precio = 'planes'
+        self.lectura = threading.local()
+        self.rejillas = {'paginas': 0, 'sin_desplazar': 0, 'desplazando': 0, 'cortas': 0, 'desplazamientos': 0}
+        self.lock_rejillas = threading.Lock()
+
+    def plan(self, nombre):
+        """
+        Plan de selectores de un dato; se compila una vez por categoría, partiendo
+        del orden que dejó la ejecución anterior
+        """
+        if self.planes is None:
+            with self.lock_planes:
+                if self.planes is None:
+                    guardado = comun_crawl.cargar_json(self.ruta_planes, {}) if self.ruta_planes else {}
+                    self.planes = {
+                        clave: PlanSelectores(selectores, guardado.get('planes', {}).get(clave))
+                        for clave, selectores in self.SELECTORES_PLANES.items()
+                    }
+        return self.planes[nombre]
+
+    def guardar_planes(self):
+        """Guarda las puntuaciones de los selectores para la próxima ejecución"""
+        if not self.planes:
+            return
+        print("\n🧭 Planes de selectores:")
+        for nombre, plan in self.planes.items():
+            plan.imprimir_informe(nombre)
+        if not self.ruta_planes:
+            return
+        try:
+            comun_crawl.guardar_json(self.ruta_planes, {
+                'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'planes': {
+                    nombre: {selector: round(puntuacion, 4) for selector, puntuacion in plan.puntuaciones.items()}
+                    for nombre, plan in self.planes.items()
+                },
+            })
+        except Exception as e:
+            print(f"⚠️ No se pudieron guardar los planes de selectores: {e}")
+
+    def vigilar(self, driver, esperadas, etiqueta):
+        """
+        Pasa al detector de deriva la última página extraída en este hilo y actúa
+        según su veredicto; las páginas en las que no se espera ninguna tarjeta
+        (más allá del total del listado) no cuentan para la muestra
+
+        Raises:
+            comun_crawl.CrawlAbortado: si la extracción ha dejado de ser fiable
+        """
+        lectura = getattr(self.lectura, 'pagina', None) or {}
+        self.lectura.pagina = None
+        if not esperadas:
+            return
+        veredicto = self.deriva.observar(lectura, esperadas)
+        if veredicto is None:
+            return
+        if veredicto == 'sana':
+            print(f"🩺 Extracción sana en las primeras {self.deriva.paginas} páginas")
+            return
+
+        captura = guardar_captura(driver, etiqueta)
+        if captura:
+            print(f"📸 Página guardada en {captura}.html / .png")
+        if veredicto == 'generica':
+            self.estrategia_precio = 'generica'
+            print(f"🩺 Deriva de selectores: {self.deriva.motivo}; el precio se lee con la búsqueda genérica")
+            return
+        print(f"🛑 Deriva de selectores: {self.deriva.motivo}")
+        raise comun_crawl.CrawlAbortado(f"deriva de selectores ({self.deriva.motivo})")
+
+    def opciones_navegador(self):
+        """Configura Chrome para ejecución headless"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+
+        prefs = {"profile.managed_default_content_settings.images": 2}
+        chrome_options.add_experimental_option("prefs", prefs)
+
+        return chrome_options
+
+    def abrir_navegador(self, url):
+        """Inicializa el navegador Chrome en la URL y acepta las cookies"""
+        try:
+            service = Service(ChromeDriverManager().install())
+            driver = comun_traza.envolver(webdriver.Chrome(service=service, options=self.opciones_navegador()))
+
+            driver.get(url)
+            time.sleep(2)
+
+            if self.aceptar_consentimiento(driver):
+                print("✅ Cookies aceptadas")
+            else:
+                print("⚠️ No se encontró el botón de aceptar cookies")
+
+            time.sleep(3)
+            return driver
+
+        except Exception as e:
+            print(f"❌ Error inicializando Chrome: {e}")
+            raise
+
+    @abstractmethod
+    def url_listado(self, url_categoria, consulta, pagina=None):
+        """URL del listado de la categoría con su consulta (orden/filtros) y página"""
+
+    @abstractmethod
+    def aceptar_consentimiento(self, driver):
+        """Acepta el banner de cookies si está en pantalla; True si lo había"""
+
+    @abstractmethod
+    def esperar_rejilla(self, driver, minimo=1, timeout=10):
+        """Espera a que la rejilla muestre al menos 'minimo' tarjetas; False si no llegan"""
+
+    def documento_listo(self, driver):
+        """True si el navegador terminó de cargar el documento (para distinguir rejilla vacía de timeout)"""
+        try:
+            return driver.execute_script("return document.readyState;") == "complete"
+        except Exception:
+            return False
+
+    def completar_rejilla(self, driver, esperadas):
+        """
+        Deja pintadas las 'esperadas' tarjetas de la página (o las que haya si es
+        más corta) antes de extraerlas; sin desplazamiento, solo espera un margen
+
+        Returns:
+            int: tarjetas en la rejilla
+        """
+        self.esperar_rejilla(driver, esperadas, timeout=2)
+        return len(self.leer_ids(driver))
+
+    def _registrar_rejilla(self, desplazamientos, completa):
+        with self.lock_rejillas:
+            self.rejillas['paginas'] += 1
+            self.rejillas['desplazamientos'] += desplazamientos
+            if not completa:
+                self.rejillas['cortas'] += 1
+            elif desplazamientos:
+                self.rejillas['desplazando'] += 1
+            else:
+                self.rejillas['sin_desplazar'] += 1
+
+    def imprimir_informe(self):
+        """Muestra cuántas rejillas necesitaron desplazamiento para pintarse enteras"""
+        rejillas = self.rejillas
+        if not rejillas['paginas']:
+            return
+        print("\n🧱 Rejillas:")
+        print(f"   {rejillas['sin_desplazar']} completas al cargar, {rejillas['desplazando']} completadas desplazando, "
+              f"{rejillas['cortas']} cortas de {rejillas['paginas']} páginas")
+        print(f"   Desplazamientos: {rejillas['desplazamientos']} "
+              f"({rejillas['desplazamientos'] / rejillas['paginas']:.2f} por página)")
+
+    @abstractmethod
+    def leer_total(self, driver, productos_por_pagina):
+        """Total de artículos del listado: (total o None, páginas)"""
+
+    def esperar_total(self, driver, timeout=5):
+        """Espera a que el listado muestre su total de artículos; False si no llega"""
+        return self.esperar_rejilla(driver, timeout=timeout)
+
+    @abstractmethod
+    def leer_ids(self, driver):
+        """Ids de las tarjetas de la rejilla en orden (huella de la página)"""
+
+    @abstractmethod
+    def extraer_tarjetas(self, driver):
+        """
+        Productos de la rejilla cargada, con los campos del CSV; deja en
+        self.lectura.pagina los recuentos que usa el detector de deriva
+        """
+
+    def leer_facetas_marca(self, driver):
+        """Opciones del filtro de marca: (marca, artículos); vacía si la tienda no lo tiene"""
+        return []
+
+# ============================================ #
+#          ADAPTADOR DE MEDIAMARKT             #
+# ============================================ #
+
+class AdaptadorMediaMarkt(AdaptadorTienda):
+    """Selectores y lectura de los listados de MediaMarkt"""
+
+    SELECTOR_TITULO = 'p[data-test="product-title"]'
+    SELECTOR_TOTAL = 'span.sc-94eb08bc-0.AKpzk'
+
+    # Precio actual (precio de venta - color rojo/destacado)
+    SELECTORES_PRECIO_ACTUAL = [
+        'span.sc-94eb08bc-0.iJxYPS',
+        'span.sc-94eb08bc-0.dYbTef.sc-8a3a8cd8-2.csCDkt',
+        'span[class*="sc-94eb08bc-0"][class*="iJxYPS"]',
+    ]
+
+    # Precio original tachado (precio antes del descuento - gris tachado)
+    SELECTORES_PRECIO_TACHADO = [
+        'span.sc-94eb08bc-0.dYbTef.sc-a69e154d-2.dJKnju',
+        'span.sc-94eb08bc-0.OhHlB.sc-8a3a8cd8-2.csCDkt',
+        'span[class*="sc-a69e154d-2"]',
+        'span[class*="dJKnju"]',
+    ]
+
+    SELECTOR_ENLACE = 'a[data-test="mms-router-link-product-list-item-link_mp"]'
+    SELECTORES_ENLACE = [
+        ('a[href*="/p/"]', "Href /p/"),
+        ('a[href*="/product/"]', "Href /product/"),
+        ('a[data-test*="product-list-item-link"]', "data-test genérico"),
+        ('a', "Cualquier enlace"),
+    ]
+
+    SELECTORES_PLANES = {
+        'precio_actual': SELECTORES_PRECIO_ACTUAL,
+        'precio_tachado': SELECTORES_PRECIO_TACHADO,
+    }
+
+    # Lleva la última tarjeta pintada a la vista y espera, observando el DOM, a
+    # que aparezcan más tarjetas o a que pase el plazo; devuelve cuántas hay
+    SCRIPT_DESPLAZAR = """
+        const [selector, previas, plazo, hecho] = arguments;
+        const contar = () => document.querySelectorAll(selector).length;
+        const tarjetas = document.querySelectorAll(selector);
+        if (tarjetas.length) tarjetas[tarjetas.length - 1].scrollIntoView({block: 'start'});
+        if (contar() > previas) { hecho(contar()); return; }
+        let reloj = null;
+        const observador = new MutationObserver(() => {
+            if (contar() > previas) { observador.disconnect(); clearTimeout(reloj); hecho(contar()); }
+        });
+        observador.observe(document.body, {childList: true, subtree: true});
+        reloj = setTimeout(() => { observador.disconnect(); hecho(contar()); }, plazo);
+    """
+
+    SELECTORES_FACETA_MARCA = [
+        '[data-test="mms-search-filter-brand"]',
+        '[data-test*="filter-brand"]',
+        '[data-test*="facet-brand"]',
+        'fieldset[name="brand"]',
+    ]
+
+    def url_listado(self, url_categoria, consulta, pagina=None):
+        url = f"{url_categoria}?{consulta}"
+        if pagina:
+            url += f"&page={pagina}"
+        return url
+
+    def aceptar_consentimiento(self, driver):
+        try:
+            botones = driver.find_elements(By.ID, self.tienda.consentimiento)
+            if botones:
+                botones[0].click()
+                return True
+        except Exception:
+            pass
+        return False
+
+    def esperar_rejilla(self, driver, minimo=1, timeout=10):
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, self.SELECTOR_TITULO)) >= minimo
+            )
+            return True
+        except Exception:
+            return False
+
+    def completar_rejilla(self, driver, esperadas, max_desplazamientos=6, plazo=1.5):
+        """
+        Las tarjetas bajo el pliegue se pintan al acercarse a ellas: mientras
+        falten, se salta a la última pintada y se espera a que crezca la
+        rejilla. Cada desplazamiento es una sola llamada al navegador y termina
+        en cuanto aparecen tarjetas nuevas; si no aparece ninguna en 'plazo'
+        segundos la página es corta de verdad (la última del listado).
+        Se supone que las tarjetas ya pintadas siguen en el DOM al desplazarse
+        """
+        try:
+            tarjetas = driver.execute_script(
+                "return document.querySelectorAll(arguments[0]).length;", self.SELECTOR_TITULO
+            )
+        except Exception:
+            tarjetas = 0
+
+        desplazamientos = 0
+        while tarjetas < esperadas and desplazamientos < max_desplazamientos:
+            try:
+                nuevas = driver.execute_async_script(
+                    self.SCRIPT_DESPLAZAR, self.SELECTOR_TITULO, tarjetas, int(plazo * 1000)
+                )
+            except Exception:
+                break
+            desplazamientos += 1
+            if nuevas <= tarjetas:
+                break
+            tarjetas = nuevas
+
+        self._registrar_rejilla(desplazamientos, tarjetas >= esperadas)
+        return tarjetas
+
+    def leer_total(self, driver, productos_por_pagina):
+        try:
+            elemento_total = driver.find_element(By.CSS_SELECTOR, self.SELECTOR_TOTAL)
+            texto_total = elemento_total.text
+
+            numero_total = re.search(r'\((\d+)', texto_total)
+
+            if numero_total:
+                total_articulos = int(numero_total.group(1))
+                print(f"📊 Total de artículos encontrados: {total_articulos}")
+
+                total_paginas = math.ceil(total_articulos / productos_por_pagina)
+                print(f"📄 Total de páginas a recorrer: {total_paginas}")
+
+                return total_articulos, total_paginas
+            else:
+                print("❌ No se pudo extraer el número total de artículos")
+                return None, 10
+
+        except Exception as e:
+            print(f"❌ Error obteniendo el total de artículos: {e}")
+            return None, 10
+
+    def esperar_total(self, driver, timeout=5):
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: any(re.search(r'\(\d+', e.text) for e in d.find_elements(By.CSS_SELECTOR, self.SELECTOR_TOTAL))
+            )
+            return True
+        except Exception:
+            return False
+
+    def leer_ids(self, driver):
+        try:
+            titulos = driver.execute_script(
+                "return Array.from(document.querySelectorAll(arguments[0]), p => p.innerText.trim());",
+                self.SELECTOR_TITULO
+            )
+            return [self.generar_id(titulo) for titulo in titulos or [] if titulo]
+        except Exception:
+            return []
+
+    def _leer_con_plan(self, contenedor, nombre, texto):
+        """
+        Prueba los selectores del plan en su orden actual hasta encontrar un
+        texto con precio; sin excepciones por cada selector que no está
+
+        Returns:
+            tuple: (último texto leído o 'texto' si ningún selector encontró nada,
+                    selector que acertó o None)
+        """
+        plan = self.plan(nombre)
+        ganador = None
+        for selector in plan.orden:
+            elementos = contenedor.find_elements(By.CSS_SELECTOR, selector)
+            if not elementos:
+                continue
+            texto = elementos[0].text.strip()
+            if texto and self.tienda.moneda in texto:
+                ganador = selector
+                break
+        plan.registrar(ganador)
+        return texto, ganador
+
+    def _xpath_moneda(self):
+        """XPath de los elementos cuyo texto lleva el símbolo de moneda de la tienda"""
+        return f".//*[contains(text(), '{self.tienda.moneda}')]"
+
+    def _es_precio(self, texto):
+        """True si el texto lleva la moneda de la tienda y algún dígito"""
+        return self.tienda.moneda in texto and any(c.isdigit() for c in texto)
+
+    def _precio_generico(self, contenedor):
+        """Primer texto con la moneda de la tienda y algún dígito de la tarjeta (None si no hay)"""
+        try:
+            for elem in contenedor.find_elements(By.XPATH, self._xpath_moneda()):
+                texto = elem.text.strip()
+                if self._es_precio(texto):
+                    return texto
+        except Exception:
+            pass
+        return None
+
+    def extraer_precios(self, contenedor_producto):
+        """
+        Extrae AMBOS precios: actual y original (tachado), con los planes de
+        selectores de la categoría. Con la estrategia 'generica' (los planes
+        dejaron de acertar) solo se lee el precio actual con la búsqueda de la moneda
+
+        Returns:
+            tuple: (precio_actual, precio_original_tachado, True si acertó el plan del precio actual)
+
+        NOTA: Los nombres aquí son descriptivos, luego se renombrarán en guardar_en_dataframe()
+        para mantener compatibilidad con el formato antiguo del CSV
+        """
+        precio_actual = "Precio no disponible"
+        precio_original_tachado = None
+
+        if self.estrategia_precio == 'generica':
+            return self._precio_generico(contenedor_producto) or precio_actual, None, False
+
+        try:
+            # 1. PRECIO ACTUAL
+            precio_actual, ganador = self._leer_con_plan(contenedor_producto, 'precio_actual', precio_actual)
+
+            # 2. PRECIO ORIGINAL TACHADO
+            precio_original_tachado, _ = self._leer_con_plan(
+                contenedor_producto, 'precio_tachado', precio_original_tachado
+            )
+
+            # 3. Si no encontramos precio actual, buscar cualquier precio
+            if precio_actual == "Precio no disponible":
+                precio_actual = self._precio_generico(contenedor_producto) or precio_actual
+
+            return precio_actual, precio_original_tachado, ganador is not None
+
+        except Exception as e:
+            return f"Error: {e}", None, False
+
+    def extraer_enlace(self, contenedor_producto, driver, profundidad=0, max_profundidad=3):
+        """Extrae el enlace del producto buscando en la tarjeta y sus contenedores"""
+        if profundidad > max_profundidad:
+            return "No disponible"
+
+        try:
+            WebDriverWait(driver, 2).until(
+                lambda d: contenedor_producto.is_displayed()
+            )
+        except Exception:
+            pass
+
+        try:
+            enlace_element = WebDriverWait(contenedor_producto, 2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.SELECTOR_ENLACE))
+            )
+            href = enlace_element.get_attribute('href')
+            if href and 'mediamarkt' in href:
+                return self.tienda.enlace_absoluto(href)
+        except Exception:
+            pass
+
+        for selector, descripcion in self.SELECTORES_ENLACE:
+            try:
+                elementos = contenedor_producto.find_elements(By.CSS_SELECTOR, selector)
+                for elemento in elementos:
+                    href = elemento.get_attribute("href")
+                    if not href or "mediamarkt" not in href:
+                        continue
+                    if "/p/" not in href and "/product/" not in href:
+                        continue
+                    return self.tienda.enlace_absoluto(href)
+            except Exception:
+                continue
+
+        if profundidad < max_profundidad:
+            try:
+                padre = contenedor_producto.find_element(By.XPATH, "./..")
+                return self.extraer_enlace(padre, driver, profundidad+1, max_profundidad)
+            except Exception:
+                pass
+
+        return "No disponible"
+
+    def extraer_tarjetas(self, driver):
+        productos_pagina = []
+        lectura = {'tarjetas': 0, 'enlaces': 0, 'precios_plan': 0, 'precios': 0}
+        self.lectura.pagina = lectura
+
+        try:
+            titulos = driver.find_elements(By.CSS_SELECTOR, self.SELECTOR_TITULO)
+            print(f"   🔍 Encontrados {len(titulos)} productos en la página")
+            lectura['tarjetas'] = len(titulos)
+
+            for i, titulo in enumerate(titulos, start=1):
+                try:
+                    nombre = titulo.text.strip()
+
+                    # ENLACE
+                    try:
+                        enlace_elem = titulo.find_element(By.XPATH, ".//ancestor::a[1]")
+                        enlace = self.tienda.enlace_absoluto(enlace_elem.get_attribute("href"))
+                    except Exception:
+                        enlace = "No disponible"
+
+                    # CONTENEDOR
+                    contenedor = titulo
+                    for _ in range(5):
+                        contenedor = contenedor.find_element(By.XPATH, "./..")
+                        precios = contenedor.find_elements(By.XPATH, self._xpath_moneda())
+                        if precios:
+                            break
+
+                    # PRECIOS (AMBOS)
+                    # Usamos nombres temporales que luego se renombrarán
+                    precio_actual, precio_original_tachado, acierto_plan = self.extraer_precios(contenedor)
+                    lectura['precios_plan'] += acierto_plan
+                    lectura['precios'] += self._es_precio(str(precio_actual))
+                    lectura['enlaces'] += bool(enlace) and enlace != "No disponible"
+
+                    productos_pagina.append({
+                        'id': self.generar_id(nombre),
+                        'nombre': nombre,
+                        'precio_actual_temp': precio_actual,  # Será 'precio'
+                        'precio_original_temp': precio_original_tachado,  # Será 'precio_rebajado'
+                        'marca': self.extraer_marca(nombre),
+                        'enlace': enlace
+                    })
+
+                except Exception as e:
+                    print(f"   ❌ Error en producto {i}: {e}")
+                    continue
+
+            return productos_pagina
+
+        except Exception as e:
+            print(f"❌ Error extrayendo productos de la página: {e}")
+            return productos_pagina
+
+    def leer_facetas_marca(self, driver):
+        for selector in self.SELECTORES_FACETA_MARCA:
+            try:
+                faceta = driver.find_element(By.CSS_SELECTOR, selector)
+            except:
+                continue
+
+            # Desplegar la lista completa si la faceta muestra solo las primeras marcas
+            try:
+                for boton in faceta.find_elements(By.CSS_SELECTOR, 'button'):
+                    if 'más' in boton.text.lower():
+                        boton.click()
+                        time.sleep(1)
+            except:
+                pass
+
+            opciones = []
+            for etiqueta in faceta.find_elements(By.CSS_SELECTOR, 'label'):
+                coincidencia = re.match(r'^(.*?)\s*\((\d+)\)\s*$', etiqueta.text.strip())
+                if coincidencia and coincidencia.group(1):
+                    opciones.append((coincidencia.group(1).strip(), int(coincidencia.group(2))))
+
+            if opciones:
+                print(f"🏷️  Faceta de marca: {len(opciones)} marcas ({selector})")
+                return opciones
+
+        print("⚠️ No se encontró la faceta de marca")
+        return []
+
+ADAPTADORES = {
+    'mediamarkt': AdaptadorMediaMarkt,
+}
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Registro de los scripts de categoría de MediaMarkt
+Permite cargar cada script como módulo y reutilizar su ScraperCategoria desde
+los ejecutores que trabajan con varias categorías a la vez
+"""
+
+import importlib.util
+import os
+
+import comun_tiendas
+
+DIRECTORIO_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPTS_CATEGORIAS = {
+    'ebooks': '01_scrip_ebooks.py',
+    'smartphones': '02_scrip_smartphones.py',
+    'monitores': '03_scrip_monitores.py',
+    'laptops': '04_scrip_laptops.py',
+    'printers': '05_scrip_printers.py',
+    'tablets': '06_scrip_tablets.py',
+    'tvs': '07_scrip_tvs.py',
+}
+
+_modulos = {}
+
+def cargar_categoria(nombre, tienda=comun_tiendas.TIENDA_POR_DEFECTO):
+    """
+    Carga (una sola vez por tienda) el script de una categoría como módulo y
+    devuelve su ScraperCategoria; cada tienda tiene su propia copia, apuntada a
+    su URL e id de categoría
+    """
+    clave = nombre if tienda == comun_tiendas.TIENDA_POR_DEFECTO else f"{nombre}_{tienda}"
+    if clave not in _modulos:
+        if nombre not in SCRIPTS_CATEGORIAS:
+            raise ValueError(f"Categoría desconocida: {nombre}")
+        if tienda not in comun_tiendas.TIENDAS:
+            raise ValueError(f"Tienda desconocida: {tienda}")
+        slug = comun_tiendas.slug_categoria(tienda, nombre)
+        ruta = os.path.join(DIRECTORIO_SCRIPTS, SCRIPTS_CATEGORIAS[nombre])
+        spec = importlib.util.spec_from_file_location(f"categoria_{clave}", ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        if tienda != comun_tiendas.TIENDA_POR_DEFECTO:
+            modulo.CATEGORIA.configurar_tienda(comun_tiendas.TIENDAS[tienda], slug)
+        _modulos[clave] = modulo.CATEGORIA
+    return _modulos[clave]
+
+def cargar_categorias(nombres=None, tiendas=None):
+    """
+    Carga varias categorías (todas por defecto) en el orden del registro, en una
+    o varias tiendas; las claves de las tiendas que no son la española llevan
+    su código como sufijo (p. ej. 'tvs_de')
+    """
+    nombres = nombres or list(SCRIPTS_CATEGORIAS)
+    modulos = {}
+    for tienda in tiendas or [comun_tiendas.TIENDA_POR_DEFECTO]:
+        for nombre in nombres:
+            clave = nombre if tienda == comun_tiendas.TIENDA_POR_DEFECTO else f"{nombre}_{tienda}"
+            modulos[clave] = cargar_categoria(nombre, tienda)
+    return modulos
+
+def preparar_categoria(driver, modulo):
+    """Lee el total de artículos de una categoría y devuelve las páginas a recorrer"""
+    driver.get(modulo.construir_url_listado("sort=currentprice+desc"))
+    total_articulos, total_paginas = modulo.obtener_total_articulos(driver)
+    modulo.anotar_articulos(modulo.consultas_ordenacion(), total_articulos)
+    return total_articulos, modulo.paginas_a_recorrer(total_articulos, total_paginas)
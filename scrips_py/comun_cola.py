@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Cola de tareas de crawl compartida entre procesos (y máquinas) en un fichero SQLite
+Cada tarea (categoría, consulta, página) se presta a un worker durante un tiempo
+de visibilidad: si el worker no la completa a tiempo (se cayó, se colgó) vuelve a
+quedar disponible para otro, hasta agotar sus intentos
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+
+import comun_categorias
+import comun_crawl
+
+RUTA_COLA = "scraping_cache/cola_tareas.sqlite"
+
+# Segundos que una tarea queda reservada para el worker que la tomó
+VISIBILIDAD = 300
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tareas (
+    categoria TEXT NOT NULL,
+    consulta TEXT NOT NULL,
+    pagina INTEGER NOT NULL,
+    orden INTEGER NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    prestada_hasta REAL,
+    worker TEXT,
+    error TEXT,
+    productos TEXT,
+    actualizada REAL,
+    PRIMARY KEY (categoria, consulta, pagina)
+);
+CREATE INDEX IF NOT EXISTS tareas_estado ON tareas (estado, pagina, orden);
+CREATE TABLE IF NOT EXISTS categorias (
+    categoria TEXT PRIMARY KEY,
+    total_articulos INTEGER,
+    productos_por_pagina INTEGER NOT NULL
+);
+"""
+
+# ============================================ #
+#          COLA CON PRÉSTAMOS                  #
+# ============================================ #
+
+class ColaTareas:
+    """
+    Cola de tareas de crawl en SQLite con préstamos (lease) y reintentos.
+
+    Estados de una tarea: 'pendiente', 'prestada', 'hecha', 'fallida' (agotó sus
+    intentos) y 'cortada' (una página anterior de su consulta vino incompleta,
+    así que no hay más páginas). Una tarea 'prestada' cuyo préstamo caducó se
+    considera disponible de nuevo. Cada operación es una transacción corta
+    (BEGIN IMMEDIATE), así que varios procesos pueden compartir el fichero.
+    """
+
+    def __init__(self, ruta=RUTA_COLA, visibilidad=VISIBILIDAD, max_intentos=3):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.ruta = ruta
+        self.visibilidad = visibilidad
+        self.max_intentos = max_intentos
+        self.conexion = sqlite3.connect(ruta, timeout=60, isolation_level=None)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.executescript(ESQUEMA)
+
+    def _transaccion(self, operacion):
+        cursor = self.conexion.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            resultado = operacion(cursor)
+            cursor.execute("COMMIT")
+            return resultado
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def encolar(self, categoria, consultas, max_paginas, total_articulos=None, productos_por_pagina=12):
+        """
+        Añade la rejilla consulta x página de una categoría (las tareas que ya
+        existen no se tocan, así que encolar dos veces no duplica trabajo)
+
+        Args:
+            max_paginas: entero o dict consulta -> páginas
+        """
+        filas = []
+        for orden, consulta in enumerate(consultas):
+            paginas = max_paginas.get(consulta, 0) if isinstance(max_paginas, dict) else max_paginas
+            filas += [(categoria, consulta, pagina, orden, time.time()) for pagina in range(1, paginas + 1)]
+
+        def operacion(cursor):
+            cursor.execute(
+                "INSERT OR REPLACE INTO categorias VALUES (?, ?, ?)",
+                (categoria, total_articulos, productos_por_pagina)
+            )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO tareas (categoria, consulta, pagina, orden, actualizada) VALUES (?, ?, ?, ?, ?)",
+                filas
+            )
+            return cursor.rowcount
+        return self._transaccion(operacion)
+
+    def tomar(self, worker, categorias=None):
+        """
+        Presta al worker la siguiente tarea disponible (primero las páginas bajas,
+        que son las que deciden dónde acaba cada consulta)
+
+        Returns:
+            dict: la tarea, o None si no hay ninguna disponible ahora
+        """
+        def operacion(cursor):
+            ahora = time.time()
+            # Los préstamos caducados que ya agotaron sus intentos no vuelven a la cola
+            cursor.execute(
+                "UPDATE tareas SET estado = 'fallida', error = 'préstamo caducado', actualizada = ? "
+                "WHERE estado = 'prestada' AND prestada_hasta < ? AND intentos >= ?",
+                (ahora, ahora, self.max_intentos)
+            )
+            filtro = ""
+            parametros = [ahora]
+            if categorias:
+                filtro = f" AND categoria IN ({', '.join('?' * len(categorias))})"
+                parametros += list(categorias)
+            fila = cursor.execute(
+                "SELECT categoria, consulta, pagina, intentos FROM tareas "
+                "WHERE (estado = 'pendiente' OR (estado = 'prestada' AND prestada_hasta < ?))"
+                f"{filtro} ORDER BY pagina, orden, categoria LIMIT 1",
+                parametros
+            ).fetchone()
+            if fila is None:
+                return None
+            categoria, consulta, pagina, intentos = fila
+            cursor.execute(
+                "UPDATE tareas SET estado = 'prestada', intentos = ?, prestada_hasta = ?, worker = ?, actualizada = ? "
+                "WHERE categoria = ? AND consulta = ? AND pagina = ?",
+                (intentos + 1, ahora + self.visibilidad, worker, ahora, categoria, consulta, pagina)
+            )
+            return {'categoria': categoria, 'consulta': consulta, 'pagina': pagina,
+                    'intento': intentos + 1, 'worker': worker}
+        return self._transaccion(operacion)
+
+    def completar(self, tarea, productos):
+        """
+        Guarda los productos de una tarea prestada. Si la página vino incompleta,
+        las páginas siguientes de su consulta que nadie ha tomado se cortan.
+
+        Returns:
+            bool: False si el préstamo ya no era de este worker (resultado descartado)
+        """
+        def operacion(cursor):
+            ahora = time.time()
+            cursor.execute(
+                "UPDATE tareas SET estado = 'hecha', productos = ?, error = NULL, actualizada = ? "
+                "WHERE categoria = ? AND consulta = ? AND pagina = ? AND estado = 'prestada' AND worker = ?",
+                (json.dumps(productos, ensure_ascii=False), ahora,
+                 tarea['categoria'], tarea['consulta'], tarea['pagina'], tarea['worker'])
+            )
+            if cursor.rowcount == 0:
+                return False
+            por_pagina = cursor.execute(
+                "SELECT productos_por_pagina FROM categorias WHERE categoria = ?", (tarea['categoria'],)
+            ).fetchone()
+            if len(productos) < (por_pagina[0] if por_pagina else 12):
+                cursor.execute(
+                    "UPDATE tareas SET estado = 'cortada', actualizada = ? "
+                    "WHERE categoria = ? AND consulta = ? AND pagina > ? AND estado = 'pendiente'",
+                    (ahora, tarea['categoria'], tarea['consulta'], tarea['pagina'])
+                )
+            return True
+        return self._transaccion(operacion)
+
+    def fallar(self, tarea, error):
+        """Devuelve la tarea a la cola, o la da por fallida si agotó sus intentos"""
+        estado = 'fallida' if tarea['intento'] >= self.max_intentos else 'pendiente'
+
+        def operacion(cursor):
+            cursor.execute(
+                "UPDATE tareas SET estado = ?, error = ?, prestada_hasta = NULL, actualizada = ? "
+                "WHERE categoria = ? AND consulta = ? AND pagina = ? AND estado = 'prestada' AND worker = ?",
+                (estado, str(error), time.time(),
+                 tarea['categoria'], tarea['consulta'], tarea['pagina'], tarea['worker'])
+            )
+            return estado
+        return self._transaccion(operacion)
+
+    def contar(self):
+        """Tareas por categoría y estado: dict categoría -> {estado: n}"""
+        conteo = {}
+        for categoria, estado, cantidad in self.conexion.execute(
+            "SELECT categoria, estado, COUNT(*) FROM tareas GROUP BY categoria, estado"
+        ):
+            conteo.setdefault(categoria, {})[estado] = cantidad
+        return conteo
+
+    def en_marcha(self, categorias=None):
+        """Tareas pendientes o prestadas (aunque el préstamo haya caducado)"""
+        filtro = ""
+        if categorias:
+            filtro = f" AND categoria IN ({', '.join('?' * len(categorias))})"
+        return self.conexion.execute(
+            f"SELECT COUNT(*) FROM tareas WHERE estado IN ('pendiente', 'prestada'){filtro}",
+            list(categorias or [])
+        ).fetchone()[0]
+
+    def total_articulos(self, categoria):
+        fila = self.conexion.execute(
+            "SELECT total_articulos FROM categorias WHERE categoria = ?", (categoria,)
+        ).fetchone()
+        return fila[0] if fila else None
+
+    def fragmento(self, categoria):
+        """
+        Productos de las tareas hechas de una categoría como fragmento ordenado
+        por posición canónica, listo para comun_crawl.fusionar_fragmentos
+
+        Yields:
+            tuple: ((orden de la consulta, página, posición), producto)
+        """
+        for orden, pagina, productos in self.conexion.execute(
+            "SELECT orden, pagina, productos FROM tareas WHERE categoria = ? AND estado = 'hecha' "
+            "ORDER BY orden, pagina",
+            (categoria,)
+        ):
+            for posicion, producto in enumerate(json.loads(productos)):
+                yield (orden, pagina, posicion), producto
+
+    def vaciar(self, categoria):
+        """Borra las tareas de una categoría (tras recoger sus resultados)"""
+        def operacion(cursor):
+            cursor.execute("DELETE FROM tareas WHERE categoria = ?", (categoria,))
+            cursor.execute("DELETE FROM categorias WHERE categoria = ?", (categoria,))
+        self._transaccion(operacion)
+
+    def imprimir_informe(self):
+        print("\n📬 Estado de la cola:")
+        conteo = self.contar()
+        if not conteo:
+            print("   (vacía)")
+        for categoria, estados in sorted(conteo.items()):
+            detalle = ", ".join(f"{estado}: {cantidad}" for estado, cantidad in sorted(estados.items()))
+            print(f"   {categoria}: {detalle}")
+
+    def cerrar(self):
+        self.conexion.close()
+
+# ============================================ #
+#          WORKER DE LA COLA                   #
+# ============================================ #
+
+def nombre_worker(indice=0):
+    """Identificador único del worker (máquina, proceso e índice)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{indice}"
+
+def trabajar(ruta, categorias=None, indice=0, visibilidad=VISIBILIDAD, max_intentos=3,
+             espera_vacia=5.0, ritmo_fijo=False, cargar_pagina=None):
+    """
+    Bucle de un worker: toma tareas de la cola, las recorre con la función de
+    carga de su categoría y sube los productos, hasta que no queda nada
+    pendiente ni prestado. Se ejecuta en su propio proceso, con su navegador.
+
+    Args:
+        cargar_pagina: función (driver, consulta, pagina) -> productos que
+            sustituye a la de cada categoría; con ella no se abre navegador
+            (debe poder pasarse a otro proceso, p. ej. una función de módulo)
+
+    Returns:
+        dict: páginas hechas, fallidas y descartadas por este worker
+    """
+    cola = ColaTareas(ruta, visibilidad, max_intentos)
+    worker = nombre_worker(indice)
+    ritmo = comun_crawl.ControladorRitmo(max_concurrencia=1, adaptativo=not ritmo_fijo)
+    modulos = {}
+    driver = None
+    estadisticas = {'hechas': 0, 'fallidas': 0, 'descartadas': 0}
+
+    try:
+        while True:
+            tarea = cola.tomar(worker, categorias)
+            if tarea is None:
+                if not cola.en_marcha(categorias):
+                    break
+                # Quedan tareas prestadas a otros: esperar por si alguna vuelve a la cola
+                time.sleep(espera_vacia)
+                continue
+
+            cargar = cargar_pagina
+            if cargar is None:
+                modulo = modulos.get(tarea['categoria'])
+                if modulo is None:
+                    modulo = modulos[tarea['categoria']] = comun_categorias.cargar_categoria(tarea['categoria'])
+                    modulo.anotar_articulos(modulo.consultas_ordenacion(), cola.total_articulos(tarea['categoria']))
+                if driver is None:
+                    driver = modulo.mediamark_mob_(modulo.URL_BASE)
+                cargar = modulo.cargar_pagina
+
+            try:
+                productos = comun_crawl._cargar_seguro(
+                    cargar, driver, tarea['consulta'], tarea['pagina'], ritmo=ritmo
+                )
+            except comun_crawl.ErrorNavegadorCaido as e:
+                print(f"💀 [{worker}] Navegador caído: {e}. Se abre uno nuevo")
+                cola.fallar(tarea, e)
+                if driver is not None:
+                    modulo.cerrar_navegadores([driver])
+                    driver = None
+                continue
+            except comun_crawl.CrawlAbortado as e:
+                print(f"🛑 [{worker}] {e}: el worker se detiene")
+                cola.fallar(tarea, e)
+                raise
+
+            if productos is None:
+                estado = cola.fallar(tarea, "la página no cargó")
+                estadisticas['fallidas'] += estado == 'fallida'
+                continue
+
+            if cola.completar(tarea, productos):
+                estadisticas['hechas'] += 1
+                print(f"📖 [{worker}] {tarea['categoria']} · {tarea['consulta']} · página {tarea['pagina']}: "
+                      f"{len(productos)} productos")
+            else:
+                estadisticas['descartadas'] += 1
+                print(f"⌛ [{worker}] Préstamo caducado: se descarta la página {tarea['pagina']} ({tarea['consulta']})")
+    finally:
+        if driver is not None:
+            modulos[next(iter(modulos))].cerrar_navegadores([driver])
+        for modulo in modulos.values():
+            modulo.ADAPTADOR.guardar_planes()
+            modulo.ADAPTADOR.imprimir_informe()
+        cola.cerrar()
+
+    print(f"🏁 [{worker}] {estadisticas['hechas']} páginas hechas, {estadisticas['fallidas']} fallidas, "
+          f"{estadisticas['descartadas']} descartadas")
+    return estadisticas
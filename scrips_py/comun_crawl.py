@@ -0,0 +1,1288 @@
+#!/usr/bin/env python3
+"""
+Utilidades de crawl compartidas por los scripts de scraping de MediaMarkt
+Los scripts de cada categoría aportan sus propias funciones de carga de página
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import hashlib
+import heapq
+import json
+import os
+import random
+import threading
+import time
+import unicodedata
+
+# Referencia para el límite de tiempo global de la ejecución
+INICIO_EJECUCION = time.time()
+
+# Motivos por los que una extracción queda parcial (resumen, CSV e informe)
+MOTIVOS_PARCIAL = {
+    'tiempo': "el límite de tiempo cortó la navegación",
+    'cortacircuitos': "el cortacircuitos abandonó la categoría tras demasiados fallos seguidos",
+    'fallidas': "algunas páginas agotaron sus intentos",
+    'pendientes': "quedaron páginas sin recorrer",
+}
+
+def describir_parcial(resumen):
+    """Texto del motivo por el que el resumen de una extracción es parcial"""
+    return MOTIVOS_PARCIAL.get(resumen.get('motivo_parcial'), MOTIVOS_PARCIAL['pendientes'])
+
+# ============================================ #
+#          PERSISTENCIA LOCAL                  #
+# ============================================ #
+
+def cargar_json(ruta, defecto=None):
+    """Lee un JSON local; devuelve 'defecto' si no existe o está corrupto"""
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return defecto
+    except Exception as e:
+        print(f"⚠️ No se pudo leer {ruta}: {e}")
+        return defecto
+
+def guardar_json(ruta, datos):
+    """Escribe un JSON local de forma atómica (fichero temporal + rename)"""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+# ============================================ #
+#          CONTROL ADAPTATIVO DEL RITMO        #
+# ============================================ #
+
+_senales = threading.local()
+
+def senalar(tipo):
+    """
+    Registra una señal de problema (p. ej. 'timeout', 'consentimiento') para la
+    página que se está cargando en el hilo actual
+    """
+    if not hasattr(_senales, 'lista'):
+        _senales.lista = []
+    _senales.lista.append(tipo)
+
+class ControladorRitmo:
+    """
+    Control AIMD del ritmo de navegación.
+
+    Limita cuántas páginas se cargan a la vez y la pausa antes de cada carga.
+    Mientras las páginas llegan bien sube la concurrencia en uno y baja la pausa
+    un paso cada 'exitos_para_subir' páginas; ante una señal de problema (rejilla
+    vacía, timeout, banner de cookies de nuevo, error o latencia disparada) divide
+    la concurrencia a la mitad y duplica la pausa, como mucho una vez por ronda.
+
+    La concurrencia arranca en 'limite_inicial' (1 por defecto: se sube con las
+    páginas buenas); sin control adaptativo se usa siempre la máxima.
+    """
+
+    def __init__(self, max_concurrencia=1, pausa_inicial=3.0, pausa_min=0.5, pausa_max=30.0,
+                 paso_pausa=0.25, exitos_para_subir=5, adaptativo=True, limite_inicial=1):
+        self.max_concurrencia = max(1, max_concurrencia)
+        self.adaptativo = adaptativo
+        self.limite = min(max(1, limite_inicial), self.max_concurrencia) if adaptativo else self.max_concurrencia
+        self.pausa = pausa_inicial
+        self.pausa_min = pausa_min
+        self.pausa_max = pausa_max
+        self.paso_pausa = paso_pausa
+        self.exitos_para_subir = exitos_para_subir
+        self.condicion = threading.Condition()
+        self.activos = 0
+        self.exitos = 0
+        self.latencia_media = None
+        self.ultima_bajada = 0.0
+        self.estadisticas = {'peticiones': 0, 'problemas': 0, 'subidas': 0, 'bajadas': 0,
+                             'latencia_total': 0.0, 'senales': {}}
+
+    def adquirir(self):
+        """Espera turno según la concurrencia permitida y aplica la pausa actual"""
+        with self.condicion:
+            while self.activos >= self.limite:
+                self.condicion.wait()
+            self.activos += 1
+            pausa = self.pausa
+        time.sleep(pausa)
+
+    def liberar(self, latencia, senales=()):
+        """Devuelve el turno y ajusta el ritmo con la latencia y las señales de la página"""
+        with self.condicion:
+            self.activos -= 1
+            self._ajustar(latencia, list(senales))
+            self.condicion.notify_all()
+
+    def _ajustar(self, latencia, senales):
+        estadisticas = self.estadisticas
+        estadisticas['peticiones'] += 1
+        estadisticas['latencia_total'] += latencia
+
+        if self.latencia_media is not None and latencia > max(3 * self.latencia_media, 20.0):
+            senales.append('latencia')
+        self.latencia_media = latencia if self.latencia_media is None else 0.8 * self.latencia_media + 0.2 * latencia
+
+        if senales:
+            estadisticas['problemas'] += 1
+            for senal in senales:
+                estadisticas['senales'][senal] = estadisticas['senales'].get(senal, 0) + 1
+            ahora = time.time()
+            # Una sola bajada por ronda: las señales simultáneas suelen ser el mismo problema
+            if self.adaptativo and ahora - self.ultima_bajada >= self.pausa + self.latencia_media:
+                self.limite = max(1, self.limite // 2)
+                self.pausa = min(self.pausa_max, self.pausa * 2)
+                self.ultima_bajada = ahora
+                self.exitos = 0
+                estadisticas['bajadas'] += 1
+                print(f"🐢 Ritmo reducido ({', '.join(senales)}): concurrencia {self.limite}, pausa {self.pausa:.2f}s")
+            return
+
+        if not self.adaptativo:
+            return
+        self.exitos += 1
+        if self.exitos >= self.exitos_para_subir:
+            self.exitos = 0
+            self.limite = min(self.max_concurrencia, self.limite + 1)
+            self.pausa = max(self.pausa_min, self.pausa - self.paso_pausa)
+            estadisticas['subidas'] += 1
+
+    def imprimir_informe(self):
+        """Muestra el ritmo final y las señales de problema recibidas"""
+        estadisticas = self.estadisticas
+        peticiones = max(estadisticas['peticiones'], 1)
+        print("\n🚦 Control de ritmo:")
+        print(f"   Concurrencia final: {self.limite}/{self.max_concurrencia}, pausa final: {self.pausa:.2f}s")
+        print(f"   Páginas: {estadisticas['peticiones']}, latencia media: {estadisticas['latencia_total'] / peticiones:.1f}s")
+        print(f"   Subidas: {estadisticas['subidas']}, bajadas: {estadisticas['bajadas']}, páginas con problemas: {estadisticas['problemas']}")
+        for senal, cantidad in sorted(estadisticas['senales'].items()):
+            print(f"   ⚠️  {senal}: {cantidad}")
+
+# ============================================ #
+#          CRAWL BIDIRECCIONAL POR NOMBRE      #
+# ============================================ #
+
+def clave_orden_nombre(nombre):
+    """Normaliza un nombre para compararlo alfabéticamente (sin tildes ni mayúsculas)"""
+    texto = unicodedata.normalize('NFKD', str(nombre))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+# ============================================ #
+#          REINTENTOS POR PÁGINA               #
+# ============================================ #
+
+# Errores tras los que el navegador ya no sirve: reintentar con él no tiene sentido
+ERRORES_FATALES = {'InvalidSessionIdException', 'NoSuchWindowException', 'SessionNotCreatedException'}
+MENSAJES_FATALES = ('invalid session id', 'chrome not reachable', 'no such window', 'session deleted')
+
+class ErrorNavegadorCaido(Exception):
+    """El navegador de un worker ha dejado de responder; la página debe cargarla otro"""
+
+class CrawlAbortado(Exception):
+    """La extracción ha dejado de ser fiable (p. ej. deriva de selectores): no se sigue navegando"""
+
+def es_error_fatal(error):
+    """Clasifica un error de carga: True si es fatal para el navegador, False si es reintentable"""
+    mensaje = str(error).lower()
+    return type(error).__name__ in ERRORES_FATALES or any(texto in mensaje for texto in MENSAJES_FATALES)
+
+class PoliticaReintentos:
+    """
+    Reintentos acotados por página con espera exponencial y jitter completo
+    (espera aleatoria entre 0 y base * 2^intento, con tope)
+    """
+
+    def __init__(self, max_intentos=3, espera_base=2.0, espera_max=30.0):
+        self.max_intentos = max(1, max_intentos)
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.lock = threading.Lock()
+        self.estadisticas = {'a_la_primera': 0, 'recuperadas': 0, 'fallidas': 0, 'fatales': 0, 'reintentos': 0}
+
+    def espera(self, intento):
+        """Segundos de espera antes del reintento número 'intento' (desde 0)"""
+        return random.uniform(0, min(self.espera_max, self.espera_base * 2 ** intento))
+
+    def registrar(self, resultado):
+        with self.lock:
+            self.estadisticas[resultado] += 1
+
+    def imprimir_informe(self):
+        """Muestra los reintentos y el resultado final de las páginas"""
+        estadisticas = self.estadisticas
+        print("\n🔁 Reintentos:")
+        print(f"   Páginas a la primera: {estadisticas['a_la_primera']}, recuperadas tras reintentar: {estadisticas['recuperadas']}")
+        print(f"   Fallidas tras {self.max_intentos} intentos: {estadisticas['fallidas']}, navegadores caídos: {estadisticas['fatales']}")
+        print(f"   Reintentos realizados: {estadisticas['reintentos']}")
+
+def _cargar_una_vez(cargar_pagina, driver, consulta, pagina, ritmo=None):
+    """Un intento de carga respetando el ritmo; devuelve (productos o None, excepción o None)"""
+    if ritmo:
+        ritmo.adquirir()
+    _senales.lista = []
+    inicio = time.time()
+    productos = None
+    error = None
+    try:
+        productos = cargar_pagina(driver, consulta, pagina)
+    except CrawlAbortado:
+        raise
+    except Exception as e:
+        print(f"❌ Error cargando página {pagina} ({consulta}): {e}")
+        senalar('error')
+        error = e
+    finally:
+        if ritmo:
+            ritmo.liberar(time.time() - inicio, _senales.lista)
+    return productos, error
+
+def _cargar_seguro(cargar_pagina, driver, consulta, pagina, ritmo=None, reintentos=None):
+    """
+    Carga una página con reintentos; devuelve None si sigue fallando tras agotarlos
+
+    Raises:
+        ErrorNavegadorCaido: si el error es fatal para el navegador
+        CrawlAbortado: si la página decide que no tiene sentido seguir navegando
+    """
+    intentos = reintentos.max_intentos if reintentos else 1
+    for intento in range(intentos):
+        productos, error = _cargar_una_vez(cargar_pagina, driver, consulta, pagina, ritmo)
+
+        if productos is not None:
+            if reintentos:
+                reintentos.registrar('recuperadas' if intento else 'a_la_primera')
+            return productos
+
+        if error is not None and es_error_fatal(error):
+            if reintentos:
+                reintentos.registrar('fatales')
+            raise ErrorNavegadorCaido(str(error).splitlines()[0] if str(error) else type(error).__name__)
+
+        if intento + 1 < intentos:
+            espera = reintentos.espera(intento)
+            reintentos.registrar('reintentos')
+            print(f"🔁 Reintento {intento + 1}/{intentos - 1} de la página {pagina} ({consulta}) en {espera:.1f}s")
+            time.sleep(espera)
+
+    if reintentos:
+        reintentos.registrar('fallidas')
+    return None
+
+def crawl_bidireccional(driver_asc, driver_desc, cargar_pagina, max_paginas=30, productos_por_pagina=12,
+                        fin=None, ritmo=None, reintentos=None):
+    """
+    Recorre a la vez 'name+asc' y 'name+desc', una página por dirección en cada paso,
+    y se detiene cuando los dos frentes se cruzan alfabéticamente
+
+    Args:
+        driver_asc, driver_desc: navegadores independientes (uno por dirección)
+        cargar_pagina: función (driver, consulta, pagina) -> lista de productos o None
+        fin: instante límite (time.time) a partir del cual no se cargan más páginas
+        ritmo: ControladorRitmo compartido por las dos direcciones
+        reintentos: PoliticaReintentos aplicada a cada página
+
+    Returns:
+        dict: productos de cada dirección (en orden de recorrido), si hubo
+        encuentro (cobertura completa) y páginas recorridas por dirección
+    """
+    frentes = {
+        'asc': {'driver': driver_asc, 'consulta': 'sort=name+asc', 'pagina': 0,
+                'productos': [], 'ids': set(), 'limite': None, 'activo': True},
+        'desc': {'driver': driver_desc, 'consulta': 'sort=name+desc', 'pagina': 0,
+                 'productos': [], 'ids': set(), 'limite': None, 'activo': True},
+    }
+    encuentro = False
+
+    def cargar(frente):
+        try:
+            return _cargar_seguro(cargar_pagina, frente['driver'], frente['consulta'], frente['pagina'] + 1, ritmo, reintentos)
+        except ErrorNavegadorCaido as e:
+            print(f"💀 Navegador caído: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        while not encuentro and any(f['activo'] for f in frentes.values()):
+            if fin and time.time() >= fin:
+                print("⏰ Límite de tiempo alcanzado en el crawl bidireccional")
+                break
+
+            futuros = {
+                direccion: pool.submit(cargar, f)
+                for direccion, f in frentes.items() if f['activo']
+            }
+
+            for direccion, futuro in futuros.items():
+                frente = frentes[direccion]
+                productos = futuro.result()
+                frente['pagina'] += 1
+
+                if productos is None:
+                    print(f"❌ Frente {direccion}: la página {frente['pagina']} no cargó correctamente")
+                    frente['activo'] = False
+                    continue
+
+                frente['productos'].extend(productos)
+                frente['ids'].update(p['id'] for p in productos)
+
+                claves = [clave_orden_nombre(p['nombre']) for p in productos if p.get('nombre')]
+                if claves:
+                    # asc avanza hacia nombres mayores, desc hacia nombres menores
+                    frente['limite'] = max(claves) if direccion == 'asc' else min(claves)
+
+                print(f"↔️  Frente {direccion}: página {frente['pagina']}, {len(productos)} productos")
+
+                if len(productos) < productos_por_pagina:
+                    # Una dirección que llega al final por sí sola ya ha cubierto todo el catálogo
+                    print(f"📝 Frente {direccion}: última página detectada")
+                    encuentro = True
+                elif frente['pagina'] >= max_paginas:
+                    frente['activo'] = False
+
+            asc, desc = frentes['asc'], frentes['desc']
+            if asc['limite'] is not None and desc['limite'] is not None and asc['limite'] >= desc['limite']:
+                print(f"🤝 Frentes cruzados: '{asc['limite']}' >= '{desc['limite']}'")
+                encuentro = True
+            elif asc['ids'] & desc['ids']:
+                print("🤝 Frentes cruzados: productos comunes en ambas direcciones")
+                encuentro = True
+
+    return {
+        'productos_asc': frentes['asc']['productos'],
+        'productos_desc': frentes['desc']['productos'],
+        'encuentro': encuentro,
+        'paginas_asc': frentes['asc']['pagina'],
+        'paginas_desc': frentes['desc']['pagina'],
+    }
+
+# ============================================ #
+#          FUSIÓN DE RESULTADOS                #
+# ============================================ #
+
+def _desempate(producto):
+    """Serialización estable de un producto para desempatar entre fragmentos"""
+    return json.dumps(producto, ensure_ascii=False, sort_keys=True)
+
+def escribir_fragmento(ruta, filas):
+    """
+    Guarda un fragmento de resultados de un worker como JSONL ordenado por
+    posición canónica (orden de la consulta, página, posición en la página)
+
+    Args:
+        filas: iterable de (posición canónica, producto)
+    """
+    filas = sorted(
+        ((list(orden), {campo: valor for campo, valor in producto.items() if campo != 'numero'})
+         for orden, producto in filas),
+        key=lambda fila: (fila[0], _desempate(fila[1]))
+    )
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        for orden, producto in filas:
+            f.write(json.dumps({'orden': orden, 'producto': producto}, ensure_ascii=False) + "\n")
+    os.replace(temporal, ruta)
+    return len(filas)
+
+def leer_fragmento(ruta):
+    """Recorre un fragmento JSONL línea a línea: (posición canónica, producto)"""
+    with open(ruta, encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                fila = json.loads(linea)
+                yield tuple(fila['orden']), fila['producto']
+
+def fusionar_fragmentos(fragmentos):
+    """
+    Fusiona en streaming fragmentos de resultados ya ordenados por posición
+    canónica y deduplica por id
+
+    Regla de conflicto: de cada id se queda la aparición con menor posición
+    canónica y, a igual posición, la de menor serialización JSON; así el
+    resultado no depende de cuántos workers hubo ni de en qué orden acabaron.
+    El número de orden es el rango de primera aparición, el mismo que asigna un
+    recorrido secuencial de la rejilla. En memoria solo se guardan los ids vistos.
+
+    Args:
+        fragmentos: iterables de (posición canónica, producto), cada uno ordenado
+
+    Yields:
+        dict: producto con su 'numero'
+    """
+    flujos = [
+        ((tuple(orden), _desempate(producto), producto) for orden, producto in fragmento)
+        for fragmento in fragmentos
+    ]
+    vistos = set()
+    for _, _, producto in heapq.merge(*flujos, key=lambda fila: fila[:2]):
+        if producto['id'] in vistos:
+            continue
+        vistos.add(producto['id'])
+        yield dict(producto, numero=len(vistos))
+
+# ============================================ #
+#          CACHÉ DE HUELLAS DE PÁGINA          #
+# ============================================ #
+
+class CacheHuellas:
+    """
+    Recuerda las rejillas ya extraídas para no volver a parsear sus tarjetas
+
+    La huella de una página es la lista ordenada de ids de sus productos, leída
+    en una sola llamada al navegador. Si la huella ya se vio, o si todos sus ids
+    ya se extrajeron en otra página, se devuelven los productos guardados en el
+    orden de la página; así el ejecutor sigue aplicando la regla de corte por
+    página corta y el orden canónico igual que con una extracción completa.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.huellas = set()
+        self.productos = {}
+        self.omitidas = 0
+        self.extraidas = 0
+
+    @staticmethod
+    def huella(ids):
+        return hashlib.md5("|".join(ids).encode('utf-8')).hexdigest()
+
+    def buscar(self, ids):
+        """Productos de la página en su orden si ya se conocen todos, o None si hay que extraerla"""
+        if not ids:
+            return None
+        with self.lock:
+            conocida = self.huella(ids) in self.huellas or all(i in self.productos for i in ids)
+            if not conocida:
+                return None
+            self.omitidas += 1
+            return [dict(self.productos[i]) for i in ids]
+
+    def guardar(self, ids, productos):
+        """Guarda una página extraída; la huella solo cuenta si se extrajeron todas sus tarjetas"""
+        with self.lock:
+            self.extraidas += 1
+            for producto in productos:
+                self.productos.setdefault(producto['id'], dict(producto))
+            if ids and [p['id'] for p in productos] == list(ids):
+                self.huellas.add(self.huella(ids))
+
+    def imprimir_informe(self, etiqueta=""):
+        total = self.omitidas + self.extraidas
+        if total:
+            prefijo = f"{etiqueta}: " if etiqueta else ""
+            print(f"♻️  {prefijo}Páginas ya vistas sin re-extraer: {self.omitidas}/{total} "
+                  f"({self.omitidas / total * 100:.0f}%)")
+
+# ============================================ #
+#          PARTICIÓN POR RANGOS DE PRECIO      #
+# ============================================ #
+
+# Marca de un rango que aún no se ha contado (None es un recuento que no se pudo leer)
+_SIN_CONTAR = object()
+
+def planificar_rangos_precio(contar, precio_min, precio_max, limite, hojas_previas=None, ancho_minimo=1.0,
+                             max_profundidad=12, max_recuentos=60):
+    """
+    Divide [precio_min, precio_max] por bisección hasta que cada rango quepa en el
+    límite de paginación de una sola ordenación
+
+    Un rango deja de dividirse al llegar a 'max_profundidad' divisiones, cuando ya
+    se hicieron 'max_recuentos' recuentos o si sus dos mitades no cuentan menos
+    artículos que él (el sitio ignora el filtro de precio); esas hojas desbordan
+    el límite y se recorren desde ambos extremos.
+
+    Args:
+        contar: función (minimo, maximo) -> artículos del rango (None si no se puede leer)
+        limite: artículos máximos recorribles en un listado (páginas x productos por página)
+        hojas_previas: hojas del plan anterior [(min, max, cantidad)]; se reutilizan
+            y solo se vuelven a dividir las que ahora desbordan el límite
+
+    Returns:
+        tuple: (hojas ordenadas [(min, max, cantidad)], recuentos realizados)
+    """
+    cantidades_previas = {}
+    if hojas_previas:
+        pendientes = [(minimo, maximo, 0, _SIN_CONTAR) for minimo, maximo, _ in hojas_previas]
+        cantidades_previas = {(minimo, maximo): cantidad for minimo, maximo, cantidad in hojas_previas}
+        techo = max(maximo for _, maximo, _ in hojas_previas)
+        if precio_max > techo:
+            pendientes.append((techo, precio_max, 0, _SIN_CONTAR))
+    else:
+        pendientes = [(precio_min, precio_max, 0, _SIN_CONTAR)]
+
+    hojas = []
+    recuentos = 0
+    while pendientes:
+        minimo, maximo, profundidad, cantidad = pendientes.pop()
+        if cantidad is _SIN_CONTAR:
+            if recuentos >= max_recuentos:
+                # Sin presupuesto: la hoja conserva el recuento del plan anterior (si lo hay)
+                hojas.append((minimo, maximo, cantidades_previas.get((minimo, maximo))))
+                continue
+            cantidad = contar(minimo, maximo)
+            recuentos += 1
+
+        if cantidad is None or cantidad <= limite or (maximo - minimo) <= ancho_minimo:
+            hojas.append((minimo, maximo, cantidad))
+            continue
+
+        if profundidad >= max_profundidad or recuentos + 2 > max_recuentos:
+            print(f"⚠️ Rango {minimo}-{maximo}€ con {cantidad} artículos: se alcanzó el límite de "
+                  f"{'profundidad' if profundidad >= max_profundidad else 'recuentos'}, no se divide más")
+            hojas.append((minimo, maximo, cantidad))
+            continue
+
+        # Los dos mitades comparten el punto de corte: los duplicados se fusionan por id
+        medio = round((minimo + maximo) / 2, 2)
+        inferior = contar(minimo, medio)
+        superior = contar(medio, maximo)
+        recuentos += 2
+
+        if inferior is not None and superior is not None and min(inferior, superior) >= cantidad:
+            print(f"⚠️ Rango {minimo}-{maximo}€ con {cantidad} artículos: sus mitades cuentan {inferior} y "
+                  f"{superior}, el filtro de precio no reduce el listado y no se divide más")
+            hojas.append((minimo, maximo, cantidad))
+            continue
+
+        print(f"✂️  Rango {minimo}-{maximo}€ con {cantidad} artículos: se divide en {medio}€")
+        pendientes.append((medio, maximo, profundidad + 1, superior))
+        pendientes.append((minimo, medio, profundidad + 1, inferior))
+
+    hojas.sort()
+    return hojas, recuentos
+
+def cargar_plan_rangos(ruta):
+    """Carga las hojas del plan de rangos de precio guardado en la ejecución anterior"""
+    plan = cargar_json(ruta)
+    if not plan or not plan.get('hojas'):
+        return None
+    print(f"📂 Plan de rangos del {plan.get('fecha')}: {len(plan['hojas'])} hojas")
+    return [tuple(hoja) for hoja in plan['hojas']]
+
+def guardar_plan_rangos(ruta, hojas):
+    """Guarda las hojas del plan de rangos para reutilizarlas en la siguiente ejecución"""
+    guardar_json(ruta, {
+        'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'hojas': [list(hoja) for hoja in hojas],
+    })
+
+# ============================================ #
+#          CRAWL INCREMENTAL                   #
+# ============================================ #
+
+# Campos que deciden si una página es igual a la del día anterior
+CAMPOS_FIRMA = ('id', 'precio_actual_temp', 'precio_original_temp')
+
+# Variación relativa del total de artículos que obliga a un recorrido completo
+UMBRAL_CAMBIO_TOTAL = 0.05
+
+def clave_pagina(consulta, pagina):
+    """Clave de una página en la instantánea diaria"""
+    return f"{consulta}|{pagina}"
+
+def firma_pagina(productos):
+    """Ids y precios de una página, en su orden"""
+    return [[producto.get(campo) for campo in CAMPOS_FIRMA] for producto in productos]
+
+def decidir_incremental(instantanea, total_articulos, dias_completo=7):
+    """
+    Decide si la ejecución puede ser incremental a partir de la instantánea anterior
+
+    Returns:
+        tuple: (True si es incremental, motivo si no lo es)
+    """
+    if not instantanea or not instantanea.get('paginas'):
+        return False, "no hay instantánea de una ejecución anterior"
+
+    try:
+        ultima_completa = datetime.strptime(instantanea['ultima_completa'], "%Y-%m-%d")
+    except (KeyError, TypeError, ValueError):
+        return False, "la instantánea no indica el último recorrido completo"
+    if (datetime.now() - ultima_completa).days >= dias_completo:
+        return False, f"el último recorrido completo fue el {instantanea['ultima_completa']}"
+
+    total_anterior = instantanea.get('total_articulos')
+    if total_articulos and total_anterior:
+        cambio = abs(total_articulos - total_anterior) / total_anterior
+        if cambio > UMBRAL_CAMBIO_TOTAL:
+            return False, f"el total de artículos ha cambiado de {total_anterior} a {total_articulos}"
+
+    return True, None
+
+def paginas_previas(opciones, ruta, total_articulos):
+    """
+    Páginas de la ejecución anterior si se pidió --incremental y procede, o None
+    para hacer un recorrido completo
+    """
+    if not getattr(opciones, 'incremental', False):
+        return None
+
+    instantanea = cargar_json(ruta)
+    incremental, motivo = decidir_incremental(instantanea, total_articulos, opciones.completo_cada_dias)
+    if not incremental:
+        print(f"🔄 Recorrido completo: {motivo}")
+        return None
+
+    print(f"📅 Recorrido incremental sobre la instantánea del {instantanea['fecha']} "
+          f"({len(instantanea['paginas'])} páginas)")
+    return instantanea['paginas']
+
+def actualizar_estadisticas_paginas(estadisticas, paginas, paginas_anteriores, sembradas=()):
+    """
+    Acumula por página cuántas veces se ha recorrido y en cuántas había cambiado
+    respecto a la ejecución anterior (las páginas sembradas no cuentan)
+    """
+    for clave, productos in paginas.items():
+        anterior = paginas_anteriores.get(clave)
+        if clave in sembradas or anterior is None:
+            continue
+        visitas, cambios = estadisticas.get(clave, (0, 0))
+        estadisticas[clave] = (visitas + 1, cambios + (firma_pagina(productos) != firma_pagina(anterior)))
+    return estadisticas
+
+def guardar_instantanea(ruta, paginas, total_articulos, sembradas=(), completa=True):
+    """
+    Guarda las páginas de la ejecución para sembrar la siguiente, junto con las
+    estadísticas de cambio de cada página
+
+    Args:
+        paginas: dict clave_pagina -> productos de la página
+        sembradas: claves de las páginas copiadas de la ejecución anterior (si no
+            hay ninguna, el recorrido fue completo)
+        completa: False si se recorrió a propósito solo parte de la rejilla (plan
+            diario recortado); la fecha del último recorrido completo no cambia y
+            las páginas no visitadas conservan las de la instantánea anterior
+    """
+    hoy = datetime.now().strftime("%Y-%m-%d")
+    anterior = cargar_json(ruta) or {}
+    estadisticas = actualizar_estadisticas_paginas(
+        {clave: tuple(valor) for clave, valor in anterior.get('estadisticas', {}).items()},
+        paginas, anterior.get('paginas', {}), set(sembradas)
+    )
+    if not completa:
+        paginas = {**anterior.get('paginas', {}), **paginas}
+    instantanea = {
+        'fecha': hoy,
+        'ultima_completa': hoy if completa and not sembradas else anterior.get('ultima_completa'),
+        'total_articulos': total_articulos,
+        'paginas': paginas,
+        'estadisticas': {clave: list(valor) for clave, valor in estadisticas.items()},
+    }
+    try:
+        guardar_json(ruta, instantanea)
+        print(f"📅 Instantánea de páginas guardada: {ruta}")
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar la instantánea de páginas: {e}")
+
+# ============================================ #
+#          EJECUTOR CON ROBO DE TRABAJO        #
+# ============================================ #
+
+class EjecutorCrawl:
+    """
+    Reparte tareas (categoría, consulta, página) entre varios navegadores.
+
+    Cada navegador tiene una categoría 'casa' y toma sus tareas en orden; cuando
+    se queda sin trabajo roba la siguiente tarea de la categoría con más tareas
+    pendientes. Una página corta o que no carga corta el resto de su consulta
+    (la que no carga, solo en esta ejecución: no cuenta como hecha en el checkpoint).
+    Los productos se deduplican por id en un mapa protegido por un lock y se
+    devuelven en orden canónico (consulta, página, posición), independiente del
+    reparto entre navegadores.
+
+    Con 'checkpoint' el estado (tareas completadas, cortes y productos) se guarda
+    en disco después de cada página y reanudar() permite continuar una ejecución
+    interrumpida sin repetir el trabajo hecho.
+
+    Las tareas de cada categoría se toman por rendimiento esperado: primero las
+    consultas que más productos nuevos están aportando y, a igualdad, las páginas
+    más bajas. Con 'fin' (instante límite) se deja de navegar al agotarse el
+    tiempo y las categorías con trabajo pendiente quedan marcadas como parciales.
+
+    Cada página se reintenta según 'reintentos'. Un interruptor por categoría se
+    abre tras 'umbral_fallos' páginas fallidas seguidas y la pausa durante
+    'enfriamiento' segundos (el doble en cada apertura); tras 'max_aperturas'
+    la categoría se abandona. Si un navegador cae, su página vuelve a la cola.
+
+    Una categoría con 'previas' (páginas de la ejecución anterior) se recorre en
+    modo incremental: la prioridad inicial de cada consulta es su rendimiento de
+    ayer y, tras 'paginas_iguales' páginas seguidas con los mismos ids y precios,
+    se deja de paginar y las páginas restantes se siembran desde la instantánea.
+    """
+
+    def __init__(self, drivers, productos_por_pagina=12, ritmo=None, checkpoint=None, fin=None,
+                 reintentos=None, umbral_fallos=3, enfriamiento=60.0, max_aperturas=3, paginas_iguales=3):
+        self.drivers = list(drivers)
+        self.paginas_iguales = paginas_iguales
+        self.paginas = {}
+        self.iguales = set()
+        self.cortes_incrementales = {}
+        self.sembradas = {}
+        self.casas = None
+        self.makespan_estimado = None
+        self.duraciones = {}
+        self.productos_por_pagina = productos_por_pagina
+        self.ritmo = ritmo or ControladorRitmo(max_concurrencia=len(self.drivers))
+        self.reintentos = reintentos or PoliticaReintentos()
+        self.umbral_fallos = umbral_fallos
+        self.enfriamiento = enfriamiento
+        self.max_aperturas = max_aperturas
+        self.interruptores = {}
+        self.abandonadas = set()
+        self.checkpoint = checkpoint
+        self.fin = fin
+        self.agotado = False
+        self.abortado = None
+        self.categorias_parciales = set()
+        self.rendimiento = {}
+        self.lock = threading.Lock()
+        self.lock_checkpoint = threading.Lock()
+        self.categorias = {}
+        self.pendientes = {}
+        self.cortes = {}
+        # Cortes por páginas que no cargaron: solo valen para esta ejecución (no van al checkpoint)
+        self.cortes_fallidos = {}
+        self.completadas = set()
+        self.productos = {}
+        self.workers = []
+
+    def agregar_categoria(self, categoria, cargar_pagina, consultas, max_paginas, previas=None):
+        """
+        Encola la rejilla consulta x página de una categoría
+
+        Args:
+            max_paginas: páginas de cada consulta (int) o dict consulta -> páginas
+            previas: dict clave_pagina -> productos de la ejecución anterior (modo incremental)
+        """
+        self.categorias[categoria] = {
+            'cargar_pagina': cargar_pagina, 'tareas': 0, 'previas': previas,
+            'consultas': {consulta: orden for orden, consulta in enumerate(consultas)},
+            'max_paginas': max_paginas,
+        }
+        self.interruptores[categoria] = {'fallos': 0, 'abierto_hasta': 0.0, 'aperturas': 0,
+                                         'enfriamiento': self.enfriamiento}
+        cola = self.pendientes.setdefault(categoria, [])
+        for orden_consulta, consulta in enumerate(consultas):
+            paginas = max_paginas.get(consulta, 1) if isinstance(max_paginas, dict) else max_paginas
+            for pagina in range(1, paginas + 1):
+                cola.append({
+                    'categoria': categoria,
+                    'consulta': consulta,
+                    'pagina': pagina,
+                    'orden': (orden_consulta, pagina),
+                })
+        self.categorias[categoria]['tareas'] = len(cola)
+        if previas:
+            self._sembrar_prioridad(categoria)
+
+    def _sembrar_prioridad(self, categoria):
+        """Inicia el rendimiento de cada consulta con los productos nuevos que aportó ayer"""
+        info = self.categorias[categoria]
+        vistos_ayer = set()
+        paginas_ayer = []
+        for clave, productos in info['previas'].items():
+            consulta, pagina = clave.rsplit("|", 1)
+            if consulta in info['consultas']:
+                paginas_ayer.append(((info['consultas'][consulta], int(pagina)), consulta, productos))
+        for _, consulta, productos in sorted(paginas_ayer, key=lambda item: item[0]):
+            nuevos, vistos = self.rendimiento.get((categoria, consulta), (0, 0))
+            for producto in productos:
+                nuevos += producto['id'] not in vistos_ayer
+                vistos += 1
+                vistos_ayer.add(producto['id'])
+            self.rendimiento[(categoria, consulta)] = (nuevos, vistos)
+
+    def _paginas_consulta(self, categoria, consulta):
+        max_paginas = self.categorias[categoria]['max_paginas']
+        return max_paginas.get(consulta, 1) if isinstance(max_paginas, dict) else max_paginas
+
+    def reanudar(self):
+        """
+        Carga el checkpoint de una ejecución interrumpida
+
+        Returns:
+            bool: True si había un checkpoint que reanudar
+        """
+        estado = cargar_json(self.checkpoint) if self.checkpoint else None
+        if not estado:
+            print("ℹ️  No hay checkpoint previo: se empieza desde cero")
+            return False
+
+        self.completadas = {tuple(tarea) for tarea in estado.get('completadas', [])}
+        self.cortes = {(categoria, consulta): corte for categoria, consulta, corte in estado.get('cortes', [])}
+        self.cortes_incrementales = {
+            (categoria, consulta): corte for categoria, consulta, corte in estado.get('cortes_incrementales', [])
+        }
+        self.paginas = {tuple(tarea): ids for *tarea, ids in estado.get('paginas', [])}
+        for categoria, producto_id, orden, producto in estado.get('productos', []):
+            self.productos[(categoria, producto_id)] = (tuple(orden), producto)
+
+        print(f"♻️  Reanudando checkpoint del {estado.get('fecha')}: "
+              f"{len(self.completadas)} páginas completadas, {len(self.productos)} productos")
+        return True
+
+    def _guardar_checkpoint(self):
+        if not self.checkpoint:
+            return
+        # El lock del checkpoint serializa las escrituras: nunca se pisa un estado más nuevo
+        with self.lock_checkpoint:
+            with self.lock:
+                estado = {
+                    'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'completadas': [list(tarea) for tarea in self.completadas],
+                    'cortes': [[categoria, consulta, corte] for (categoria, consulta), corte in self.cortes.items()],
+                    'cortes_incrementales': [[categoria, consulta, corte] for (categoria, consulta), corte
+                                             in self.cortes_incrementales.items()],
+                    'paginas': [list(tarea) + [ids] for tarea, ids in self.paginas.items()],
+                    'productos': [[categoria, producto_id, list(orden), producto]
+                                  for (categoria, producto_id), (orden, producto) in self.productos.items()],
+                }
+            try:
+                guardar_json(self.checkpoint, estado)
+            except Exception as e:
+                print(f"⚠️ No se pudo guardar el checkpoint: {e}")
+
+    def _cortada(self, tarea):
+        if (tarea['categoria'], tarea['consulta'], tarea['pagina']) in self.completadas:
+            return True
+        clave = (tarea['categoria'], tarea['consulta'])
+        cortes = [corte for corte in (self.cortes.get(clave), self.cortes_fallidos.get(clave)) if corte is not None]
+        return bool(cortes) and tarea['pagina'] > min(cortes)
+
+    def _tasa_nuevos(self, tarea):
+        """Fracción de productos nuevos que está aportando la consulta de la tarea"""
+        nuevos, vistos = self.rendimiento.get((tarea['categoria'], tarea['consulta']), (0, 0))
+        return (nuevos + 1) / (vistos + 1)
+
+    def _tomar(self, categoria, consultas=None):
+        if time.time() < self.interruptores[categoria]['abierto_hasta']:
+            return None
+        cola = self.pendientes.get(categoria, [])
+        cola[:] = [tarea for tarea in cola if not self._cortada(tarea)]
+        candidatas = [tarea for tarea in cola if consultas is None or tarea['consulta'] in consultas]
+        if not candidatas:
+            return None
+        mejor = max(candidatas, key=lambda t: (self._tasa_nuevos(t), -t['pagina'], -t['orden'][0]))
+        cola.remove(mejor)
+        return mejor
+
+    def planificar_lpt(self, segundos_por_pagina, objetivo=None, segundos_defecto=5.0):
+        """
+        Asigna las casas de los workers con la heurística LPT (trabajo más largo
+        primero, al worker menos cargado) en vez de por turno
+
+        Una categoría cuya duración estimada supera el objetivo de makespan se
+        parte en grupos de consultas que quepan en él (first fit decreasing).
+
+        Args:
+            segundos_por_pagina: dict categoría -> segundos por página de ejecuciones anteriores
+            objetivo: makespan objetivo en segundos (por defecto, el reparto perfecto)
+        """
+        conocidas = [v for v in segundos_por_pagina.values() if v]
+        segundos_defecto = sum(conocidas) / len(conocidas) if conocidas else segundos_defecto
+        trabajos = []
+        for categoria, cola in self.pendientes.items():
+            por_consulta = Counter(tarea['consulta'] for tarea in cola if not self._cortada(tarea))
+            segundos = segundos_por_pagina.get(categoria) or segundos_defecto
+            trabajos.append((categoria, por_consulta, segundos))
+
+        total = sum(sum(por_consulta.values()) * segundos for _, por_consulta, segundos in trabajos)
+        objetivo = objetivo or total / max(1, len(self.drivers))
+
+        piezas = []
+        for categoria, por_consulta, segundos in trabajos:
+            duracion = sum(por_consulta.values()) * segundos
+            if duracion <= objetivo or len(por_consulta) < 2:
+                piezas.append((duracion, categoria, None))
+                continue
+            grupos = []
+            for consulta, paginas in por_consulta.most_common():
+                grupo = next((g for g in grupos if g[0] + paginas * segundos <= objetivo), None)
+                if grupo is None:
+                    grupos.append([paginas * segundos, {consulta}])
+                else:
+                    grupo[0] += paginas * segundos
+                    grupo[1].add(consulta)
+            print(f"✂️  {categoria}: ~{duracion / 60:.1f} min superan el objetivo, se parte en {len(grupos)} subtareas")
+            piezas += [(duracion_grupo, categoria, frozenset(consultas)) for duracion_grupo, consultas in grupos]
+
+        cargas = [(0.0, i) for i in range(len(self.drivers))]
+        self.casas = [[] for _ in self.drivers]
+        for duracion, categoria, consultas in sorted(piezas, key=lambda pieza: -pieza[0]):
+            carga, i = heapq.heappop(cargas)
+            self.casas[i].append((categoria, consultas))
+            heapq.heappush(cargas, (carga + duracion, i))
+        self.makespan_estimado = max(carga for carga, _ in cargas) if cargas else 0.0
+        print(f"📐 Reparto LPT: makespan estimado {self.makespan_estimado / 60:.1f} min "
+              f"(objetivo {objetivo / 60:.1f} min)")
+
+    def motivo_parcial(self, categoria):
+        """Motivo (clave de MOTIVOS_PARCIAL) por el que la categoría quedó parcial, o None"""
+        if categoria not in self.categorias_parciales:
+            return None
+        if categoria in self.abandonadas:
+            return 'cortacircuitos'
+        return 'tiempo' if self.agotado else 'pendientes'
+
+    def _siguiente_tarea(self, worker):
+        while True:
+            with self.lock:
+                if self.abortado:
+                    return None
+
+                if self.fin and time.time() >= self.fin:
+                    if not self.agotado and any(self.pendientes.values()):
+                        print("⏰ Límite de tiempo alcanzado: se deja de navegar")
+                    self.agotado = True
+                    return None
+
+                for categoria, consultas in worker['casas']:
+                    tarea = self._tomar(categoria, consultas)
+                    if tarea:
+                        return tarea
+
+                # Robar a la categoría con más trabajo pendiente
+                for categoria in sorted(self.pendientes, key=lambda c: len(self.pendientes[c]), reverse=True):
+                    tarea = self._tomar(categoria)
+                    if tarea:
+                        worker['robos'] += 1
+                        return tarea
+
+                # Solo queda trabajo en categorías con el interruptor abierto: esperar a que se cierre
+                reaperturas = [self.interruptores[c]['abierto_hasta'] for c, cola in self.pendientes.items() if cola]
+            if not reaperturas:
+                return None
+            time.sleep(min(5.0, max(0.1, min(reaperturas) - time.time())))
+
+    def _actualizar_interruptor(self, categoria, fallida):
+        """Cuenta fallos seguidos de la categoría y abre su interruptor al llegar al umbral"""
+        interruptor = self.interruptores[categoria]
+        if not fallida:
+            interruptor['fallos'] = 0
+            return
+
+        interruptor['fallos'] += 1
+        if interruptor['fallos'] < self.umbral_fallos:
+            return
+
+        interruptor['aperturas'] += 1
+        if interruptor['aperturas'] > self.max_aperturas:
+            print(f"🛑 {categoria}: demasiados fallos seguidos, se abandona la categoría")
+            self.abandonadas.add(categoria)
+            self.pendientes[categoria] = []
+            return
+
+        print(f"🔌 {categoria}: {interruptor['fallos']} páginas fallidas seguidas, "
+              f"pausa de {interruptor['enfriamiento']:.0f}s")
+        interruptor['abierto_hasta'] = time.time() + interruptor['enfriamiento']
+        interruptor['enfriamiento'] *= 2
+        # Semiabierto: al reabrir, un solo fallo más vuelve a abrirlo
+        interruptor['fallos'] = self.umbral_fallos - 1
+
+    def _registrar(self, tarea, productos):
+        clave = (tarea['categoria'], tarea['consulta'])
+        with self.lock:
+            self._actualizar_interruptor(tarea['categoria'], productos is None)
+            if productos is None:
+                # La consulta se deja de paginar en esta ejecución, pero con --resume se vuelve a intentar
+                corte = tarea['pagina'] - 1
+                self.cortes_fallidos[clave] = min(self.cortes_fallidos.get(clave, corte), corte)
+            else:
+                self.completadas.add((tarea['categoria'], tarea['consulta'], tarea['pagina']))
+                if len(productos) < self.productos_por_pagina:
+                    self.cortes[clave] = min(self.cortes.get(clave, tarea['pagina']), tarea['pagina'])
+
+            if productos is not None:
+                self.paginas[(tarea['categoria'], tarea['consulta'], tarea['pagina'])] = [p['id'] for p in productos]
+                self._comparar_con_previa(tarea, productos)
+
+            nuevos, vistos = self.rendimiento.get(clave, (0, 0))
+            for posicion, producto in enumerate(productos or []):
+                orden = tarea['orden'] + (posicion,)
+                existente = self.productos.get((tarea['categoria'], producto['id']))
+                nuevos += existente is None
+                vistos += 1
+                if existente is None or orden < existente[0]:
+                    self.productos[(tarea['categoria'], producto['id'])] = (orden, producto)
+            self.rendimiento[clave] = (nuevos, vistos)
+
+    def _comparar_con_previa(self, tarea, productos):
+        """Corta la consulta tras 'paginas_iguales' páginas seguidas idénticas a las de ayer"""
+        previas = self.categorias[tarea['categoria']]['previas']
+        if not previas:
+            return
+        previa = previas.get(clave_pagina(tarea['consulta'], tarea['pagina']))
+        if previa is None or firma_pagina(previa) != firma_pagina(productos):
+            return
+
+        categoria, consulta = tarea['categoria'], tarea['consulta']
+        self.iguales.add((categoria, consulta, tarea['pagina']))
+        seguidas = 0
+        for pagina in range(1, self._paginas_consulta(categoria, consulta) + 1):
+            seguidas = seguidas + 1 if (categoria, consulta, pagina) in self.iguales else 0
+            if seguidas >= self.paginas_iguales:
+                if pagina < self.cortes.get((categoria, consulta), pagina + 1):
+                    print(f"📅 {categoria} · {consulta}: {seguidas} páginas iguales a ayer, "
+                          f"se siembra desde la página {pagina + 1}")
+                    self.cortes[(categoria, consulta)] = pagina
+                    self.cortes_incrementales[(categoria, consulta)] = pagina
+                return
+
+    def _sembrar_previas(self):
+        """Completa las consultas cortadas por coincidencia con las páginas de ayer"""
+        for (categoria, consulta), corte in self.cortes_incrementales.items():
+            previas = self.categorias[categoria]['previas'] or {}
+            orden_consulta = self.categorias[categoria]['consultas'][consulta]
+            for pagina in range(corte + 1, self._paginas_consulta(categoria, consulta) + 1):
+                previa = previas.get(clave_pagina(consulta, pagina))
+                if previa is None:
+                    break
+                if (categoria, consulta, pagina) in self.completadas:
+                    continue
+                for posicion, producto in enumerate(previa):
+                    orden = (orden_consulta, pagina, posicion)
+                    existente = self.productos.get((categoria, producto['id']))
+                    if existente is None or orden < existente[0]:
+                        self.productos[(categoria, producto['id'])] = (orden, dict(producto))
+                self.paginas[(categoria, consulta, pagina)] = [producto['id'] for producto in previa]
+                self.sembradas.setdefault(categoria, set()).add(clave_pagina(consulta, pagina))
+                if len(previa) < self.productos_por_pagina:
+                    break
+
+    def paginas_categoria(self, categoria):
+        """Productos de cada página recorrida o sembrada de la categoría (para la instantánea)"""
+        paginas = {}
+        for (cat, consulta, pagina), ids in self.paginas.items():
+            if cat != categoria:
+                continue
+            paginas[clave_pagina(consulta, pagina)] = [
+                {campo: valor for campo, valor in self.productos[(categoria, i)][1].items() if campo != 'numero'}
+                for i in ids if (categoria, i) in self.productos
+            ]
+        return paginas
+
+    def _trabajar(self, worker):
+        while True:
+            tarea = self._siguiente_tarea(worker)
+            if tarea is None:
+                return
+
+            cargar_pagina = self.categorias[tarea['categoria']]['cargar_pagina']
+            inicio = time.time()
+            try:
+                productos = _cargar_seguro(cargar_pagina, worker['driver'], tarea['consulta'], tarea['pagina'],
+                                           self.ritmo, self.reintentos)
+            except ErrorNavegadorCaido as e:
+                print(f"💀 [{worker['nombre']}] navegador caído ({e}): la página vuelve a la cola")
+                with self.lock:
+                    self.pendientes[tarea['categoria']].append(tarea)
+                worker['caido'] = True
+                return
+            except CrawlAbortado as e:
+                with self.lock:
+                    self.pendientes[tarea['categoria']].append(tarea)
+                    self.abortado = self.abortado or str(e)
+                print(f"🛑 [{worker['nombre']}] {e}: se deja de repartir páginas")
+                return
+            self._registrar(tarea, productos)
+            self._guardar_checkpoint()
+
+            estado = "no cargó" if productos is None else f"{len(productos)} productos"
+            print(f"📖 [{worker['nombre']}] {tarea['categoria']} · {tarea['consulta']} · página {tarea['pagina']}: {estado}")
+
+            duracion = time.time() - inicio
+            worker['ocupado'] += duracion
+            worker['tareas'] += 1
+            with self.lock:
+                segundos, paginas = self.duraciones.get(tarea['categoria'], (0.0, 0))
+                self.duraciones[tarea['categoria']] = (segundos + duracion, paginas + 1)
+
+    def ejecutar(self):
+        """
+        Ejecuta todas las tareas encoladas
+
+        Returns:
+            dict: categoría -> productos únicos en orden canónico
+
+        Raises:
+            CrawlAbortado: si algún worker abortó el crawl (el checkpoint se conserva)
+        """
+        categorias = list(self.categorias) or [None]
+        casas = self.casas or [[(categorias[i % len(categorias)], None)] for i in range(len(self.drivers))]
+        self.workers = [
+            {'nombre': f"w{i + 1}", 'driver': driver, 'casas': casas[i],
+             'tareas': 0, 'robos': 0, 'ocupado': 0.0, 'caido': False}
+            for i, driver in enumerate(self.drivers)
+        ]
+
+        inicio = time.time()
+        with ThreadPoolExecutor(max_workers=max(1, len(self.workers))) as pool:
+            list(pool.map(self._trabajar, self.workers))
+        self.duracion = time.time() - inicio
+        if self.abortado:
+            raise CrawlAbortado(self.abortado)
+
+        with self.lock:
+            self._sembrar_previas()
+            self.categorias_parciales = {
+                categoria for categoria, cola in self.pendientes.items()
+                if any(not self._cortada(tarea) for tarea in cola)
+            } | self.abandonadas
+        if self.categorias_parciales:
+            print(f"⚠️  Categorías con páginas sin recorrer: {', '.join(sorted(self.categorias_parciales))}")
+
+        resultados = {categoria: [] for categoria in self.categorias}
+        for (categoria, _), (orden, producto) in sorted(self.productos.items(), key=lambda item: (item[0][0], item[1][0])):
+            resultados[categoria].append(producto)
+        return resultados
+
+    def imprimir_informe(self):
+        """Muestra la utilización de cada navegador"""
+        print("\n⚙️  Utilización de los workers:")
+        duracion = max(getattr(self, 'duracion', 0.0), 1e-9)
+        for worker in self.workers:
+            utilizacion = worker['ocupado'] / duracion * 100
+            caido = " 💀 navegador caído" if worker['caido'] else ""
+            casas = ", ".join(
+                str(categoria) if consultas is None else f"{categoria}[{len(consultas)} consultas]"
+                for categoria, consultas in worker['casas']
+            )
+            print(f"   {worker['nombre']} (casa: {casas}): {worker['tareas']} páginas, "
+                  f"{worker['robos']} robadas, {utilizacion:.0f}% ocupado{caido}")
+        print(f"   ⏱️  Duración total: {duracion:.1f}s")
+        if self.makespan_estimado:
+            print(f"   📐 Makespan estimado por LPT: {self.makespan_estimado:.1f}s")
+        self.ritmo.imprimir_informe()
+        self.reintentos.imprimir_informe()
+        for categoria, interruptor in self.interruptores.items():
+            if interruptor['aperturas']:
+                estado = "abandonada" if categoria in self.abandonadas else "recuperada"
+                print(f"   🔌 {categoria}: interruptor abierto {interruptor['aperturas']} veces ({estado})")
+        for categoria, sembradas in self.sembradas.items():
+            print(f"   📅 {categoria}: {len(sembradas)} páginas sembradas desde la ejecución anterior")
+
+def segundos_por_pagina(ruta):
+    """Segundos por página de cada categoría según las ejecuciones anteriores"""
+    return {categoria: datos['segundos_por_pagina'] for categoria, datos in cargar_json(ruta, {}).items()}
+
+def guardar_duraciones(ruta, duraciones, peso_nuevo=0.5):
+    """
+    Actualiza las estadísticas de duración por categoría (media móvil
+    exponencial de los segundos por página)
+    """
+    estadisticas = cargar_json(ruta, {})
+    for categoria, (segundos, paginas) in duraciones.items():
+        if not paginas:
+            continue
+        medida = segundos / paginas
+        anterior = estadisticas.get(categoria, {}).get('segundos_por_pagina')
+        estadisticas[categoria] = {
+            'segundos_por_pagina': round(medida if anterior is None else
+                                         (1 - peso_nuevo) * anterior + peso_nuevo * medida, 2),
+            'ultima_duracion': round(segundos, 1),
+            'ultimas_paginas': paginas,
+        }
+    try:
+        guardar_json(ruta, estadisticas)
+    except Exception as e:
+        print(f"⚠️ No se pudieron guardar las duraciones: {e}")
+
+def borrar_checkpoint(ruta):
+    """Elimina el checkpoint de una ejecución que ha terminado correctamente"""
+    try:
+        os.remove(ruta)
+        print(f"🧹 Checkpoint eliminado: {ruta}")
+    except FileNotFoundError:
+        pass
+
+def agregar_opciones_ejecutor(parser):
+    """Añade a un parser las opciones comunes del ejecutor de crawl"""
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Número de navegadores que se reparten las páginas (1 por defecto: un solo navegador, como antes)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reanuda la ejecución interrumpida a partir de su checkpoint"
+    )
+    parser.add_argument(
+        "--max-intentos",
+        type=int,
+        default=3,
+        help="Intentos por página antes de darla por fallida"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recorre solo hasta que las páginas coinciden con la ejecución anterior y siembra el resto"
+    )
+    parser.add_argument(
+        "--paginas-iguales",
+        type=int,
+        default=3,
+        help="Páginas seguidas iguales a las de ayer tras las que se deja de paginar (modo incremental)"
+    )
+    parser.add_argument(
+        "--completo-cada-dias",
+        type=int,
+        default=7,
+        help="Días tras los que el modo incremental vuelve a hacer un recorrido completo"
+    )
+    parser.add_argument(
+        "--ritmo-fijo",
+        action="store_true",
+        help="Desactiva el control adaptativo del ritmo (pausa fija y todos los navegadores a la vez)"
+    )
+    parser.add_argument(
+        "--deadline-minutos",
+        type=float,
+        default=None,
+        help="Tiempo máximo de navegación de toda la ejecución; al agotarse se guarda lo extraído como parcial"
+    )
+    parser.add_argument(
+        "--trazar-comandos",
+        action="store_true",
+        help="Cuenta los comandos WebDriver con sus latencias y guarda un resumen JSON de la ejecución"
+    )
+    return parser
+
+def instante_limite(opciones):
+    """Instante (time.time) en que se agota el tiempo de la ejecución, o None sin límite"""
+    minutos = getattr(opciones, 'deadline_minutos', None)
+    if not minutos:
+        return None
+    return INICIO_EJECUCION + minutos * 60
+
+def crear_ritmo(opciones, max_concurrencia):
+    """Crea el controlador de ritmo según las opciones de línea de comandos"""
+    return ControladorRitmo(
+        max_concurrencia=max_concurrencia,
+        adaptativo=not getattr(opciones, 'ritmo_fijo', False)
+    )
+
+def crear_reintentos(opciones):
+    """Crea la política de reintentos según las opciones de línea de comandos"""
+    return PoliticaReintentos(max_intentos=getattr(opciones, 'max_intentos', 3))
+
+def crear_ejecutor(navegadores, opciones, checkpoint=None, productos_por_pagina=12):
+    """Crea el ejecutor según las opciones de línea de comandos (reanudando si se pide)"""
+    ejecutor = EjecutorCrawl(
+        navegadores, productos_por_pagina=productos_por_pagina,
+        ritmo=crear_ritmo(opciones, len(navegadores)),
+        reintentos=crear_reintentos(opciones),
+        checkpoint=checkpoint, fin=instante_limite(opciones),
+        paginas_iguales=getattr(opciones, 'paginas_iguales', 3)
+    )
+    if getattr(opciones, 'resume', False):
+        ejecutor.reanudar()
+    return ejecutor
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Lectura de fichas de producto de MediaMarkt
+Las fichas publican sus datos (precio, disponibilidad, EAN, vendedor) en JSON-LD,
+así que se leen primero con una petición HTTP sencilla y solo se recurre a un
+navegador cuando el HTTP falla o la respuesta no trae los datos
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import json
+import queue
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import comun_crawl
+
+CABECERAS_HTTP = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0 Safari/537.36",
+    'Accept': "text/html,application/xhtml+xml",
+    'Accept-Language': "es-ES,es;q=0.9",
+    'Accept-Encoding': "gzip",
+}
+TIMEOUT_HTTP = 15
+
+PATRON_JSON_LD = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Atributos de la ficha que se añaden a cada producto en el enriquecimiento
+CAMPOS_DETALLE = ('ean', 'sku', 'disponibilidad', 'vendedor', 'especificaciones')
+
+RUTA_CACHE_FICHAS = "scraping_cache/fichas.json"
+
+# Segundos que cada atributo de una ficha en caché se da por bueno sin volver a
+# preguntar al servidor: el precio siempre se revalida, las características casi nunca cambian
+TTL_CAMPOS = {
+    'precio': 0,
+    'moneda': 0,
+    'disponibilidad': 2 * 3600,
+    'vendedor': 24 * 3600,
+    'nombre': 30 * 86400,
+    'marca': 30 * 86400,
+    'sku': 30 * 86400,
+    'ean': 30 * 86400,
+    'especificaciones': 30 * 86400,
+}
+
+class ErrorDescarga(Exception):
+    """La ficha no se pudo descargar por HTTP"""
+
+# ============================================ #
+#          DESCARGA Y PARSEO                   #
+# ============================================ #
+
+def descargar_html(url, etag=None, modificado=None, timeout=TIMEOUT_HTTP):
+    """
+    Descarga una página por HTTP, condicionada a ETag/Last-Modified si se conocen
+
+    Returns:
+        dict: html (None si el servidor responde 304 Not Modified), etag,
+        last_modified y bytes transferidos
+    """
+    cabeceras = dict(CABECERAS_HTTP)
+    if etag:
+        cabeceras['If-None-Match'] = etag
+    if modificado:
+        cabeceras['If-Modified-Since'] = modificado
+
+    peticion = urllib.request.Request(url, headers=cabeceras)
+    try:
+        with urllib.request.urlopen(peticion, timeout=timeout) as respuesta:
+            contenido = respuesta.read()
+            transferidos = len(contenido)
+            if respuesta.headers.get('Content-Encoding') == 'gzip':
+                contenido = gzip.decompress(contenido)
+            charset = respuesta.headers.get_content_charset() or 'utf-8'
+            return {
+                'html': contenido.decode(charset, errors='replace'),
+                'etag': respuesta.headers.get('ETag'),
+                'last_modified': respuesta.headers.get('Last-Modified'),
+                'bytes': transferidos,
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return {
+                'html': None,
+                'etag': e.headers.get('ETag') or etag,
+                'last_modified': e.headers.get('Last-Modified') or modificado,
+                'bytes': 0,
+            }
+        raise ErrorDescarga(f"HTTP {e.code}") from e
+    except (urllib.error.URLError, OSError) as e:
+        raise ErrorDescarga(str(e)) from e
+
+def extraer_json_ld(html):
+    """Objetos JSON-LD de la página (aplanando listas y @graph)"""
+    objetos = []
+    for bloque in PATRON_JSON_LD.findall(html or ""):
+        try:
+            datos = json.loads(bloque.strip())
+        except ValueError:
+            continue
+        pendientes = datos if isinstance(datos, list) else [datos]
+        while pendientes:
+            objeto = pendientes.pop(0)
+            if isinstance(objeto, list):
+                pendientes.extend(objeto)
+            elif isinstance(objeto, dict):
+                objetos.append(objeto)
+                pendientes.extend(objeto.get('@graph', []))
+    return objetos
+
+def _es_producto(objeto):
+    tipo = objeto.get('@type')
+    return tipo == 'Product' or (isinstance(tipo, list) and 'Product' in tipo)
+
+def _texto(valor):
+    """Nombre de un valor JSON-LD que puede venir como texto o como objeto con 'name'"""
+    if isinstance(valor, dict):
+        return valor.get('name')
+    return valor
+
+def _especificaciones(objeto):
+    """Características técnicas publicadas como additionalProperty (nombre -> valor)"""
+    propiedades = objeto.get('additionalProperty') or []
+    if isinstance(propiedades, dict):
+        propiedades = [propiedades]
+    return {
+        propiedad['name']: propiedad.get('value')
+        for propiedad in propiedades
+        if isinstance(propiedad, dict) and propiedad.get('name')
+    }
+
+def leer_producto(html):
+    """
+    Datos de la ficha a partir de su JSON-LD
+
+    Returns:
+        dict: nombre, precio, moneda, disponibilidad, sku, ean, marca, vendedor y
+        especificaciones, o None si la página no trae un producto con precio
+    """
+    for objeto in extraer_json_ld(html):
+        if not _es_producto(objeto):
+            continue
+
+        ofertas = objeto.get('offers') or {}
+        if isinstance(ofertas, list):
+            ofertas = ofertas[0] if ofertas else {}
+        if ofertas.get('@type') == 'AggregateOffer' and 'price' not in ofertas:
+            ofertas = dict(ofertas, price=ofertas.get('lowPrice'))
+
+        try:
+            precio = float(str(ofertas.get('price')).replace(',', '.'))
+        except (TypeError, ValueError):
+            continue
+
+        disponibilidad = ofertas.get('availability')
+        return {
+            'nombre': objeto.get('name'),
+            'precio': precio,
+            'moneda': ofertas.get('priceCurrency'),
+            'disponibilidad': disponibilidad.rsplit('/', 1)[-1] if disponibilidad else None,
+            'sku': objeto.get('sku'),
+            'ean': objeto.get('gtin13') or objeto.get('gtin') or objeto.get('gtin8'),
+            'marca': _texto(objeto.get('brand')),
+            'vendedor': _texto(ofertas.get('seller')),
+            'especificaciones': _especificaciones(objeto),
+        }
+    return None
+
+# ============================================ #
+#          CACHÉ DE FICHAS                     #
+# ============================================ #
+
+class CacheFichas:
+    """
+    Caché en disco de fichas ya parseadas, por enlace
+
+    Cada entrada guarda los datos de la ficha, cuándo se leyó, su ETag y
+    Last-Modified y su tamaño. Una entrada sirve sin ir al servidor mientras
+    todos los campos pedidos estén dentro de su TTL; si no, se revalida con una
+    petición condicional y un 304 la renueva sin volver a descargarla.
+    """
+
+    def __init__(self, ruta=RUTA_CACHE_FICHAS, ttl=None):
+        self.ruta = ruta
+        self.ttl = dict(TTL_CAMPOS, **(ttl or {}))
+        self.entradas = comun_crawl.cargar_json(ruta, {})
+        self.lock = threading.Lock()
+        self.estadisticas = {'frescas': 0, 'revalidadas': 0, 'descargadas': 0,
+                             'bytes_descargados': 0, 'bytes_ahorrados': 0}
+
+    def buscar(self, enlace):
+        with self.lock:
+            return self.entradas.get(enlace)
+
+    def vigente(self, entrada, campos=None):
+        """True si todos los campos pedidos (todos si no se indican) están dentro de su TTL"""
+        edad = time.time() - entrada['fecha']
+        return all(edad <= self.ttl.get(campo, 0) for campo in (campos or entrada['datos']))
+
+    def acierto(self, entrada, revalidada=False):
+        """Cuenta una ficha servida desde la caché (fresca o tras un 304)"""
+        with self.lock:
+            self.estadisticas['revalidadas' if revalidada else 'frescas'] += 1
+            self.estadisticas['bytes_ahorrados'] += entrada.get('bytes', 0)
+            if revalidada:
+                entrada['fecha'] = time.time()
+
+    def guardar(self, enlace, datos, respuesta=None, tamano=0):
+        """Guarda una ficha recién descargada (con las cabeceras de validación si las hay)"""
+        respuesta = respuesta or {}
+        with self.lock:
+            self.estadisticas['descargadas'] += 1
+            self.estadisticas['bytes_descargados'] += respuesta.get('bytes', tamano)
+            self.entradas[enlace] = {
+                'datos': datos,
+                'fecha': time.time(),
+                'etag': respuesta.get('etag'),
+                'last_modified': respuesta.get('last_modified'),
+                'bytes': respuesta.get('bytes', tamano),
+            }
+
+    def persistir(self):
+        with self.lock:
+            try:
+                comun_crawl.guardar_json(self.ruta, self.entradas)
+            except Exception as e:
+                print(f"⚠️ No se pudo guardar la caché de fichas: {e}")
+
+    def imprimir_informe(self):
+        estadisticas = self.estadisticas
+        aciertos = estadisticas['frescas'] + estadisticas['revalidadas']
+        total = aciertos + estadisticas['descargadas']
+        if not total:
+            return
+        print(f"🗃️  Caché de fichas: {aciertos}/{total} aciertos ({aciertos / total * 100:.0f}%), "
+              f"{estadisticas['frescas']} frescas y {estadisticas['revalidadas']} revalidadas con 304")
+        print(f"   {estadisticas['bytes_ahorrados'] / 1e6:.1f} MB ahorrados, "
+              f"{estadisticas['bytes_descargados'] / 1e6:.1f} MB descargados")
+
+# ============================================ #
+#          LECTOR CON RESPALDO DE NAVEGADOR    #
+# ============================================ #
+
+class LectorFichas:
+    """
+    Lee fichas de producto por HTTP y, si hace falta, con un navegador
+
+    Los navegadores se abren bajo demanda (como mucho 'max_navegadores') con la
+    función 'abrir_navegador' y se comparten entre hilos mediante una cola. Con
+    'cache' las fichas vigentes no se vuelven a pedir y las caducadas se revalidan.
+    Con 'ritmo' (un comun_crawl.ControladorRitmo) cada petición al sitio, por
+    HTTP o con navegador, espera su turno y su pausa como las páginas del listado.
+    """
+
+    def __init__(self, abrir_navegador=None, max_navegadores=1, cache=None, ritmo=None):
+        self.cache = cache
+        self.abrir_navegador = abrir_navegador
+        self.max_navegadores = max_navegadores
+        self.ritmo = ritmo
+        self.libres = queue.Queue()
+        self.navegadores = []
+        self.reservados = 0
+        self.lock = threading.Lock()
+        self.estadisticas = {'http': 0, 'navegador': 0, 'fallidas': 0}
+
+    def _contar(self, resultado):
+        with self.lock:
+            self.estadisticas[resultado] += 1
+
+    def _tomar_navegador(self):
+        # Se reserva el hueco bajo el lock y el navegador se abre fuera: arrancar
+        # Chrome tarda segundos y no debe frenar a los hilos que solo cuentan
+        with self.lock:
+            abrir = (self.libres.empty() and self.reservados < self.max_navegadores
+                     and self.abrir_navegador is not None)
+            if abrir:
+                self.reservados += 1
+        if not abrir:
+            return self.libres.get()
+
+        try:
+            driver = self.abrir_navegador()
+        except Exception:
+            with self.lock:
+                self.reservados -= 1
+            raise
+        with self.lock:
+            self.navegadores.append(driver)
+        return driver
+
+    def _pedir(self, funcion, *args, **kwargs):
+        """Hace una petición al sitio respetando el control de ritmo (si lo hay)"""
+        if self.ritmo is None:
+            return funcion(*args, **kwargs)
+        self.ritmo.adquirir()
+        inicio = time.time()
+        senales = []
+        try:
+            return funcion(*args, **kwargs)
+        except Exception:
+            senales.append('error')
+            raise
+        finally:
+            self.ritmo.liberar(time.time() - inicio, senales)
+
+    def _leer_con_navegador(self, enlace):
+        driver = self._tomar_navegador()
+        try:
+            driver.get(enlace)
+            html = driver.page_source
+            return leer_producto(html), len(html.encode('utf-8'))
+        finally:
+            self.libres.put(driver)
+
+    def leer(self, enlace, solo_navegador=False, campos=None):
+        """
+        Lee una ficha
+
+        Args:
+            campos: atributos que se necesitan frescos (según su TTL en la caché)
+
+        Returns:
+            tuple: (datos o None, fuente 'cache' | 'http' | 'navegador' | None)
+        """
+        entrada = self.cache.buscar(enlace) if self.cache else None
+        if entrada and self.cache.vigente(entrada, campos):
+            self.cache.acierto(entrada)
+            return dict(entrada['datos']), 'cache'
+
+        if not solo_navegador:
+            try:
+                respuesta = self._pedir(
+                    descargar_html,
+                    enlace,
+                    etag=entrada and entrada.get('etag'),
+                    modificado=entrada and entrada.get('last_modified')
+                )
+                if respuesta['html'] is None and entrada:
+                    self.cache.acierto(entrada, revalidada=True)
+                    return dict(entrada['datos']), 'cache'
+
+                datos = leer_producto(respuesta['html'])
+                if datos:
+                    self._contar('http')
+                    if self.cache:
+                        self.cache.guardar(enlace, datos, respuesta)
+                    return datos, 'http'
+            except ErrorDescarga as e:
+                print(f"   🌐 HTTP sin éxito en {enlace}: {e}")
+
+        if self.abrir_navegador and self.max_navegadores > 0:
+            try:
+                datos, tamano = self._pedir(self._leer_con_navegador, enlace)
+                if datos:
+                    self._contar('navegador')
+                    if self.cache:
+                        self.cache.guardar(enlace, datos, tamano=tamano)
+                    return datos, 'navegador'
+            except Exception as e:
+                print(f"   ❌ Navegador sin éxito en {enlace}: {e}")
+
+        self._contar('fallidas')
+        return None, None
+
+    def cerrar(self):
+        """Cierra los navegadores abiertos y guarda la caché"""
+        if self.cache:
+            self.cache.persistir()
+        for driver in self.navegadores:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.navegadores = []
+        self.reservados = 0
+
+    def imprimir_informe(self):
+        estadisticas = self.estadisticas
+        print(f"\n📄 Fichas leídas: {estadisticas['http']} por HTTP, {estadisticas['navegador']} con navegador, "
+              f"{estadisticas['fallidas']} fallidas")
+        if self.cache:
+            self.cache.imprimir_informe()
+        if self.ritmo:
+            self.ritmo.imprimir_informe()
+
+# ============================================ #
+#          ENRIQUECIMIENTO DE PRODUCTOS        #
+# ============================================ #
+
+def agregar_opciones_detalle(parser):
+    """Añade a un parser las opciones del enriquecimiento con las fichas de producto"""
+    parser.add_argument(
+        "--detalles",
+        action="store_true",
+        help="Completa cada producto con EAN, disponibilidad, vendedor y características de su ficha"
+    )
+    parser.add_argument(
+        "--hilos-detalle",
+        type=int,
+        default=8,
+        help="Fichas que se leen a la vez como máximo (el control de ritmo empieza con una y sube si el sitio responde bien)"
+    )
+    parser.add_argument(
+        "--navegadores-detalle",
+        type=int,
+        default=1,
+        help="Navegadores de respaldo para las fichas que no se pueden leer por HTTP"
+    )
+    parser.add_argument(
+        "--sin-cache-detalle",
+        action="store_true",
+        help="Lee todas las fichas del servidor sin usar la caché local"
+    )
+    return parser
+
+def _completar_producto(lector, producto):
+    datos, _ = lector.leer(producto['enlace'], campos=CAMPOS_DETALLE)
+    if not datos:
+        return False
+    for campo in CAMPOS_DETALLE:
+        valor = datos.get(campo)
+        if campo == 'especificaciones':
+            valor = json.dumps(valor, ensure_ascii=False) if valor else None
+        producto[campo] = valor
+    return True
+
+def enriquecer_productos(productos, opciones, abrir_navegador=None):
+    """
+    Añade a los productos los atributos de su ficha (CAMPOS_DETALLE) leyendo las
+    fichas en paralelo con un número acotado de hilos
+
+    Returns:
+        int: productos completados
+    """
+    con_enlace = [p for p in productos if p.get('enlace') and str(p['enlace']).startswith('http')]
+    print(f"\n📄 Enriqueciendo {len(con_enlace)} productos con su ficha ({opciones.hilos_detalle} hilos)")
+
+    lector = LectorFichas(
+        abrir_navegador=abrir_navegador,
+        max_navegadores=opciones.navegadores_detalle,
+        cache=None if opciones.sin_cache_detalle else CacheFichas(),
+        ritmo=comun_crawl.crear_ritmo(opciones, max(1, opciones.hilos_detalle))
+    )
+    inicio = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, opciones.hilos_detalle)) as pool:
+            completados = sum(pool.map(lambda producto: _completar_producto(lector, producto), con_enlace))
+    finally:
+        lector.cerrar()
+
+    duracion = max(time.time() - inicio, 1e-9)
+    print(f"✅ {completados}/{len(con_enlace)} productos enriquecidos en {duracion:.1f}s "
+          f"({len(con_enlace) / duracion:.1f} fichas/s)")
+    lector.imprimir_informe()
+    return completados
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Lectura del histórico de precios de las categorías de MediaMarkt
+El histórico es el CSV que cada script de categoría actualiza en Google Drive
+(<categoria>_mediamarkt.csv); también se puede leer de copias locales
+"""
+
+import os
+
+import pandas as pd
+
+import comun_categorias
+import comun_scraper
+
+def descargar_historico(modulo):
+    """Descarga de Google Drive el histórico de una categoría (el mismo que actualiza su script)"""
+    service = comun_scraper.configurar_google_drive()
+    if not service:
+        return None
+
+    archivo = comun_scraper.buscar_archivo_drive(service, modulo.nombre_archivo_drive(), modulo.CARPETA_DRIVE)
+    if not archivo:
+        return None
+    contenido = comun_scraper.descargar_archivo_drive(service, archivo['id'])
+    return comun_scraper.leer_csv_seguro(contenido) if contenido else None
+
+def cargar_historico(rutas=None, categorias=None, tienda=None):
+    """
+    Histórico de varias categorías con una columna 'categoria'
+
+    Args:
+        rutas: CSV locales (<categoria>_mediamarkt.csv); si no se indican, se
+            descargan de Google Drive los de 'categorias' (todas por defecto)
+        tienda: código de la tienda cuyos históricos se descargan (la española
+            por defecto)
+    """
+    tablas = []
+    if rutas:
+        for ruta in rutas:
+            with open(ruta, encoding='utf-8', errors='replace') as f:
+                df = comun_scraper.leer_csv_seguro(f.read())
+            if df is None:
+                continue
+            df['categoria'] = os.path.basename(ruta).split('_')[0]
+            tablas.append(df)
+    else:
+        for nombre, modulo in comun_categorias.cargar_categorias(categorias, [tienda] if tienda else None).items():
+            print(f"\n📂 Histórico de {nombre}")
+            df = descargar_historico(modulo)
+            if df is not None and not df.empty:
+                df['categoria'] = nombre
+                tablas.append(df)
+
+    return pd.concat(tablas, ignore_index=True, sort=False) if tablas else pd.DataFrame()
+
+def enlaces_conocidos(historico):
+    """Enlaces válidos del histórico"""
+    if historico.empty or 'enlace' not in historico.columns:
+        return set()
+    enlaces = historico['enlace'].dropna()
+    return set(enlaces[enlaces != 'No disponible'])
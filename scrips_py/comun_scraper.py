@@ -0,0 +1,1170 @@
+#!/usr/bin/env python3
+"""
+Scraper de una categoría de MediaMarkt con actualización en Google Drive
+Reúne todo lo que era igual en los scripts de categoría: los modos de crawl,
+la carga de páginas, la limpieza de precios, el guardado del CSV local y el
+histórico de Google Drive. Cada script solo aporta su configuración (slug,
+ficheros de resultados y extracción de la marca) y crea un ScraperCategoria
+"""
+
+import pandas as pd
+from datetime import datetime
+import os
+import math
+import re
+import io
+import json
+import hashlib
+import argparse
+from urllib.parse import quote
+
+import comun_adaptadores
+import comun_crawl
+import comun_detalle
+import comun_tiendas
+import comun_traza
+
+CARPETA_DRIVE = "1cSW4uOfw4x61a-R6TAOyn6ejEHNiyX0v"
+
+# ============================================ #
+#          GENERACIÓN DE IDs ÚNICOS            #
+# ============================================ #
+
+def generar_id_consistente(nombre):
+    """Genera un ID único y consistente basado en el nombre del producto"""
+    nombre_normalizado = str(nombre).lower().strip()
+    nombre_normalizado = re.sub(r'\s+', ' ', nombre_normalizado)
+
+    hash_obj = hashlib.md5(nombre_normalizado.encode('utf-8'))
+    hash_hex = hash_obj.hexdigest()
+
+    return hash_hex[:12]
+
+# ============================================ #
+#          GOOGLE DRIVE FUNCTIONS              #
+# ============================================ #
+
+def configurar_google_drive():
+    """Configura y autentica con Google Drive"""
+    try:
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
+        credenciales_json = (
+            os.environ.get('GOOGLE_CREDENTIALS_JSON_2')
+            or os.environ.get('GOOGLE_CREDENTIALS_JSON'))
+
+        if not credenciales_json:
+            print("⚠️  No se encontraron credenciales de Google Drive")
+            return None
+
+        creds_dict = json.loads(credenciales_json)
+        scopes = ['https://www.googleapis.com/auth/drive']
+
+        credentials = service_account.Credentials.from_service_account_info(
+            creds_dict, scopes=scopes
+        )
+
+        service = build('drive', 'v3', credentials=credentials)
+        print("✅ Google Drive configurado exitosamente")
+        return service
+
+    except ImportError:
+        print("❌ Módulos de Google API no instalados")
+        return None
+    except Exception as e:
+        print(f"❌ Error configurando Google Drive: {e}")
+        return None
+
+def buscar_archivo_drive(service, nombre_archivo, folder_id):
+    """Busca un archivo en Google Drive"""
+    try:
+        query = f"name = '{nombre_archivo}' and '{folder_id}' in parents and trashed = false"
+        results = service.files().list(
+            q=query,
+            fields="files(id, name, modifiedTime)"
+        ).execute()
+
+        files = results.get('files', [])
+        return files[0] if files else None
+
+    except Exception as e:
+        print(f"❌ Error buscando archivo en Drive: {e}")
+        return None
+
+def descargar_archivo_drive(service, file_id):
+    """Descarga un archivo de Google Drive"""
+    try:
+        from googleapiclient.http import MediaIoBaseDownload
+
+        metadata = service.files().get(
+            fileId=file_id,
+            fields="mimeType"
+        ).execute()
+
+        mime_type = metadata.get("mimeType")
+        fh = io.BytesIO()
+
+        if mime_type == "application/vnd.google-apps.spreadsheet":
+            print("📄 Archivo es Google Sheets, exportando como CSV")
+            request = service.files().export(
+                fileId=file_id,
+                mimeType="text/csv"
+            )
+        else:
+            print("📄 Archivo es binario, descargando directamente")
+            request = service.files().get_media(fileId=file_id)
+
+        downloader = MediaIoBaseDownload(fh, request)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+
+        fh.seek(0)
+        contenido_bytes = fh.getvalue()
+
+        try:
+            return contenido_bytes.decode("utf-8")
+        except UnicodeDecodeError:
+            return contenido_bytes.decode("latin-1")
+
+    except Exception as e:
+        print(f"❌ Error descargando archivo de Drive: {e}")
+        return None
+
+def subir_archivo_drive(service, nombre_archivo, contenido_csv, folder_id, file_id=None):
+    """Sube o actualiza un archivo CSV en Google Drive"""
+    try:
+        from googleapiclient.http import MediaIoBaseUpload
+
+        csv_bytes = contenido_csv.encode('utf-8')
+        media = MediaIoBaseUpload(
+            io.BytesIO(csv_bytes),
+            mimetype='text/csv',
+            resumable=False
+        )
+
+        if file_id:
+            print(f"📤 Actualizando archivo existente en Drive (ID: {file_id})")
+            file = service.files().update(
+                fileId=file_id,
+                media_body=media
+            ).execute()
+            print("✅ Archivo actualizado en Drive")
+        else:
+            print("📤 Creando nuevo archivo en Drive")
+            file_metadata = {
+                'name': nombre_archivo,
+                'parents': [folder_id],
+                'mimeType': 'text/csv'
+            }
+            file = service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields='id'
+            ).execute()
+            print(f"✅ Nuevo archivo creado en Drive (ID: {file.get('id')})")
+
+        return True
+
+    except Exception as e:
+        print(f"❌ Error subiendo archivo a Drive: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def leer_csv_seguro(contenido):
+    """Lee el CSV histórico descargado de Drive (None si está corrupto)"""
+    contenido = contenido.replace('\x00', '')
+    try:
+        return pd.read_csv(
+            io.StringIO(contenido),
+            sep=None,
+            engine="python",
+            on_bad_lines="skip"
+        )
+    except Exception:
+        print("⚠️ CSV histórico corrupto, se ignora y se recrea")
+        return None
+
+# ============================================ #
+#          OPCIONES DE LÍNEA DE COMANDOS       #
+# ============================================ #
+
+def parsear_argumentos(argv=None):
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Scraping de MediaMarkt con actualización en Google Drive")
+    parser.add_argument(
+        "--modo",
+        choices=["ordenaciones", "bidireccional", "marcas", "precios"],
+        default="ordenaciones",
+        help="Estrategia de crawl: cinco ordenaciones (por defecto), name+asc/name+desc a la vez o particiones por marca/precio"
+    )
+    comun_crawl.agregar_opciones_ejecutor(parser)
+    comun_detalle.agregar_opciones_detalle(parser)
+    return parser.parse_args(argv)
+
+# ============================================ #
+#          SCRAPER DE CATEGORÍA                #
+# ============================================ #
+
+class ScraperCategoria:
+    """
+    Scraper de una categoría de MediaMarkt en una tienda.
+
+    Los atributos en mayúsculas conservan los nombres de los antiguos globales
+    de los scripts, que son los que usan los ejecutores multicategoría, la cola
+    y el escaneo de ofertas.
+    """
+
+    MAX_PAGINAS = 30
+    PRODUCTOS_POR_PAGINA = 12
+
+    CRITERIOS_ORDENACION = [
+        "currentprice+desc",
+        "currentprice+asc",
+        "relevance",
+        "name+asc",
+        "name+desc"
+    ]
+
+    PARAMETRO_MARCA = "brand"
+    PARAMETRO_PRECIO = "price"
+
+    DIRECTORIO_CACHE = "scraping_cache"
+    CARPETA_DRIVE = CARPETA_DRIVE
+
+    def __init__(self, titulo, slug, archivo_drive, prefijo_resultados, extraer_marca, adaptador="mediamarkt"):
+        """
+        Args:
+            titulo: nombre de la categoría en la cabecera de la ejecución
+            slug: id de la categoría en la tienda española (p. ej. 'televisores-399')
+            archivo_drive: CSV histórico en Google Drive (p. ej. 'tvs_mediamarkt.csv')
+            prefijo_resultados: prefijo de los CSV locales en scraping_results
+            extraer_marca: función nombre -> marca propia de la categoría
+            adaptador: clave en comun_adaptadores.ADAPTADORES del adaptador de la tienda
+
+        Raises:
+            ValueError: si no hay ningún adaptador registrado con esa clave
+        """
+        if adaptador not in comun_adaptadores.ADAPTADORES:
+            raise ValueError(f"Adaptador de tienda desconocido: {adaptador}")
+        self.clave_adaptador = adaptador
+        self.titulo = titulo
+        self.archivo_drive = archivo_drive
+        self.prefijo_resultados = prefijo_resultados
+        self.extraer_marca = extraer_marca
+        self.SLUG_CATEGORIA = slug
+        self.configurar_tienda(comun_tiendas.TIENDAS[comun_tiendas.TIENDA_POR_DEFECTO])
+
+    def configurar_tienda(self, tienda, slug=None):
+        """
+        Apunta la categoría a otra tienda (URL base, id de categoría, formato de
+        precios y botón de cookies) con un adaptador nuevo; sus cachés y resultados
+        van aparte
+        """
+        self.TIENDA = tienda
+        self.URL_BASE = tienda.url_base
+        self.SLUG_CATEGORIA = slug or self.SLUG_CATEGORIA
+        self.URL_CATEGORIA = tienda.url_categoria(self.SLUG_CATEGORIA)
+        # Rejillas ya extraídas en esta ejecución (las ordenaciones repiten muchas páginas)
+        self.CACHE_HUELLAS = comun_crawl.CacheHuellas()
+        # Artículos de cada listado (consulta -> total) para saber cuántas tarjetas esperar por página
+        self.articulos_listado = {}
+        # Todo lo que depende del HTML de la tienda (selectores, rejilla, cookies); los
+        # selectores de precio arrancan en el orden que mejor funcionó en la categoría
+        self.ADAPTADOR = comun_adaptadores.ADAPTADORES[self.clave_adaptador](
+            tienda, self.extraer_marca, generar_id_consistente,
+            ruta_planes=os.path.join(self.DIRECTORIO_CACHE, f"selectores_{self.SLUG_CATEGORIA}{tienda.sufijo}.json")
+        )
+
+    def consultas_ordenacion(self):
+        """Consultas de los listados de la categoría completa, una por criterio"""
+        return [f"sort={criterio}" for criterio in self.CRITERIOS_ORDENACION]
+
+    def etiqueta(self):
+        """Categoría y tienda en los nombres de fichero (sin sufijo en la española)"""
+        return f"{self.SLUG_CATEGORIA}{self.TIENDA.sufijo}"
+
+    # ============================================ #
+    #          LIMPIEZA DE PRECIOS                 #
+    # ============================================ #
+
+    def limpiar_precio(self, precio_texto):
+        """
+        Limpia un texto de precio y lo convierte a float (con el formato de la tienda)
+        """
+        return self.TIENDA.limpiar_precio(precio_texto)
+
+    def limpiar_columna_precio(self, df):
+        """
+        Limpia las columnas de precio y las renombra para mantener compatibilidad con histórico
+
+        FORMATO FINAL:
+        - precio: precio actual/rebajado (numérico)
+        - precio_rebajado: precio original tachado (numérico)
+        - precio_original_texto: texto del precio actual
+        - precio_rebajado_texto: texto del precio original
+        """
+        print("\n" + "="*60)
+        print("LIMPIANDO COLUMNAS DE PRECIO")
+        print("="*60)
+
+        try:
+            # PASO 1: Guardar textos originales con nombres temporales
+            if 'precio_actual_temp' in df.columns:
+                df['texto_precio_actual_temp'] = df['precio_actual_temp'].copy()
+            if 'precio_original_temp' in df.columns:
+                df['texto_precio_original_temp'] = df['precio_original_temp'].copy()
+
+            # PASO 2: Limpiar precio actual (será la columna 'precio')
+            if 'precio_actual_temp' in df.columns:
+                print("📊 Limpiando precio actual (precio)...")
+                df['precio'] = self.TIENDA.limpiar_precios(df['precio_actual_temp'])
+
+                validos = df['precio'].notna().sum()
+                print(f"   ✅ {validos} precios actuales válidos")
+                if validos > 0:
+                    print(f"   📈 Rango: {df['precio'].min():.2f}€ - {df['precio'].max():.2f}€")
+                    print(f"   📊 Promedio: {df['precio'].mean():.2f}€")
+
+            # PASO 3: Limpiar precio original (será la columna 'precio_rebajado')
+            if 'precio_original_temp' in df.columns:
+                print("📊 Limpiando precio original (precio_rebajado)...")
+                df['precio_rebajado'] = self.TIENDA.limpiar_precios(df['precio_original_temp'])
+
+                validos = df['precio_rebajado'].notna().sum()
+                print(f"   ✅ {validos} precios originales válidos")
+                if validos > 0:
+                    print(f"   📈 Rango: {df['precio_rebajado'].min():.2f}€ - {df['precio_rebajado'].max():.2f}€")
+                    print(f"   📊 Promedio: {df['precio_rebajado'].mean():.2f}€")
+
+            # PASO 4: Renombrar columnas de texto correctamente
+            if 'texto_precio_actual_temp' in df.columns:
+                df['precio_original_texto'] = df['texto_precio_actual_temp']
+            if 'texto_precio_original_temp' in df.columns:
+                df['precio_rebajado_texto'] = df['texto_precio_original_temp']
+
+            # PASO 5: Eliminar columnas temporales
+            columnas_temp = ['precio_actual_temp', 'precio_original_temp',
+                            'texto_precio_actual_temp', 'texto_precio_original_temp']
+            df = df.drop(columns=[col for col in columnas_temp if col in df.columns], errors='ignore')
+
+            # PASO 6: Calcular descuentos (precio_rebajado > precio)
+            if 'precio_rebajado' in df.columns and 'precio' in df.columns:
+                mask = (df['precio_rebajado'].notna()) & (df['precio'].notna()) & (df['precio_rebajado'] > df['precio'])
+
+                if mask.sum() > 0:
+                    df.loc[mask, 'descuento_euros'] = df.loc[mask, 'precio_rebajado'] - df.loc[mask, 'precio']
+                    df.loc[mask, 'descuento_porcentaje'] = ((df.loc[mask, 'precio_rebajado'] - df.loc[mask, 'precio']) / df.loc[mask, 'precio_rebajado']) * 100
+
+                    print(f"\n💰 Productos con descuento: {mask.sum()}")
+                    print(f"   📉 Descuento promedio: {df.loc[mask, 'descuento_porcentaje'].mean():.1f}%")
+                    print(f"   💵 Ahorro promedio: {df.loc[mask, 'descuento_euros'].mean():.2f}€")
+
+            return df
+
+        except Exception as e:
+            print(f"❌ Error limpiando columnas precio: {e}")
+            import traceback
+            traceback.print_exc()
+            return df
+
+    # ============================================ #
+    #          HISTÓRICO EN GOOGLE DRIVE           #
+    # ============================================ #
+
+    def nombre_archivo_drive(self):
+        """CSV histórico de la categoría en Google Drive (con el sufijo de la tienda)"""
+        if self.TIENDA.sufijo:
+            return self.archivo_drive.replace('.csv', f'{self.TIENDA.sufijo}.csv')
+        return self.archivo_drive
+
+    def actualizar_csv_drive(self, df_nuevo, folder_id=CARPETA_DRIVE, nombre_archivo=None):
+        """Actualiza el CSV histórico en Google Drive"""
+        nombre_archivo = nombre_archivo or self.nombre_archivo_drive()
+
+        print("\n" + "="*60)
+        print("ACTUALIZANDO GOOGLE DRIVE – HISTÓRICO REAL (APPEND)")
+        print("="*60)
+
+        service = configurar_google_drive()
+        if not service:
+            print("⚠️ Google Drive no disponible")
+            return False
+
+        archivo_existente = buscar_archivo_drive(service, nombre_archivo, folder_id)
+
+        if archivo_existente:
+            print("📁 Archivo histórico encontrado")
+            contenido = descargar_archivo_drive(service, archivo_existente["id"])
+
+            if not contenido:
+                print("❌ No se pudo descargar el histórico")
+                return False
+
+            df_existente = leer_csv_seguro(contenido)
+
+            if df_existente is None or df_existente.empty:
+                print("🆕 Histórico inválido → usando solo datos nuevos")
+                df_combinado = df_nuevo.copy()
+            else:
+                print(f"📊 Filas históricas: {len(df_existente)}")
+                df_combinado = pd.concat(
+                    [df_existente, df_nuevo],
+                    ignore_index=True,
+                    sort=False
+                )
+        else:
+            print("🆕 No existe histórico, creando nuevo")
+            df_combinado = df_nuevo.copy()
+
+        filas_antes = len(df_combinado)
+        df_combinado = df_combinado.drop_duplicates()
+        filas_despues = len(df_combinado)
+
+        print(f"🧹 Duplicados eliminados: {filas_antes - filas_despues}")
+        print(f"📊 Total final en histórico: {len(df_combinado)}")
+
+        csv_contenido = df_combinado.to_csv(index=False, encoding="utf-8")
+
+        subir_exitoso = subir_archivo_drive(
+            service,
+            nombre_archivo,
+            csv_contenido,
+            folder_id,
+            archivo_existente["id"] if archivo_existente else None
+        )
+
+        if subir_exitoso:
+            print("✅ Histórico actualizado correctamente en Google Drive")
+            return True
+        else:
+            print("❌ Error subiendo el archivo a Drive")
+            return False
+
+    # ============================================ #
+    #          FUNCIONES DE SCRAPING               #
+    # ============================================ #
+
+    def mediamark_mob_(self, url):
+        """Inicializa el navegador Chrome"""
+        return self.ADAPTADOR.abrir_navegador(url)
+
+    def abrir_navegadores(self, cantidad):
+        """Abre navegadores adicionales para los modos de crawl concurrentes"""
+        navegadores = []
+        for _ in range(max(0, cantidad)):
+            try:
+                navegadores.append(self.mediamark_mob_(self.construir_url_listado("sort=relevance")))
+            except Exception as e:
+                print(f"⚠️ No se pudo abrir un navegador adicional: {e}")
+                break
+        return navegadores
+
+    def cerrar_navegadores(self, navegadores):
+        """Cierra los navegadores adicionales"""
+        for navegador in navegadores:
+            try:
+                navegador.quit()
+            except:
+                pass
+
+    def obtener_total_articulos(self, driver):
+        """Obtiene el número total de artículos"""
+        return self.ADAPTADOR.leer_total(driver, self.PRODUCTOS_POR_PAGINA)
+
+    def leer_facetas_marca(self, driver):
+        """
+        Lee las opciones del filtro de marca del listado actual
+
+        Returns:
+            list: tuplas (marca, número de artículos); vacía si no se encuentra la faceta
+        """
+        return self.ADAPTADOR.leer_facetas_marca(driver)
+
+    def extraer_productos_pagina(self, driver):
+        """Extrae los productos de una sola página"""
+        return self.ADAPTADOR.extraer_tarjetas(driver)
+
+    def leer_ids_rejilla(self, driver):
+        """Ids de los productos de la rejilla en orden, leídos con una sola llamada al navegador"""
+        return self.ADAPTADOR.leer_ids(driver)
+
+    def construir_url_listado(self, consulta, pagina=None):
+        """Construye la URL del listado de la categoría con su consulta (orden/filtros) y página"""
+        return self.ADAPTADOR.url_listado(self.URL_CATEGORIA, consulta, pagina)
+
+    def aceptar_cookies_de_nuevo(self, driver):
+        """
+        Acepta el banner de cookies si ha vuelto a aparecer y lo señala al control de
+        ritmo: que el sitio nos trate como visitante nuevo es un aviso de bloqueo suave
+        """
+        if self.ADAPTADOR.aceptar_consentimiento(driver):
+            comun_crawl.senalar("consentimiento")
+
+    def anotar_articulos(self, consultas, cantidad):
+        """Anota el número de artículos de los listados de esas consultas (si se conoce)"""
+        if cantidad:
+            for consulta in consultas:
+                self.articulos_listado[consulta] = cantidad
+
+    def tarjetas_esperadas(self, consulta, pagina):
+        """
+        Tarjetas que debería mostrar una página del listado: una página completa,
+        salvo la última de un listado cuyo total se conoce (0 más allá del total)
+        """
+        cantidad = self.articulos_listado.get(consulta)
+        if not cantidad:
+            return self.PRODUCTOS_POR_PAGINA
+        restantes = cantidad - ((pagina or 1) - 1) * self.PRODUCTOS_POR_PAGINA
+        return max(0, min(restantes, self.PRODUCTOS_POR_PAGINA))
+
+    def cargar_pagina(self, driver, consulta, pagina):
+        """
+        Navega a una página del listado y extrae sus productos
+        (las pausas entre páginas las decide el control de ritmo del ejecutor)
+
+        Las páginas que llegan a leerse pasan por el detector de deriva de
+        selectores del adaptador, que aborta el crawl si las primeras salen rotas;
+        las que no cargan las resuelven los reintentos y el cortacircuitos.
+
+        Al control de ritmo se le señala 'timeout' si la página no terminó de
+        cargar y 'rejilla_vacia' si cargó sin tarjetas o con menos de las que
+        le tocan según el total del listado (un bloqueo suave típico)
+
+        Returns:
+            list: productos de la página, o None si la página no cargó correctamente
+        """
+        driver.get(self.construir_url_listado(consulta, pagina))
+        esperadas = self.tarjetas_esperadas(consulta, pagina)
+        total_conocido = consulta in self.articulos_listado
+
+        if not self.ADAPTADOR.esperar_rejilla(driver):
+            if total_conocido and not esperadas:
+                # Página más allá del total del listado: vacía de verdad
+                return []
+            comun_crawl.senalar("rejilla_vacia" if self.ADAPTADOR.documento_listo(driver) else "timeout")
+            self.aceptar_cookies_de_nuevo(driver)
+            return None
+
+        self.aceptar_cookies_de_nuevo(driver)
+
+        # Las tarjetas bajo el pliegue se pintan al desplazarse: sin ellas la página
+        # parecería corta y se tomaría por la última
+        tarjetas = self.ADAPTADOR.completar_rejilla(driver, esperadas or self.PRODUCTOS_POR_PAGINA)
+        if total_conocido and tarjetas < esperadas:
+            comun_crawl.senalar("rejilla_vacia")
+
+        ids = self.leer_ids_rejilla(driver)
+        productos = self.CACHE_HUELLAS.buscar(ids)
+        if productos is not None:
+            print(f"   ♻️  Rejilla ya vista ({len(productos)} productos): se omite la extracción")
+            return productos
+
+        productos = self.extraer_productos_pagina(driver)
+        self.ADAPTADOR.vigilar(driver, esperadas, self.etiqueta())
+        self.CACHE_HUELLAS.guardar(ids, productos)
+        return productos
+
+    def registrar_productos(self, productos_pagina, productos_unicos, productos_data):
+        """
+        Añade los productos no vistos a productos_data asignando su número de orden,
+        con la misma regla que comun_crawl.fusionar_fragmentos: deduplica por id y
+        numera por orden de primera aparición
+        """
+        for producto in productos_pagina:
+            if producto['id'] not in productos_unicos:
+                productos_unicos.add(producto['id'])
+                producto['numero'] = len(productos_data) + 1
+                productos_data.append(producto)
+
+    def paginas_a_recorrer(self, total_articulos, total_paginas):
+        """Páginas por criterio: las calculadas si se conoce el total, con el límite de paginación"""
+        if total_articulos:
+            return min(self.MAX_PAGINAS, total_paginas)
+        return self.MAX_PAGINAS
+
+    def ruta_checkpoint(self):
+        """Fichero de checkpoint de la categoría"""
+        return os.path.join(self.DIRECTORIO_CACHE, f"checkpoint_{self.etiqueta()}.json")
+
+    def ruta_instantanea(self):
+        """Fichero con las páginas de la última ejecución (semilla del modo incremental)"""
+        return os.path.join(self.DIRECTORIO_CACHE, f"paginas_{self.etiqueta()}.json")
+
+    def guardar_instantanea_paginas(self, ejecutor, resumen):
+        """Guarda las páginas recorridas para sembrar la próxima ejecución (no si quedó parcial)"""
+        if resumen['parcial']:
+            return
+        comun_crawl.guardar_instantanea(
+            self.ruta_instantanea(), ejecutor.paginas_categoria(self.SLUG_CATEGORIA), resumen['total_articulos'],
+            sembradas=ejecutor.sembradas.get(self.SLUG_CATEGORIA, ())
+        )
+
+    def anotar_parcial(self, ejecutor, resumen):
+        """Marca el resumen como parcial (con su motivo) si el ejecutor no completó la categoría"""
+        motivo = ejecutor.motivo_parcial(self.SLUG_CATEGORIA)
+        if motivo and not resumen['parcial']:
+            resumen['parcial'] = True
+            resumen['motivo_parcial'] = motivo
+
+    def recorrer_criterios(self, navegadores, criterios_ordenacion, paginas, productos_unicos, productos_data,
+                           opciones, resumen):
+        """
+        Recorre la rejilla criterio x página repartiendo las páginas entre los navegadores
+        con el ejecutor compartido (una página corta o que no carga corta su criterio)
+        """
+        print(f"\n🎯 Criterios de ordenación: {', '.join(criterios_ordenacion)}")
+        print(f"⚙️  {len(navegadores)} navegadores, hasta {paginas} páginas por criterio")
+
+        ejecutor = comun_crawl.crear_ejecutor(
+            navegadores, opciones, checkpoint=self.ruta_checkpoint(), productos_por_pagina=self.PRODUCTOS_POR_PAGINA
+        )
+        ejecutor.agregar_categoria(
+            self.SLUG_CATEGORIA, self.cargar_pagina,
+            [f"sort={criterio}" for criterio in criterios_ordenacion],
+            paginas,
+            previas=comun_crawl.paginas_previas(opciones, self.ruta_instantanea(), resumen['total_articulos'])
+        )
+        resultados = ejecutor.ejecutar()
+
+        self.registrar_productos(resultados[self.SLUG_CATEGORIA], productos_unicos, productos_data)
+        ejecutor.imprimir_informe()
+        self.anotar_parcial(ejecutor, resumen)
+        self.guardar_instantanea_paginas(ejecutor, resumen)
+
+    def recorrer_bidireccional(self, navegadores, productos_unicos, productos_data, opciones):
+        """
+        Recorre 'name+asc' y 'name+desc' a la vez con dos navegadores
+
+        Returns:
+            bool: True si los dos frentes se encontraron (cobertura completa)
+        """
+        print("\n🎯 Crawl bidireccional por nombre (name+asc / name+desc)")
+        navegadores_propios = [] if len(navegadores) > 1 else self.abrir_navegadores(1)
+
+        if len(navegadores) + len(navegadores_propios) < 2:
+            print("⚠️ No hay un segundo navegador para el frente descendente")
+            return False
+
+        try:
+            resultado = comun_crawl.crawl_bidireccional(
+                navegadores[0], (navegadores[1:] + navegadores_propios)[0], self.cargar_pagina,
+                max_paginas=self.MAX_PAGINAS,
+                productos_por_pagina=self.PRODUCTOS_POR_PAGINA,
+                fin=comun_crawl.instante_limite(opciones),
+                ritmo=comun_crawl.crear_ritmo(opciones, 2),
+                reintentos=comun_crawl.crear_reintentos(opciones)
+            )
+        finally:
+            self.cerrar_navegadores(navegadores_propios)
+
+        self.registrar_productos(resultado['productos_asc'], productos_unicos, productos_data)
+        self.registrar_productos(resultado['productos_desc'], productos_unicos, productos_data)
+
+        print(f"↔️  Páginas recorridas: {resultado['paginas_asc']} (asc) + {resultado['paginas_desc']} (desc)")
+        print(f"✅ Total únicos tras el crawl bidireccional: {len(productos_data)}")
+
+        return resultado['encuentro']
+
+    def recorrer_listados(self, navegadores, listados, productos_unicos, productos_data, opciones, resumen):
+        """
+        Recorre en paralelo listados independientes (particiones) con el ejecutor
+        compartido y fusiona sus productos por id
+
+        Args:
+            listados: dict consulta -> páginas a recorrer
+        """
+        ejecutor = comun_crawl.crear_ejecutor(
+            navegadores, opciones, checkpoint=self.ruta_checkpoint(), productos_por_pagina=self.PRODUCTOS_POR_PAGINA
+        )
+        ejecutor.agregar_categoria(
+            self.SLUG_CATEGORIA, self.cargar_pagina, list(listados), listados,
+            previas=comun_crawl.paginas_previas(opciones, self.ruta_instantanea(), resumen['total_articulos'])
+        )
+        resultados = ejecutor.ejecutar()
+
+        self.registrar_productos(resultados[self.SLUG_CATEGORIA], productos_unicos, productos_data)
+        ejecutor.imprimir_informe()
+        self.anotar_parcial(ejecutor, resumen)
+        self.guardar_instantanea_paginas(ejecutor, resumen)
+
+        print(f"🧩 {len(listados)} particiones, {sum(listados.values())} páginas planificadas, {len(productos_data)} productos únicos")
+
+    def listados_particion(self, filtro, cantidad):
+        """
+        Listados para recorrer una partición (consulta -> páginas); si desborda el
+        límite de paginación se cubre desde ambos extremos
+        """
+        if not cantidad:
+            return {f"{filtro}&sort=name+asc": self.MAX_PAGINAS}
+
+        paginas = min(self.MAX_PAGINAS, math.ceil(cantidad / self.PRODUCTOS_POR_PAGINA))
+        listados = {f"{filtro}&sort=name+asc": paginas}
+        if cantidad > self.MAX_PAGINAS * self.PRODUCTOS_POR_PAGINA:
+            print(f"⚠️ {filtro}: {cantidad} artículos superan el límite de paginación, se añade name+desc")
+            listados[f"{filtro}&sort=name+desc"] = paginas
+        self.anotar_articulos(listados, cantidad)
+        return listados
+
+    def recorrer_particiones_marca(self, navegadores, total_articulos, productos_unicos, productos_data,
+                                   opciones, resumen):
+        """
+        Divide la categoría en un listado por marca (cada uno bajo el límite de paginación)
+        y los recorre en paralelo con los navegadores disponibles
+
+        Returns:
+            bool: True si se pudo particionar la categoría
+        """
+        print(f"\n🎯 Crawl particionado por marca con {len(navegadores)} navegadores")
+        facetas = self.leer_facetas_marca(navegadores[0])
+
+        if not facetas:
+            return False
+
+        listados = {}
+        for marca, cantidad in facetas:
+            listados.update(self.listados_particion(f"{self.PARAMETRO_MARCA}={quote(marca)}", cantidad))
+
+        self.recorrer_listados(navegadores, listados, productos_unicos, productos_data, opciones, resumen)
+
+        suma_facetas = sum(cantidad for _, cantidad in facetas)
+        if total_articulos and suma_facetas < total_articulos:
+            print(f"⚠️ La faceta de marca solo cubre {suma_facetas} de {total_articulos} artículos")
+
+        return True
+
+    def filtro_rango_precio(self, minimo, maximo):
+        """Consulta de filtro por rango de precio"""
+        def formatear(valor):
+            return str(int(valor)) if float(valor).is_integer() else f"{valor:.2f}"
+        return f"{self.PARAMETRO_PRECIO}={formatear(minimo)}-{formatear(maximo)}"
+
+    def contar_articulos_rango(self, driver, minimo, maximo):
+        """Lee el número de artículos de un rango de precio igual que obtener_total_articulos"""
+        try:
+            driver.get(self.construir_url_listado(f"{self.filtro_rango_precio(minimo, maximo)}&sort=relevance"))
+            # Se lee en cuanto aparece el recuento (un rango vacío no pinta tarjetas)
+            self.ADAPTADOR.esperar_total(driver)
+            total_articulos, _ = self.obtener_total_articulos(driver)
+            return total_articulos
+        except Exception as e:
+            print(f"⚠️ No se pudo contar el rango {minimo}-{maximo}€: {e}")
+            return None
+
+    def recorrer_particiones_precio(self, navegadores, productos_unicos, productos_data, opciones, resumen):
+        """
+        Divide la categoría por rangos de precio (reutilizando el plan del día anterior)
+        y recorre las hojas en paralelo con los navegadores disponibles
+
+        Returns:
+            bool: True si se pudo particionar la categoría
+        """
+        print(f"\n🎯 Crawl particionado por rangos de precio con {len(navegadores)} navegadores")
+        driver = navegadores[0]
+
+        # El listado inicial está ordenado por precio descendente: su primer producto marca el techo
+        precio_max = None
+        try:
+            primeros = self.extraer_productos_pagina(driver)
+            if primeros:
+                precio_max = self.limpiar_precio(primeros[0]['precio_actual_temp'])
+        except Exception:
+            pass
+        precio_max = math.ceil(precio_max) + 1 if precio_max else 100000
+
+        ruta_plan = os.path.join(self.DIRECTORIO_CACHE, f"rangos_precio_{self.etiqueta()}.json")
+        hojas, recuentos = comun_crawl.planificar_rangos_precio(
+            lambda minimo, maximo: self.contar_articulos_rango(driver, minimo, maximo),
+            0, precio_max,
+            limite=self.MAX_PAGINAS * self.PRODUCTOS_POR_PAGINA,
+            hojas_previas=comun_crawl.cargar_plan_rangos(ruta_plan)
+        )
+
+        if not hojas:
+            return False
+
+        comun_crawl.guardar_plan_rangos(ruta_plan, hojas)
+        print(f"🗂️  Plan de precios: {len(hojas)} hojas tras {recuentos} recuentos")
+
+        listados = {}
+        for minimo, maximo, cantidad in hojas:
+            if cantidad == 0:
+                continue
+            listados.update(self.listados_particion(self.filtro_rango_precio(minimo, maximo), cantidad))
+
+        self.recorrer_listados(navegadores, listados, productos_unicos, productos_data, opciones, resumen)
+        return True
+
+    def extraer_productos(self, driver, opciones=None):
+        """
+        Extrae todos los productos
+
+        Modos:
+        - ordenaciones: recorre la rejilla de los cinco criterios de ordenación
+          repartiendo las páginas entre 'workers' navegadores
+        - bidireccional: recorre name+asc y name+desc a la vez hasta que se cruzan;
+          si no llegan a cruzarse, completa con los criterios de precio y relevancia
+        - marcas: particiona la categoría por la faceta de marca y recorre las
+          particiones en paralelo con 'workers' navegadores; si no hay faceta,
+          vuelve a las cinco ordenaciones
+        - precios: particiona la categoría por rangos de precio que caben en el
+          límite de paginación y recorre las hojas en paralelo
+
+        Los modos que usan el ejecutor guardan un checkpoint tras cada página y
+        con --resume continúan una ejecución interrumpida. Con --deadline-minutos
+        se deja de navegar al agotarse el tiempo y la extracción queda como parcial.
+        Con --incremental se deja de paginar cuando las páginas coinciden con las de
+        la ejecución anterior y el resto se siembra desde su instantánea.
+
+        Returns:
+            tuple: (productos, resumen con total de artículos, cobertura y si es parcial)
+        """
+        opciones = opciones or parsear_argumentos([])
+        modo = opciones.modo
+        productos_data = []
+        resumen = {'parcial': False, 'motivo_parcial': None, 'total_articulos': None, 'cobertura': None}
+
+        try:
+            total_articulos, total_paginas = self.obtener_total_articulos(driver)
+            resumen['total_articulos'] = total_articulos
+            self.anotar_articulos(self.consultas_ordenacion(), total_articulos)
+
+            print(f"🔄 Total de artículos: {total_articulos}")
+            print(f"📄 Páginas calculadas: {total_paginas}")
+
+            criterios_ordenacion = list(self.CRITERIOS_ORDENACION)
+            productos_unicos = set()
+            navegadores = [driver] + self.abrir_navegadores(opciones.workers - 1)
+
+            try:
+                if modo == "bidireccional":
+                    encuentro = self.recorrer_bidireccional(navegadores, productos_unicos, productos_data, opciones)
+
+                    if encuentro:
+                        print("🤝 Cobertura completa por nombre: se omiten los criterios de precio y relevancia")
+                        criterios_ordenacion = []
+                    else:
+                        print("⚠️  Los frentes no se cruzaron: se completan los criterios restantes")
+                        criterios_ordenacion = [c for c in criterios_ordenacion if not c.startswith("name")]
+
+                elif modo in ("marcas", "precios"):
+                    if modo == "marcas":
+                        particionado = self.recorrer_particiones_marca(
+                            navegadores, total_articulos, productos_unicos, productos_data, opciones, resumen
+                        )
+                    else:
+                        particionado = self.recorrer_particiones_precio(
+                            navegadores, productos_unicos, productos_data, opciones, resumen
+                        )
+
+                    if particionado:
+                        criterios_ordenacion = []
+                    else:
+                        print(f"⚠️  Sin particiones por {modo}: se usan las cinco ordenaciones")
+
+                if criterios_ordenacion:
+                    self.recorrer_criterios(
+                        navegadores, criterios_ordenacion,
+                        self.paginas_a_recorrer(total_articulos, total_paginas),
+                        productos_unicos, productos_data, opciones, resumen
+                    )
+            finally:
+                self.cerrar_navegadores(navegadores[1:])
+
+            print(f"\n📊 Resumen final: {len(productos_data)} productos únicos")
+            self.CACHE_HUELLAS.imprimir_informe()
+            self.ADAPTADOR.guardar_planes()
+            self.ADAPTADOR.imprimir_informe()
+
+            if total_articulos:
+                porcentaje = (len(productos_data) / total_articulos) * 100
+                resumen['cobertura'] = round(min(porcentaje, 100.0), 1)
+                print(f"📈 Se extrajo el {porcentaje:.1f}% del total de artículos")
+
+            if resumen['parcial']:
+                print(f"⚠️  Extracción PARCIAL: {comun_crawl.describir_parcial(resumen)}")
+
+            return productos_data, resumen
+
+        except comun_crawl.CrawlAbortado:
+            raise
+
+        except Exception as e:
+            print(f"❌ Error extrayendo productos: {e}")
+            return productos_data, resumen
+
+    def guardar_en_dataframe(self, productos_data, resumen=None):
+        """
+        Convierte la lista de productos en un DataFrame y lo guarda en CSV
+
+        Junto al CSV se escribe un JSON con el estado del snapshot (completo o
+        parcial, con su motivo) y su cobertura; los snapshots parciales llevan el
+        sufijo _parcial. El estado y la cobertura van también en cada fila, para
+        distinguir en el histórico de Drive los días que no se recorrieron enteros.
+
+        FORMATO FINAL DE COLUMNAS (compatible con histórico):
+        - fecha_extraccion
+        - id
+        - numero
+        - nombre
+        - marca
+        - precio (precio actual/rebajado)
+        - enlace
+        - precio_rebajado (precio original tachado)
+        - descuento_euros (opcional)
+        - descuento_porcentaje (opcional)
+        - precio_original_texto (texto del precio actual)
+        - precio_rebajado_texto (texto del precio original)
+        - ean, sku, disponibilidad, vendedor, especificaciones (solo con --detalles)
+        - estado_snapshot ('completo' o 'parcial'), cobertura_porcentaje y motivo_parcial
+        """
+        if not productos_data:
+            print("No hay datos para guardar")
+            return None, None
+
+        df = pd.DataFrame(productos_data)
+
+        fecha_extraccion = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        df['fecha_extraccion'] = fecha_extraccion
+
+        resumen = resumen or {}
+        df['estado_snapshot'] = 'parcial' if resumen.get('parcial') else 'completo'
+        df['cobertura_porcentaje'] = resumen.get('cobertura')
+        df['motivo_parcial'] = resumen.get('motivo_parcial') if resumen.get('parcial') else None
+
+        if 'id' not in df.columns:
+            print("\n" + "="*60)
+            print("GENERANDO IDs ÚNICOS PARA PRODUCTOS")
+            print("="*60)
+            df['id'] = df['nombre'].apply(generar_id_consistente)
+            print(f"✅ IDs generados para {len(df)} productos")
+            print(f"📊 IDs únicos: {df['id'].nunique()}")
+
+        # Limpiar columnas de precio (esto renombra las columnas correctamente)
+        df = self.limpiar_columna_precio(df)
+
+        # Orden de columnas (formato antiguo compatible)
+        column_order = [
+            'fecha_extraccion', 'id', 'numero', 'nombre', 'marca',
+            'precio', 'enlace', 'precio_rebajado'
+        ]
+
+        # Agregar columnas calculadas si existen
+        if 'descuento_euros' in df.columns:
+            column_order.append('descuento_euros')
+        if 'descuento_porcentaje' in df.columns:
+            column_order.append('descuento_porcentaje')
+
+        # Agregar columnas de texto al final
+        if 'precio_original_texto' in df.columns:
+            column_order.append('precio_original_texto')
+        if 'precio_rebajado_texto' in df.columns:
+            column_order.append('precio_rebajado_texto')
+
+        # Atributos de la ficha de producto (enriquecimiento opcional)
+        column_order += [col for col in comun_detalle.CAMPOS_DETALLE if col in df.columns]
+
+        # Estado del snapshot del día
+        column_order += ['estado_snapshot', 'cobertura_porcentaje', 'motivo_parcial']
+
+        # Asegurar que todas las columnas existan
+        existing_columns = [col for col in column_order if col in df.columns]
+        df = df[existing_columns]
+
+        os.makedirs("scraping_results", exist_ok=True)
+
+        nombre_archivo = (f"scraping_results/{self.prefijo_resultados}{self.TIENDA.sufijo}_completo_"
+                          f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        if resumen.get('parcial'):
+            nombre_archivo = nombre_archivo.replace('.csv', '_parcial.csv')
+
+        df.to_csv(nombre_archivo, index=False, encoding='utf-8')
+
+        with open(nombre_archivo.replace('.csv', '_resumen.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'fecha_extraccion': fecha_extraccion,
+                'estado': 'parcial' if resumen.get('parcial') else 'completo',
+                'motivo_parcial': resumen.get('motivo_parcial') if resumen.get('parcial') else None,
+                'cobertura_porcentaje': resumen.get('cobertura'),
+                'total_articulos': resumen.get('total_articulos'),
+                'productos': len(df),
+            }, f, ensure_ascii=False, indent=2)
+
+        print(f"\n✅ Datos guardados en: {nombre_archivo}")
+        print(f"📊 Total de productos únicos: {len(df)}")
+
+        # Estadísticas de marcas
+        print(f"\n🏷️  Distribución de marcas:")
+        distribucion_marcas = df['marca'].value_counts()
+        for marca, cantidad in distribucion_marcas.head(10).items():
+            print(f"   {marca}: {cantidad} productos")
+
+        if len(distribucion_marcas) > 10:
+            print(f"   ... y {len(distribucion_marcas) - 10} marcas más")
+
+        # Estadísticas de IDs
+        print(f"\n🔑 Estadísticas de IDs:")
+        print(f"   IDs únicos: {df['id'].nunique()}")
+        productos_duplicados = len(df) - df['id'].nunique()
+        if productos_duplicados > 0:
+            print(f"   ⚠️  Productos duplicados (mismo ID): {productos_duplicados}")
+
+        # Estadísticas de precios
+        if 'precio' in df.columns:
+            productos_con_precio = df['precio'].notna().sum()
+            print(f"\n💰 Productos con precio válido: {productos_con_precio}")
+
+            if productos_con_precio > 0:
+                print(f"   📈 Precio promedio: {df['precio'].mean():.2f}€")
+                print(f"   📊 Precio mediano: {df['precio'].median():.2f}€")
+                print(f"   📉 Precio mínimo: {df['precio'].min():.2f}€")
+                print(f"   📈 Precio máximo: {df['precio'].max():.2f}€")
+
+        # Estadísticas de descuentos
+        if 'descuento_porcentaje' in df.columns:
+            productos_con_descuento = df['descuento_porcentaje'].notna().sum()
+            if productos_con_descuento > 0:
+                print(f"\n💸 Productos con descuento: {productos_con_descuento}")
+                print(f"   📉 Descuento promedio: {df['descuento_porcentaje'].mean():.1f}%")
+                print(f"   💵 Ahorro promedio: {df['descuento_euros'].mean():.2f}€")
+                print(f"   🎯 Mayor descuento: {df['descuento_porcentaje'].max():.1f}%")
+
+        # Estadísticas de precios originales
+        if 'precio_rebajado' in df.columns:
+            productos_con_precio_original = df['precio_rebajado'].notna().sum()
+            if productos_con_precio_original > 0:
+                print(f"\n🏷️  Productos con precio original (tachado): {productos_con_precio_original}")
+
+        # Estadísticas de enlaces
+        if 'enlace' in df.columns:
+            enlaces_validos = df[df['enlace'] != 'No disponible']['enlace'].count()
+            print(f"\n🔗 Enlaces extraídos: {enlaces_validos} de {len(df)} productos")
+
+        print("\n📋 Primeras 5 filas del DataFrame:")
+        print(df.head())
+
+        print("\n📋 Estructura de columnas:")
+        print(f"   Columnas: {list(df.columns)}")
+
+        return df, nombre_archivo
+
+    # ============================================ #
+    #          FUNCION PRINCIPAL                   #
+    # ============================================ #
+
+    def main(self, args=None):
+        """Función principal"""
+        if args is None:
+            args = parsear_argumentos()
+
+        print("="*60)
+        print(f"SCRAPING DE {self.titulo} - MEDIAMARKT")
+        print("Con extracción de PRECIO ACTUAL y PRECIO ORIGINAL")
+        print("="*60)
+        print(f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*60)
+
+        if getattr(args, 'trazar_comandos', False):
+            comun_traza.activar()
+
+        driver = None
+
+        try:
+            url = self.construir_url_listado("sort=currentprice+desc")
+
+            print(f"\n🌐 Accediendo a: {url}")
+
+            driver = self.mediamark_mob_(url)
+
+            productos_data, resumen = self.extraer_productos(driver, args)
+
+            if not productos_data:
+                print("❌ No se extrajeron productos")
+                return False
+
+            if args.detalles:
+                comun_detalle.enriquecer_productos(productos_data, args, lambda: self.mediamark_mob_(self.URL_BASE))
+
+            df, archivo_csv = self.guardar_en_dataframe(productos_data, resumen)
+
+            if df is None:
+                print("❌ Error creando DataFrame. Terminando ejecución.")
+                return False
+
+            # Los datos ya están en el CSV local: el checkpoint deja de ser necesario
+            comun_crawl.borrar_checkpoint(self.ruta_checkpoint())
+
+            print("\n🔄 Actualizando Google Drive (APPEND mode)...")
+            print("📌 Nota: Los datos se añadirán, NO se sobrescribirán")
+            print("📌 Se mantendrá el historial día a día")
+
+            drive_actualizado = self.actualizar_csv_drive(df)
+
+            if drive_actualizado:
+                print("✅ Google Drive actualizado exitosamente (APPEND)")
+            else:
+                print("⚠️  No se pudo actualizar Google Drive")
+
+            print("\n" + "="*60)
+            print("RESUMEN EJECUCIÓN")
+            print("="*60)
+            print(f"✅ Scraping completado exitosamente")
+            print(f"📦 Productos obtenidos hoy: {len(df)}")
+            print(f"🔑 IDs únicos generados: {df['id'].nunique()}")
+            print(f"🏷️  Marcas diferentes encontradas: {df['marca'].nunique()}")
+
+            if 'precio' in df.columns:
+                precios_validos = df['precio'].notna().sum()
+                print(f"💰 Precios actuales válidos: {precios_validos}")
+
+            if 'precio_rebajado' in df.columns:
+                precios_originales = df['precio_rebajado'].notna().sum()
+                print(f"🏷️  Precios originales (tachados) extraídos: {precios_originales}")
+
+            if 'descuento_porcentaje' in df.columns:
+                productos_descuento = df['descuento_porcentaje'].notna().sum()
+                print(f"💸 Productos con descuento: {productos_descuento}")
+
+            if 'enlace' in df.columns:
+                enlaces_validos = df[df['enlace'] != 'No disponible']['enlace'].count()
+                print(f"🔗 Enlaces extraídos: {enlaces_validos}")
+
+            print(f"📁 Archivo local generado: {archivo_csv}")
+
+            if resumen['parcial']:
+                print(f"⚠️  Snapshot PARCIAL (cobertura: {resumen['cobertura']}%): {comun_crawl.describir_parcial(resumen)}")
+            print(f"💾 Google Drive: Datos añadidos al archivo histórico")
+
+            print("\n📋 ESTRUCTURA FINAL DEL CSV:")
+            print("   - precio: precio actual de venta")
+            print("   - precio_rebajado: precio original (antes del descuento)")
+            print("   - Compatible con formato histórico antiguo ✅")
+
+            return True
+
+        except comun_crawl.CrawlAbortado as e:
+            print(f"🛑 Crawl abortado: {e}")
+            print("📌 No se guarda ningún CSV; el checkpoint se conserva para --resume")
+            return False
+
+        except Exception as e:
+            print(f"❌ Error en la ejecución: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+        finally:
+            if driver:
+                try:
+                    driver.quit()
+                    print("\n🛑 Navegador cerrado")
+                except:
+                    pass
+
+            comun_traza.guardar(self.etiqueta())
+
+            print("\n" + "="*60)
+            print("EJECUCIÓN FINALIZADA")
+            print("="*60)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Descubrimiento de productos a partir de los sitemaps XML de la tienda
+Los sitemaps se leen en streaming con lxml.iterparse, liberando cada entrada
+nada más leerla, para que sitemaps de cientos de MB no lleguen a estar en memoria
+"""
+
+from contextlib import contextmanager
+import gzip
+import re
+import urllib.request
+from urllib.parse import urlsplit, urlunsplit
+
+from lxml import etree
+
+import comun_detalle
+
+NS_SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ETIQUETAS_ENTRADA = (f"{NS_SITEMAP}url", f"{NS_SITEMAP}sitemap")
+
+# Las fichas de producto de MediaMarkt cuelgan de /product/
+PATRON_PRODUCTO = re.compile(r"/product/")
+
+# ============================================ #
+#          LECTURA EN STREAMING                #
+# ============================================ #
+
+@contextmanager
+def abrir_sitemap(origen):
+    """
+    Abre un sitemap local o remoto como flujo binario (descomprimiendo .gz al
+    vuelo); al salir se cierran tanto el descompresor como el fichero o la
+    respuesta HTTP de debajo
+    """
+    if re.match(r"https?://", origen):
+        peticion = urllib.request.Request(origen, headers=comun_detalle.CABECERAS_HTTP)
+        flujo = urllib.request.urlopen(peticion, timeout=comun_detalle.TIMEOUT_HTTP)
+        comprimido = origen.endswith('.gz') or flujo.headers.get('Content-Encoding') == 'gzip'
+    else:
+        flujo = open(origen, 'rb')
+        comprimido = origen.endswith('.gz')
+    with flujo:
+        if comprimido:
+            with gzip.GzipFile(fileobj=flujo) as descomprimido:
+                yield descomprimido
+        else:
+            yield flujo
+
+def iterar_entradas(origen):
+    """
+    Recorre las entradas de un sitemap sin cargarlo entero
+
+    Yields:
+        tuple: (tipo 'url' | 'sitemap', loc, lastmod)
+    """
+    with abrir_sitemap(origen) as flujo:
+        for _, elemento in etree.iterparse(flujo, events=('end',), tag=ETIQUETAS_ENTRADA):
+            loc = elemento.findtext(f"{NS_SITEMAP}loc")
+            lastmod = elemento.findtext(f"{NS_SITEMAP}lastmod")
+            tipo = 'sitemap' if elemento.tag == f"{NS_SITEMAP}sitemap" else 'url'
+
+            # Liberar la entrada y las ya procesadas que cuelgan de la raíz
+            elemento.clear()
+            while elemento.getprevious() is not None:
+                del elemento.getparent()[0]
+
+            if loc:
+                yield tipo, loc.strip(), lastmod.strip() if lastmod else None
+
+def sitemaps_de_robots(url_base):
+    """Sitemaps que la tienda declara en su robots.txt"""
+    peticion = urllib.request.Request(f"{url_base}/robots.txt", headers=comun_detalle.CABECERAS_HTTP)
+    with urllib.request.urlopen(peticion, timeout=comun_detalle.TIMEOUT_HTTP) as respuesta:
+        texto = respuesta.read().decode('utf-8', errors='replace')
+    return [linea.split(':', 1)[1].strip() for linea in texto.splitlines() if linea.lower().startswith('sitemap:')]
+
+def normalizar_enlace(enlace):
+    """Enlace sin parámetros ni fragmento, para comparar sitemap e histórico"""
+    partes = urlsplit(str(enlace).strip())
+    return urlunsplit((partes.scheme, partes.netloc.lower(), partes.path.rstrip('/'), '', ''))
+
+# ============================================ #
+#          DESCUBRIMIENTO                      #
+# ============================================ #
+
+def descubrir_productos(origenes, patrones=None, filtro_sitemaps=None, max_profundidad=3):
+    """
+    Recorre sitemaps (o índices de sitemaps, recursivamente) y devuelve las
+    fichas de producto que cumplen los patrones
+
+    Args:
+        origenes: rutas locales o URLs de sitemaps
+        patrones: expresiones regulares; una URL de producto vale si cumple alguna
+            (todas valen si no se indican)
+        filtro_sitemaps: expresión regular que deben cumplir los sitemaps hijos
+            de un índice para abrirlos (p. ej. 'product')
+
+    Returns:
+        dict: enlace normalizado -> lastmod
+    """
+    patrones = [re.compile(patron, re.IGNORECASE) for patron in patrones or []]
+    filtro_sitemaps = re.compile(filtro_sitemaps, re.IGNORECASE) if filtro_sitemaps else None
+    productos = {}
+    pendientes = [(origen, 0) for origen in origenes]
+    leidas = 0
+
+    while pendientes:
+        sitemap, profundidad = pendientes.pop(0)
+        print(f"🗺️  Leyendo sitemap {sitemap}")
+        try:
+            for tipo, loc, lastmod in iterar_entradas(sitemap):
+                if tipo == 'sitemap':
+                    if profundidad < max_profundidad and (not filtro_sitemaps or filtro_sitemaps.search(loc)):
+                        pendientes.append((loc, profundidad + 1))
+                    continue
+
+                leidas += 1
+                if not PATRON_PRODUCTO.search(loc):
+                    continue
+                if patrones and not any(patron.search(loc) for patron in patrones):
+                    continue
+                productos[normalizar_enlace(loc)] = lastmod
+        except Exception as e:
+            print(f"⚠️ No se pudo leer el sitemap {sitemap}: {e}")
+
+    print(f"🔎 {leidas} URLs leídas, {len(productos)} fichas de producto seleccionadas")
+    return productos
+
+def productos_nuevos(descubiertos, enlaces_conocidos):
+    """Fichas del sitemap que no aparecen entre los enlaces conocidos"""
+    conocidos = {normalizar_enlace(enlace) for enlace in enlaces_conocidos}
+    return {enlace: lastmod for enlace, lastmod in descubiertos.items() if enlace not in conocidos}
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tiendas de MediaMarkt por país
+Cada tienda aporta su URL base, el idioma de sus rutas, el formato de sus precios,
+el botón de aceptar cookies y los ids de categoría, que cambian de un país a otro.
+Los ids de las tiendas que no son la española se leen de tiendas_categorias.json:
+    {"de": {"tvs": "<slug>-<id>", "laptops": "..."}, "nl": {...}}
+"""
+
+import json
+import os
+import re
+
+RUTA_CATEGORIAS_TIENDAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tiendas_categorias.json")
+
+TIENDA_POR_DEFECTO = "es"
+
+# ============================================ #
+#          TIENDA                              #
+# ============================================ #
+
+class Tienda:
+    """
+    Datos de una tienda de MediaMarkt de un país.
+
+    Los precios se leen con el separador decimal de la tienda: se descarta todo
+    lo que no sea un dígito o ese separador (miles, moneda, espacios, ',-') y el
+    separador pasa a punto.
+    """
+
+    def __init__(self, codigo, url_base, idioma, decimal=",", moneda="€",
+                 consentimiento="pwa-consent-layer-accept-all-button"):
+        self.codigo = codigo
+        self.url_base = url_base
+        self.idioma = idioma
+        self.decimal = decimal
+        self.moneda = moneda
+        self.consentimiento = consentimiento
+        self.patron_precio = re.compile(rf"[^\d{re.escape(decimal)}]")
+        # La tienda española conserva los nombres de fichero de siempre
+        self.sufijo = "" if codigo == TIENDA_POR_DEFECTO else f"_{codigo}"
+
+    def url_categoria(self, slug):
+        return f"{self.url_base}/{self.idioma}/category/{slug}.html"
+
+    def enlace_absoluto(self, enlace):
+        """Enlace completo a partir de uno relativo de la propia tienda"""
+        if not enlace or enlace.startswith("http"):
+            return enlace
+        return f"{self.url_base}{enlace}"
+
+    def limpiar_precio(self, precio_texto):
+        """Convierte un texto de precio de la tienda a float (None si no hay precio)"""
+        if not precio_texto or precio_texto == "Precio no disponible":
+            return None
+        try:
+            return float(self.patron_precio.sub('', str(precio_texto)).replace(self.decimal, '.'))
+        except ValueError:
+            return None
+
+    def limpiar_precios(self, serie):
+        """Versión vectorizada de limpiar_precio para una columna de pandas"""
+        import pandas as pd
+
+        texto = serie.fillna("").astype(str)
+        texto = texto.str.replace(self.patron_precio, "", regex=True).str.replace(self.decimal, ".", regex=False)
+        return pd.to_numeric(texto, errors='coerce')
+
+TIENDAS = {
+    'es': Tienda('es', "https://www.mediamarkt.es", "es"),
+    'de': Tienda('de', "https://www.mediamarkt.de", "de"),
+    'at': Tienda('at', "https://www.mediamarkt.at", "de"),
+    'nl': Tienda('nl', "https://www.mediamarkt.nl", "nl"),
+    'be': Tienda('be', "https://www.mediamarkt.be", "nl"),
+    'ch': Tienda('ch', "https://www.mediamarkt.ch", "de", decimal=".", moneda="CHF"),
+}
+
+# ============================================ #
+#          IDS DE CATEGORÍA                    #
+# ============================================ #
+
+_categorias_tiendas = None
+
+def slug_categoria(codigo, categoria):
+    """
+    Id de la categoría en la tienda (None en la española: vale el del script)
+
+    Raises:
+        ValueError: si la tienda no tiene configurado el id de esa categoría
+    """
+    global _categorias_tiendas
+    if codigo == TIENDA_POR_DEFECTO:
+        return None
+    if _categorias_tiendas is None:
+        _categorias_tiendas = {}
+        if os.path.exists(RUTA_CATEGORIAS_TIENDAS):
+            with open(RUTA_CATEGORIAS_TIENDAS, encoding='utf-8') as f:
+                _categorias_tiendas = json.load(f)
+    slug = _categorias_tiendas.get(codigo, {}).get(categoria)
+    if not slug:
+        raise ValueError(f"La tienda '{codigo}' no tiene id para la categoría {categoria} en {RUTA_CATEGORIAS_TIENDAS}")
+    return slug
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Traza de comandos WebDriver (opcional, con --trazar-comandos)
+Envuelve el navegador y sus elementos para contar cada comando que viaja al
+navegador (get, find_element, find_elements, get_attribute, text,
+execute_script...) con un histograma de latencias, atribuido a la función del
+proyecto que lo lanzó. Al terminar se escribe un JSON con el resumen de la
+ejecución: sirve para medir cuántas idas y vueltas cuesta cada página y para
+detectar regresiones entre versiones
+"""
+
+from datetime import datetime
+import bisect
+import os
+import sys
+import threading
+import time
+
+from selenium.webdriver.remote.webelement import WebElement
+
+import comun_crawl
+
+DIRECTORIO_TRAZAS = "scraping_cache/trazas"
+
+# Límites superiores (ms) de las barras del histograma de latencias
+LIMITES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+_FICHERO = os.path.abspath(__file__)
+_DIRECTORIO_PROYECTO = os.path.dirname(_FICHERO)
+_del_proyecto = {}
+_traza = None
+
+# ============================================ #
+#          ESTADÍSTICAS                        #
+# ============================================ #
+
+def _estadistica_vacia():
+    return {'llamadas': 0, 'segundos': 0.0, 'max_ms': 0.0, 'histograma': [0] * (len(LIMITES_MS) + 1)}
+
+def _sumar(estadistica, segundos):
+    ms = segundos * 1000
+    estadistica['llamadas'] += 1
+    estadistica['segundos'] += segundos
+    estadistica['max_ms'] = max(estadistica['max_ms'], ms)
+    estadistica['histograma'][bisect.bisect_left(LIMITES_MS, ms)] += 1
+
+def _exportar(estadistica):
+    """Estadística en el formato del JSON (histograma con etiquetas legibles)"""
+    etiquetas = [f"<={limite}ms" for limite in LIMITES_MS] + [f">{LIMITES_MS[-1]}ms"]
+    return {
+        'llamadas': estadistica['llamadas'],
+        'segundos': round(estadistica['segundos'], 3),
+        'media_ms': round(estadistica['segundos'] * 1000 / max(estadistica['llamadas'], 1), 2),
+        'max_ms': round(estadistica['max_ms'], 2),
+        'histograma': {etiqueta: n for etiqueta, n in zip(etiquetas, estadistica['histograma']) if n},
+    }
+
+def _es_del_proyecto(fichero):
+    if fichero not in _del_proyecto:
+        ruta = os.path.abspath(fichero)
+        _del_proyecto[fichero] = ruta != _FICHERO and os.path.dirname(ruta) == _DIRECTORIO_PROYECTO
+    return _del_proyecto[fichero]
+
+def _funciones_llamantes():
+    """
+    Funciones del proyecto en la pila del comando, de la más cercana a la más
+    externa (sin lambdas ni comprensiones, que se cuentan en su función)
+    """
+    funciones = []
+    marco = sys._getframe(1)
+    while marco is not None:
+        codigo = marco.f_code
+        if (_es_del_proyecto(codigo.co_filename) and not codigo.co_name.startswith('<')
+                and codigo.co_name not in funciones):
+            funciones.append(codigo.co_name)
+        marco = marco.f_back
+    return funciones
+
+class TrazaComandos:
+    """
+    Comandos WebDriver de una ejecución: por tipo, por función que los lanzó
+    (la del proyecto más cercana en la pila) y acumulados por cada función de
+    la pila, así que 'extraer_productos' suma todo lo que cuelga de ella
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inicio = time.time()
+        self.comandos = {}
+        self.funciones = {}
+        self.acumulado = {}
+
+    def registrar(self, comando, segundos):
+        funciones = _funciones_llamantes()
+        propia = funciones[0] if funciones else "desconocida"
+        with self.lock:
+            _sumar(self.comandos.setdefault(comando, _estadistica_vacia()), segundos)
+            _sumar(self.funciones.setdefault(propia, {}).setdefault(comando, _estadistica_vacia()), segundos)
+            for funcion in funciones:
+                acumulado = self.acumulado.setdefault(funcion, {'llamadas': 0, 'segundos': 0.0})
+                acumulado['llamadas'] += 1
+                acumulado['segundos'] += segundos
+
+    def resumen(self, etiqueta):
+        with self.lock:
+            total = sum(estadistica['llamadas'] for estadistica in self.comandos.values())
+            paginas = self.comandos.get('get', {}).get('llamadas', 0)
+            return {
+                'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'etiqueta': etiqueta,
+                'duracion_segundos': round(time.time() - self.inicio, 1),
+                'comandos_totales': total,
+                'paginas': paginas,
+                'comandos_por_pagina': round(total / paginas, 1) if paginas else None,
+                'comandos': {comando: _exportar(e) for comando, e in sorted(self.comandos.items())},
+                'funciones': {
+                    funcion: {comando: _exportar(e) for comando, e in sorted(comandos.items())}
+                    for funcion, comandos in sorted(self.funciones.items())
+                },
+                'acumulado': {
+                    funcion: {'llamadas': a['llamadas'], 'segundos': round(a['segundos'], 3)}
+                    for funcion, a in sorted(self.acumulado.items(), key=lambda item: -item[1]['segundos'])
+                },
+            }
+
+    def imprimir_informe(self, resumen):
+        print("\n🔬 Comandos WebDriver:")
+        print(f"   {resumen['comandos_totales']} comandos en {resumen['paginas']} cargas de página"
+              + (f" ({resumen['comandos_por_pagina']} por página)" if resumen['comandos_por_pagina'] else ""))
+        for comando, estadistica in sorted(resumen['comandos'].items(), key=lambda item: -item[1]['segundos']):
+            print(f"   {comando}: {estadistica['llamadas']} llamadas, {estadistica['segundos']:.1f}s "
+                  f"(media {estadistica['media_ms']:.1f} ms, máx {estadistica['max_ms']:.0f} ms)")
+
+# ============================================ #
+#          ENVOLTORIOS                         #
+# ============================================ #
+
+def _envolver(resultado, traza):
+    if isinstance(resultado, WebElement):
+        return ElementoTrazado(resultado, traza)
+    if isinstance(resultado, list):
+        return [_envolver(elemento, traza) for elemento in resultado]
+    return resultado
+
+def _desenvolver(argumentos):
+    return [argumento._objeto if isinstance(argumento, _Envoltorio) else argumento for argumento in argumentos]
+
+class _Envoltorio:
+    """Deja pasar todo al objeto de Selenium y mide los comandos trazados"""
+
+    def __init__(self, objeto, traza):
+        self._objeto = objeto
+        self._traza = traza
+
+    def __getattr__(self, nombre):
+        return getattr(self._objeto, nombre)
+
+    def _medir(self, comando, funcion, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            self._traza.registrar(comando, time.perf_counter() - inicio)
+
+    def find_element(self, *args, **kwargs):
+        return _envolver(self._medir('find_element', self._objeto.find_element, *args, **kwargs), self._traza)
+
+    def find_elements(self, *args, **kwargs):
+        return _envolver(self._medir('find_elements', self._objeto.find_elements, *args, **kwargs), self._traza)
+
+class DriverTrazado(_Envoltorio):
+    """Navegador con traza de comandos"""
+
+    def get(self, url):
+        return self._medir('get', self._objeto.get, url)
+
+    def execute_script(self, script, *args):
+        resultado = self._medir('execute_script', self._objeto.execute_script, script, *_desenvolver(args))
+        return _envolver(resultado, self._traza)
+
+    def execute_async_script(self, script, *args):
+        resultado = self._medir('execute_async_script', self._objeto.execute_async_script, script, *_desenvolver(args))
+        return _envolver(resultado, self._traza)
+
+class ElementoTrazado(_Envoltorio):
+    """WebElement con traza de comandos"""
+
+    @property
+    def text(self):
+        return self._medir('text', lambda: self._objeto.text)
+
+    def get_attribute(self, nombre):
+        return self._medir('get_attribute', self._objeto.get_attribute, nombre)
+
+    def is_displayed(self):
+        return self._medir('is_displayed', self._objeto.is_displayed)
+
+    def click(self):
+        return self._medir('click', self._objeto.click)
+
+# ============================================ #
+#          ACTIVACIÓN                          #
+# ============================================ #
+
+def activar():
+    """Activa la traza: los navegadores que se abran a partir de ahora van envueltos"""
+    global _traza
+    _traza = TrazaComandos()
+    print("🔬 Traza de comandos WebDriver activada")
+
+def envolver(driver):
+    """El navegador envuelto si la traza está activa; si no, el mismo navegador"""
+    return DriverTrazado(driver, _traza) if _traza is not None else driver
+
+def guardar(etiqueta, directorio=DIRECTORIO_TRAZAS):
+    """
+    Escribe el resumen JSON de la ejecución (nada si la traza no está activa)
+
+    Returns:
+        str: ruta del JSON, o None
+    """
+    if _traza is None:
+        return None
+    resumen = _traza.resumen(etiqueta)
+    _traza.imprimir_informe(resumen)
+    ruta = os.path.join(directorio, f"traza_{etiqueta}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    try:
+        comun_crawl.guardar_json(ruta, resumen)
+        print(f"🔬 Traza guardada en {ruta}")
+        return ruta
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar la traza de comandos: {e}")
+        return None
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la cola de tareas con varios workers en procesos separados sobre un
+fichero SQLite temporal y una función de carga falsa (sin navegador)
+Se ejecutan desde scrips_py con: python -m pytest -q tests
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comun_cola
+
+CATEGORIA = "prueba"
+PRODUCTOS_POR_PAGINA = 12
+MAX_PAGINAS = 5
+
+# Productos de cada consulta: la última página con productos viene incompleta
+TOTALES = {"name+asc": 30, "name+desc": 30, "currentprice+asc": 13}
+
+def cargar_falsa(driver, consulta, pagina):
+    """Página simulada; anota cada carga en el registro que indica el entorno"""
+    with open(os.environ["REGISTRO_CARGAS"], "a", encoding="utf-8") as registro:
+        registro.write(f"{consulta}|{pagina}\n")
+    time.sleep(0.01)
+    inicio = (pagina - 1) * PRODUCTOS_POR_PAGINA
+    fin = min(TOTALES[consulta], inicio + PRODUCTOS_POR_PAGINA)
+    return [{'id': f"{consulta}-{posicion}", 'nombre': f"Producto {posicion}"} for posicion in range(inicio, fin)]
+
+def lanzar_worker(ruta, indice):
+    comun_cola.trabajar(ruta, [CATEGORIA], indice, espera_vacia=0.05, ritmo_fijo=True, cargar_pagina=cargar_falsa)
+
+class TestWorkersConcurrentes(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "cola.sqlite")
+        self.registro = os.path.join(self.directorio.name, "cargas.txt")
+        os.environ["REGISTRO_CARGAS"] = self.registro
+
+        cola = comun_cola.ColaTareas(self.ruta)
+        cola.encolar(CATEGORIA, list(TOTALES), MAX_PAGINAS, sum(TOTALES.values()), PRODUCTOS_POR_PAGINA)
+        cola.cerrar()
+
+    def tearDown(self):
+        os.environ.pop("REGISTRO_CARGAS", None)
+        self.directorio.cleanup()
+
+    def test_cada_tarea_termina_una_vez(self):
+        procesos = [
+            multiprocessing.Process(target=lanzar_worker, args=(self.ruta, indice))
+            for indice in range(3)
+        ]
+        for proceso in procesos:
+            proceso.start()
+        for proceso in procesos:
+            proceso.join(timeout=60)
+            self.assertEqual(proceso.exitcode, 0)
+
+        cola = comun_cola.ColaTareas(self.ruta)
+        estados = {
+            (consulta, pagina): estado
+            for consulta, pagina, estado in cola.conexion.execute("SELECT consulta, pagina, estado FROM tareas")
+        }
+        productos = [producto for _, producto in cola.fragmento(CATEGORIA)]
+        cola.cerrar()
+
+        with open(self.registro, encoding="utf-8") as registro:
+            cargas = Counter(
+                (consulta, int(pagina)) for consulta, pagina in (linea.strip().split("|") for linea in registro)
+            )
+
+        self.assertEqual(len(estados), len(TOTALES) * MAX_PAGINAS)
+        self.assertTrue(set(estados.values()) <= {'hecha', 'cortada'}, estados)
+        for tarea, estado in estados.items():
+            # Las hechas se cargaron una sola vez; las cortadas no llegaron a prestarse
+            self.assertEqual(cargas[tarea], 1 if estado == 'hecha' else 0, tarea)
+        for consulta, total in TOTALES.items():
+            ultima = total // PRODUCTOS_POR_PAGINA + 1
+            self.assertEqual(estados[(consulta, ultima)], 'hecha')
+
+        self.assertEqual(len(productos), sum(TOTALES.values()))
+        self.assertEqual(len({producto['id'] for producto in productos}), len(productos))
+
+if __name__ == "__main__":
+    unittest.main()
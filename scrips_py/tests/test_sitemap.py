@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Pruebas del descubrimiento por sitemaps con ficheros locales (.xml y .xml.gz)
+Se ejecutan desde scrips_py con: python -m pytest -q tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+DIRECTORIO_TESTS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRECTORIO_TESTS))
+
+import comun_sitemap
+
+FIXTURES = os.path.join(DIRECTORIO_TESTS, "fixtures")
+SITEMAP_XML = os.path.join(FIXTURES, "sitemap_productos.xml")
+SITEMAP_GZ = os.path.join(FIXTURES, "sitemap_productos_2.xml.gz")
+
+class TestIterarEntradas(unittest.TestCase):
+
+    def test_xml(self):
+        entradas = list(comun_sitemap.iterar_entradas(SITEMAP_XML))
+        self.assertEqual(len(entradas), 4)
+        self.assertEqual(entradas[0], (
+            'url', "https://www.mediamarkt.es/es/product/_tv-samsung-55-qled-1487163.html", "2026-10-01"
+        ))
+        # Sin lastmod y con espacios alrededor del loc
+        self.assertEqual(entradas[3], (
+            'url', "https://www.mediamarkt.es/es/product/_ebook-kobo-clara-1520042.html", None
+        ))
+
+    def test_xml_gz(self):
+        entradas = list(comun_sitemap.iterar_entradas(SITEMAP_GZ))
+        self.assertEqual([lastmod for _, _, lastmod in entradas], ["2026-10-03", "2026-10-04"])
+        self.assertTrue(all(tipo == 'url' for tipo, _, _ in entradas))
+
+class TestDescubrirProductos(unittest.TestCase):
+
+    def setUp(self):
+        # Índice de sitemaps que apunta a los dos fixtures
+        self.directorio = tempfile.TemporaryDirectory()
+        self.indice = os.path.join(self.directorio.name, "sitemap_indice.xml")
+        with open(self.indice, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+                    f'  <sitemap><loc>{SITEMAP_XML}</loc></sitemap>\n'
+                    f'  <sitemap><loc>{SITEMAP_GZ}</loc></sitemap>\n'
+                    '</sitemapindex>\n')
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_indice_recursivo(self):
+        productos = comun_sitemap.descubrir_productos([self.indice])
+        self.assertEqual(len(productos), 5)
+        # Los enlaces se normalizan sin parámetros y la categoría se descarta
+        self.assertIn("https://www.mediamarkt.es/es/product/_portatil-lenovo-ideapad-3-1550321.html", productos)
+        self.assertNotIn("https://www.mediamarkt.es/es/category/televisores-399.html", productos)
+
+    def test_patrones_y_filtro_de_sitemaps(self):
+        productos = comun_sitemap.descubrir_productos([self.indice], patrones=["monitor|tv-"])
+        self.assertEqual(sorted(productos.values()), ["2026-10-01", "2026-10-04"])
+
+        productos = comun_sitemap.descubrir_productos([self.indice], filtro_sitemaps=r"\.gz$")
+        self.assertEqual(len(productos), 2)
+
+    def test_productos_nuevos(self):
+        descubiertos = comun_sitemap.descubrir_productos([SITEMAP_GZ])
+        conocidos = ["https://www.mediamarkt.es/es/product/_monitor-lg-27-ultragear-1540077.html?ref=x"]
+        nuevos = comun_sitemap.productos_nuevos(descubiertos, conocidos)
+        self.assertEqual(list(nuevos), ["https://www.mediamarkt.es/es/product/_smartphone-xiaomi-redmi-13-1562010.html"])
+
+if __name__ == "__main__":
+    unittest.main()